@@ -4,29 +4,28 @@ Authentication utilities.
 from datetime import datetime, timedelta
 from typing import Optional, Union
 from jose import JWTError, jwt
-from passlib.context import CryptContext
-from fastapi import HTTPException, status, Depends
+from fastapi import HTTPException, Request, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
+from app.core.hashing import password_hasher, pwd_context
+from app.core.principals import Principal, cache_principal, get_cached_principal
 from app.database import get_session
 from app.models.user import User
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 # JWT token scheme
 security = HTTPBearer()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash."""
+    """Verify a password against its hash (blocking; handlers use password_hasher)."""
     return pwd_context.verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    """Hash a password."""
+    """Hash a password (blocking; use password_hasher in handlers)."""
     return pwd_context.hash(password)
 
 
@@ -52,23 +51,41 @@ def verify_token(token: str) -> Optional[dict]:
         return None
 
 
-def authenticate_user(session: Session, email: str, password: str) -> Union[User, bool]:
-    """Authenticate user with email and password."""
+async def authenticate_user(
+    session: AsyncSession, email: str, password: str
+) -> Union[User, bool]:
+    """Authenticate user with email and password.
+    
+    Hashes made with an outdated bcrypt cost are replaced on the user; the
+    caller's commit persists the new hash.
+    """
     statement = select(User).where(User.email == email)
-    user = session.exec(statement).first()
+    user = (await session.exec(statement)).first()
     
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    valid, new_hash = await password_hasher.verify_and_update(
+        password, user.hashed_password
+    )
+    if not valid:
         return False
+    if new_hash:
+        user.hashed_password = new_hash
+        session.add(user)
     return user
 
 
-def get_current_user(
+async def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    session: Session = Depends(get_session)
-) -> User:
-    """Get current authenticated user from JWT token."""
+    session: AsyncSession = Depends(get_session)
+) -> Principal:
+    """Get the authenticated principal from the JWT token.
+    
+    Resolved principals are cached per user and token, so most requests
+    skip the user lookup entirely. The principal is also kept on
+    ``request.state`` for middleware (request profiling).
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -80,22 +97,46 @@ def get_current_user(
         if payload is None:
             raise credentials_exception
         
-        user_id: int = payload.get("sub")
-        if user_id is None:
+        subject = payload.get("sub")
+        if subject is None:
             raise credentials_exception
+        user_id = int(subject)
             
-    except JWTError:
+    except (JWTError, ValueError):
         raise credentials_exception
     
-    user = session.get(User, user_id)
-    if user is None:
-        raise credentials_exception
+    principal = await get_cached_principal(user_id, credentials.credentials)
+    if principal is None:
+        user = await session.get(User, user_id)
+        if user is None:
+            raise credentials_exception
+        
+        principal = Principal.from_user(user)
+        await cache_principal(principal, credentials.credentials)
     
-    return user
+    request.state.principal = principal
+    return principal
 
 
-def get_current_active_user(current_user: User = Depends(get_current_user)) -> User:
+async def get_current_active_user(
+    current_user: Principal = Depends(get_current_user),
+) -> Principal:
     """Get current active user."""
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
+
+
+async def get_current_user_record(
+    current_user: Principal = Depends(get_current_active_user),
+    session: AsyncSession = Depends(get_session)
+) -> User:
+    """Load the full user row for endpoints that read or modify the profile."""
+    user = await session.get(User, current_user.id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
@@ -0,0 +1,142 @@
+"""
+Caching utilities: an in-process TTL cache and pluggable async backends.
+"""
+import abc
+import itertools
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """Bounded, thread-safe LRU cache whose entries expire after ``ttl`` seconds."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """Drop a single entry."""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+class CacheBackend(abc.ABC):
+    """Async key/value store for caches that may be shared across workers."""
+
+    @abc.abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """Return the stored value, or None if missing or expired."""
+
+    @abc.abstractmethod
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store a value that expires after ``ttl`` seconds."""
+
+    @abc.abstractmethod
+    async def incr(self, key: str) -> int:
+        """Atomically advance an integer counter and return its new value.
+
+        The value is one the counter has not held before; a new counter
+        starts at a positive value.
+        """
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Per-process backend built on :class:`TTLCache`.
+
+    Counters live in a second bounded cache whose TTL tracks the longest
+    entry TTL seen, so by the time a counter expires nothing keyed on its
+    value is left. Values come from one process-wide sequence, so a counter
+    that was dropped and created again never repeats an earlier value.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._counters = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._sequence = itertools.count(1)
+        self._lock = threading.Lock()
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = self._counters.get(key)
+        if value is not None:
+            return value
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            self._counters.ttl = max(self._counters.ttl, ttl)
+        self._cache.set(key, value, ttl)
+
+    async def incr(self, key: str) -> int:
+        with self._lock:
+            value = next(self._sequence)
+            self._counters.set(key, value)
+            return value
+
+
+class RedisCacheBackend(CacheBackend):
+    """Redis backend so every worker sees the same entries and invalidations."""
+
+    def __init__(self, url: str, prefix: str = "accompli:"):
+        import redis.asyncio as redis
+
+        self._client = redis.from_url(url)
+        self._prefix = prefix
+
+    async def get(self, key: str) -> Optional[Any]:
+        raw = await self._client.get(self._prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    async def set(self, key: str, value: Any, ttl: float) -> None:
+        await self._client.set(
+            self._prefix + key, json.dumps(value), ex=max(1, int(ttl))
+        )
+
+    async def incr(self, key: str) -> int:
+        return await self._client.incr(self._prefix + key)
+
+
+def create_cache_backend(backend: str, maxsize: int, ttl: float) -> CacheBackend:
+    """Build the cache backend named in settings ("memory" or "redis")."""
+    if backend == "redis":
+        from app.core.config import settings
+
+        return RedisCacheBackend(settings.REDIS_URL)
+    if backend == "memory":
+        return MemoryCacheBackend(maxsize=maxsize, ttl=ttl)
+    raise ValueError(f"Unknown cache backend '{backend}'")
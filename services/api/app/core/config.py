@@ -19,12 +19,67 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 24 hours
     
+    # Password hashing
+    PASSWORD_BCRYPT_ROUNDS: int = 12  # existing hashes are upgraded on login
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_QUEUE_LIMIT: int = 32
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
+    
     # Database
     DATABASE_URL: str = "sqlite:///./accompli.db"
+    # Async driver URL for the API; derived from DATABASE_URL when unset
+    ASYNC_DATABASE_URL: Optional[str] = None
+    # Statements slower than this are written to the app.db.slow log
+    SLOW_QUERY_THRESHOLD_MS: float = 200.0
     
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
     
+    # Caching
+    # "memory" (per worker) or "redis" (shared through REDIS_URL)
+    DASHBOARD_CACHE_BACKEND: str = "memory"
+    DASHBOARD_CACHE_TTL_SECONDS: int = 60
+    DASHBOARD_CACHE_MAX_ENTRIES: int = 1024
+    # "memory" (per worker) or "redis" (shared through REDIS_URL)
+    PRINCIPAL_CACHE_BACKEND: str = "memory"
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    
+    # Delta sync
+    # Watermarks trail the clock so rows flushed before, but committed after,
+    # a sync are picked up by the next one
+    SYNC_WATERMARK_OVERLAP_SECONDS: int = 5
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = 90
+    
+    # File storage
+    # "local" (files under BLOB_STORE_PATH) or "s3" (S3_BUCKET)
+    BLOB_STORE_BACKEND: str = "local"
+    BLOB_STORE_PATH: str = "./data/blobs"
+    UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+    MAX_UPLOAD_BYTES: int = 2 * 1024 * 1024 * 1024
+    BLOB_URL_EXPIRES_SECONDS: int = 300
+    # When set, local blobs are handed to nginx via X-Accel-Redirect to an
+    # internal location with this prefix that maps to BLOB_STORE_PATH
+    BLOB_ACCEL_REDIRECT_PREFIX: Optional[str] = None
+    PREVIEW_MAX_SIZE: int = 480  # longest edge of evidence previews, in pixels
+    # Blobs left unreferenced by deleted evidence are swept after this long
+    BLOB_DELETION_GRACE_SECONDS: int = 3600
+    
+    # Background jobs
+    # "inprocess" (local process pool) or "celery" (workers via REDIS_URL)
+    JOB_QUEUE_BACKEND: str = "inprocess"
+    JOB_WORKERS: int = 2
+    JOB_RESULT_TTL_SECONDS: int = 3600
+    # Render processes per batch; defaults to the CPU count
+    REPORT_BATCH_WORKERS: Optional[int] = None
+    
+    # Request profiling (needs the ``profiling`` extra)
+    # When disabled the profiling middleware is not installed at all
+    PROFILING_ENABLED: bool = False
+    # Fraction of requests profiled without X-Profile
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_INTERVAL_SECONDS: float = 0.001
+    
     # S3 Storage
     S3_ENDPOINT: Optional[str] = None
     S3_ACCESS_KEY: str = ""
@@ -59,6 +114,8 @@ class Settings(BaseSettings):
     
     # Environment
     ENVIRONMENT: str = "development"
+    # Root log level; INFO in production, DEBUG elsewhere by default
+    LOG_LEVEL: Optional[str] = None
     
     class Config:
         env_file = ".env"
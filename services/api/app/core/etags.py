@@ -0,0 +1,64 @@
+"""
+Entity tag helpers for conditional GET requests.
+"""
+import hashlib
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response, status
+
+# Clients may keep a copy but must revalidate it before every use
+REVALIDATE = "private, no-cache"
+
+
+def strong_etag(value: str) -> str:
+    """Quote ``value`` as a strong entity tag."""
+    return f'"{value}"'
+
+
+def version_etag(*parts: Any) -> str:
+    """Strong entity tag for a resource identified and versioned by ``parts``.
+
+    Pass the resource's identity and whatever changes with it, typically
+    ``updated_at``.
+    """
+    material = "|".join(str(part) for part in parts)
+    return strong_etag(hashlib.sha256(material.encode()).hexdigest()[:32])
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an ``If-None-Match`` header matches ``etag``.
+
+    Uses the weak comparison that RFC 9110 prescribes for If-None-Match.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    target = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == target
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified(etag: str, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Empty 304 response carrying the current entity tag."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, **(headers or {})},
+    )
+
+
+def conditional_get(
+    request: Request, response: Response, etag: str
+) -> Optional[Response]:
+    """Answer a conditional GET before the response body is built.
+
+    Returns a 304 if the request's ``If-None-Match`` matches ``etag``;
+    otherwise sets the validator on ``response`` and returns None.
+    """
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag, {"Cache-Control": REVALIDATE})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = REVALIDATE
+    return None
@@ -0,0 +1,116 @@
+"""
+Password hashing on a dedicated, bounded thread pool.
+
+bcrypt is deliberately slow. Running it inline in an ``async def`` handler
+stalls every other request on the worker, so hashes run on a small executor
+instead (bcrypt releases the GIL while it works). When more than
+``workers + queue_limit`` hashes are pending, new requests are rejected with
+503 instead of queueing without bound. Latency, queue depth and rejections
+are exported as Prometheus metrics (see :mod:`app.core.metrics`).
+"""
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from app.core.config import settings
+from app.core.metrics import (
+    PASSWORD_HASH_QUEUE_DEPTH,
+    PASSWORD_HASH_REJECTED,
+    PASSWORD_HASH_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHasher:
+    """Runs a passlib context's hash/verify calls on a bounded executor."""
+
+    def __init__(self, context: CryptContext, workers: int, queue_limit: int):
+        self.context = context
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hash"
+        )
+        self._in_flight = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """Hashes waiting for a free worker."""
+        return max(0, self._in_flight - self.workers)
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self._in_flight >= self.workers + self.queue_limit:
+            PASSWORD_HASH_REJECTED.inc()
+            logger.warning(
+                "Password hashing pool saturated (%d in flight), rejecting request",
+                self._in_flight,
+            )
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication service busy, please retry",
+                headers={
+                    "Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER_SECONDS)
+                },
+            )
+
+        self._in_flight += 1
+        PASSWORD_HASH_QUEUE_DEPTH.set(self.queue_depth)
+        try:
+            loop = asyncio.get_running_loop()
+            result, elapsed = await loop.run_in_executor(
+                self._executor, _timed, func, *args
+            )
+        finally:
+            self._in_flight -= 1
+            PASSWORD_HASH_QUEUE_DEPTH.set(self.queue_depth)
+
+        PASSWORD_HASH_SECONDS.labels(func.__name__).observe(elapsed)
+        return result
+
+    async def hash(self, password: str) -> str:
+        """Hash a password with the configured cost."""
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash."""
+        return await self._run(self.context.verify, password, hashed_password)
+
+    async def verify_and_update(
+        self, password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        """Verify a password, returning a replacement hash if its cost is outdated."""
+        return await self._run(
+            self.context.verify_and_update, password, hashed_password
+        )
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+def _timed(func: Callable[..., Any], *args: Any) -> Tuple[Any, float]:
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+# Pinning min/max rounds to the configured cost makes verify_and_update
+# report hashes made with any other cost as needing a rehash.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.PASSWORD_BCRYPT_ROUNDS,
+)
+
+password_hasher = PasswordHasher(
+    pwd_context,
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_limit=settings.PASSWORD_HASH_QUEUE_LIMIT,
+)
@@ -0,0 +1,192 @@
+"""
+Background job queue.
+
+A job names its task by import path (``"package.module:function"``) and
+carries a JSON-serializable payload, so the same job can run on a local
+process pool or on a Celery worker. Tasks may be plain or ``async``
+functions; async tasks get a fresh event loop in the worker process.
+
+``JOB_QUEUE_BACKEND=inprocess`` is the stand-in for local runs: jobs run on
+a process pool owned by the API worker that enqueued them, and their state
+lives in that worker's memory. ``celery`` sends them to the worker fleet
+(``celery -A app.worker.celery_app worker``).
+"""
+import abc
+import asyncio
+import importlib
+import inspect
+import logging
+import multiprocessing
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+@dataclass
+class Job:
+    """State of an enqueued job."""
+    id: str
+    task: str
+    state: str
+    result: Any = None
+    error: Optional[str] = None
+
+
+def run_task(task: str, payload: Dict[str, Any]) -> Any:
+    """Import and run a task in the current (worker) process."""
+    module_name, _, function_name = task.partition(":")
+    function = getattr(importlib.import_module(module_name), function_name)
+    result = function(payload)
+    if inspect.iscoroutine(result):
+        result = asyncio.run(result)
+    return result
+
+
+class JobQueue(abc.ABC):
+    """Queue that runs tasks outside the request path."""
+
+    @abc.abstractmethod
+    async def enqueue(
+        self, task: str, payload: Dict[str, Any], job_id: Optional[str] = None
+    ) -> str:
+        """Submit a task and return its job id.
+
+        When ``job_id`` names a job that is still queued, running or
+        succeeded, no new job is submitted.
+        """
+
+    @abc.abstractmethod
+    async def get(self, job_id: str) -> Optional[Job]:
+        """Current state of a job, or None if it is unknown."""
+
+    def shutdown(self) -> None:
+        pass
+
+
+class InProcessJobQueue(JobQueue):
+    """Runs jobs on a process pool owned by this process."""
+
+    def __init__(self, workers: int, result_ttl: float):
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._jobs = TTLCache(maxsize=10000, ttl=result_ttl)
+        self._futures: Dict[str, Future] = {}
+
+    def _pool(self) -> ProcessPoolExecutor:
+        # Created on first use; "spawn" keeps forked copies of the parent's
+        # database connections and event loop out of the workers
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def enqueue(
+        self, task: str, payload: Dict[str, Any], job_id: Optional[str] = None
+    ) -> str:
+        job_id = job_id or uuid.uuid4().hex
+        existing = self._jobs.get(job_id)
+        if existing is not None and existing.state != FAILED:
+            return job_id
+
+        job = Job(id=job_id, task=task, state=QUEUED)
+        self._jobs.set(job_id, job)
+        future = self._pool().submit(run_task, task, payload)
+        self._futures[job_id] = future
+        future.add_done_callback(lambda done: self._finish(job, done))
+        return job_id
+
+    def _finish(self, job: Job, future: Future) -> None:
+        self._futures.pop(job.id, None)
+        error = future.exception()
+        if error is None:
+            job.state, job.result = SUCCEEDED, future.result()
+        else:
+            job.state, job.error = FAILED, str(error)
+            logger.error("Job %s (%s) failed: %s", job.id, job.task, error)
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        job = self._jobs.get(job_id)
+        if job is not None and job.state == QUEUED:
+            future = self._futures.get(job_id)
+            if future is not None and future.running():
+                job.state = RUNNING
+        return job
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class CeleryJobQueue(JobQueue):
+    """Sends jobs to Celery workers through the configured broker."""
+
+    STATES = {
+        "PENDING": QUEUED,
+        "RECEIVED": QUEUED,
+        "RETRY": QUEUED,
+        "STARTED": RUNNING,
+        "SUCCESS": SUCCEEDED,
+        "FAILURE": FAILED,
+        "REVOKED": FAILED,
+    }
+
+    def __init__(self):
+        from app.worker import celery_app
+
+        self._app = celery_app
+
+    async def enqueue(
+        self, task: str, payload: Dict[str, Any], job_id: Optional[str] = None
+    ) -> str:
+        if job_id is not None:
+            # PENDING also means "unknown" to Celery, so only running or
+            # finished jobs are reused
+            existing = await self.get(job_id)
+            if existing is not None and existing.state in (RUNNING, SUCCEEDED):
+                return job_id
+        result = await asyncio.to_thread(
+            self._app.send_task,
+            "accompli.run_task",
+            args=[task, payload],
+            task_id=job_id,
+        )
+        return result.id
+
+    async def get(self, job_id: str) -> Optional[Job]:
+        result = self._app.AsyncResult(job_id)
+        state = await asyncio.to_thread(lambda: result.state)
+        job = Job(
+            id=job_id, task=(result.name or ""), state=self.STATES.get(state, QUEUED)
+        )
+        if job.state == SUCCEEDED:
+            job.result = result.result
+        elif job.state == FAILED:
+            job.error = str(result.result)
+        return job
+
+
+def create_job_queue(backend: str) -> JobQueue:
+    """Build the job queue named in settings ("inprocess" or "celery")."""
+    if backend == "inprocess":
+        return InProcessJobQueue(
+            workers=settings.JOB_WORKERS, result_ttl=settings.JOB_RESULT_TTL_SECONDS
+        )
+    if backend == "celery":
+        return CeleryJobQueue()
+    raise ValueError(f"Unknown job queue backend '{backend}'")
+
+
+job_queue = create_job_queue(settings.JOB_QUEUE_BACKEND)
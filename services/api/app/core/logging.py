@@ -20,23 +20,31 @@ def setup_logging() -> None:
             },
             "json": {
                 "format": "%(asctime)s %(name)s %(levelname)s %(message)s",
-                "class": "pythonjsonlogger.jsonlogger.JsonFormatter" if settings.ENVIRONMENT == "production" else "logging.Formatter",
+                "class": (
+                    "pythonjsonlogger.jsonlogger.JsonFormatter"
+                    if settings.ENVIRONMENT == "production"
+                    else "logging.Formatter"
+                ),
             },
         },
         "handlers": {
             "default": {
-                "formatter": "json" if settings.ENVIRONMENT == "production" else "default",
+                "formatter": (
+                    "json" if settings.ENVIRONMENT == "production" else "default"
+                ),
                 "class": "logging.StreamHandler",
                 "stream": sys.stdout,
             },
         },
         "root": {
-            "level": "INFO" if settings.ENVIRONMENT == "production" else "DEBUG",
+            "level": settings.LOG_LEVEL or (
+                "INFO" if settings.ENVIRONMENT == "production" else "DEBUG"
+            ),
             "handlers": ["default"],
         },
         "loggers": {
             "uvicorn": {
-                "level": "INFO",
+                "level": settings.LOG_LEVEL or "INFO",
                 "handlers": ["default"],
                 "propagate": False,
             },
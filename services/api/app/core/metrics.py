@@ -0,0 +1,193 @@
+"""
+Prometheus metrics for the API, served at ``/metrics``.
+
+Request counts, latency, response sizes and in-flight requests are
+recorded by :class:`MetricsMiddleware`, labelled with the route name (the
+endpoint function) so series stay bounded. :func:`timed_pool_class` and
+:func:`instrument_pool` add connection-pool checkout wait and utilization,
+and :func:`record_cache_lookup` counts cache hits and misses per cache.
+:class:`~app.core.hashing.PasswordHasher` records hashing latency, queue
+depth and rejections on its pool.
+
+With several uvicorn workers each process keeps its own counters. Set the
+``PROMETHEUS_MULTIPROC_DIR`` environment variable to an empty directory
+before the workers start; ``prometheus_client`` then writes every process's
+samples there and :func:`metrics_response` aggregates them, whichever
+worker answers the scrape.
+"""
+import os
+import time
+
+from fastapi import Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge, Histogram,
+    generate_latest, multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+REQUESTS = Counter(
+    "accompli_http_requests_total",
+    "HTTP requests by route and status code.",
+    ["method", "route", "status"],
+)
+REQUEST_LATENCY = Histogram(
+    "accompli_http_request_duration_seconds",
+    "Time from receiving a request to sending the last byte of its response.",
+    ["method", "route"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+RESPONSE_SIZE = Histogram(
+    "accompli_http_response_size_bytes",
+    "Response body size.",
+    ["method", "route"],
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216),
+)
+IN_FLIGHT = Gauge(
+    "accompli_http_requests_in_progress",
+    "Requests being served.",
+    ["method"],
+    multiprocess_mode="livesum",
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "accompli_db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled database connection, including connecting.",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5, 30),
+)
+POOL_CHECKED_OUT = Gauge(
+    "accompli_db_pool_checked_out",
+    "Database connections currently checked out of the pool.",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+POOL_SIZE = Gauge(
+    "accompli_db_pool_size",
+    "Connections the pool keeps open (checked_out / size is its utilization; "
+    "above 1 means overflow connections are in use).",
+    ["pool"],
+    multiprocess_mode="livesum",
+)
+CACHE_LOOKUPS = Counter(
+    "accompli_cache_lookups_total",
+    "Cache lookups by cache and result (hit or miss).",
+    ["cache", "result"],
+)
+PASSWORD_HASH_SECONDS = Histogram(
+    "accompli_password_hash_seconds",
+    "Time a password hash or verification spends running on the hashing pool.",
+    ["operation"],
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+PASSWORD_HASH_QUEUE_DEPTH = Gauge(
+    "accompli_password_hash_queue_depth",
+    "Password hashes waiting for a free hashing worker.",
+    multiprocess_mode="livesum",
+)
+PASSWORD_HASH_REJECTED = Counter(
+    "accompli_password_hash_rejected_total",
+    "Password hashes rejected with 503 because the hashing pool was full.",
+)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    """Count one lookup in ``cache``."""
+    CACHE_LOOKUPS.labels(cache, "hit" if hit else "miss").inc()
+
+
+class _TimedCheckout:
+    """Pool mixin observing how long ``connect()`` takes to hand out a connection."""
+    metrics_label = "default"
+
+    def connect(self):
+        started = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            POOL_CHECKOUT_WAIT.labels(self.metrics_label).observe(
+                time.perf_counter() - started
+            )
+
+
+def timed_pool_class(url: str, label: str) -> type:
+    """The database's default pool class, recording checkout wait as ``pool=label``.
+
+    Pass it to ``create_engine(poolclass=...)``.
+    """
+    parsed = make_url(url)
+    pool_class = parsed.get_dialect().get_pool_class(parsed)
+    return type(
+        f"Timed{pool_class.__name__}",
+        (_TimedCheckout, pool_class),
+        # __module__ keeps the pool's log names
+        {"metrics_label": label, "__module__": pool_class.__module__},
+    )
+
+
+def instrument_pool(engine: Engine, label: str) -> None:
+    """Record utilization of ``engine``'s pool as ``pool=label``.
+
+    Pass ``async_engine.sync_engine`` for an async engine.
+    """
+    pool = engine.pool
+    if hasattr(pool, "size"):
+        POOL_SIZE.labels(label).set(pool.size())
+
+    checked_out = POOL_CHECKED_OUT.labels(label)
+    event.listen(engine, "checkout", lambda *args: checked_out.inc())
+    event.listen(engine, "checkin", lambda *args: checked_out.dec())
+
+
+def metrics_response() -> Response:
+    """Current metrics in the Prometheus text format, across workers if configured."""
+    registry = REGISTRY
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    return Response(content=generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
+
+
+def shutdown_metrics() -> None:
+    """Drop this worker's live gauges from the multiprocess aggregate."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route latency, size and status of HTTP requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        response_size = 0
+
+        async def send_with_metrics(message):
+            nonlocal status_code, response_size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                response_size += len(message.get("body", b""))
+            await send(message)
+
+        in_flight = IN_FLIGHT.labels(method)
+        in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            elapsed = time.perf_counter() - started
+            in_flight.dec()
+            # Unmatched paths share one label so scans cannot add series
+            route = getattr(scope.get("route"), "name", None) or "unmatched"
+            REQUESTS.labels(method, route, str(status_code)).inc()
+            REQUEST_LATENCY.labels(method, route).observe(elapsed)
+            RESPONSE_SIZE.labels(method, route).observe(response_size)
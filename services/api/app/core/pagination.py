@@ -0,0 +1,91 @@
+"""
+Keyset (cursor) pagination helpers.
+
+List endpoints order rows on ``(sort_column, id)`` and hand out an opaque
+cursor naming the last row of the page. The next request filters on that
+key instead of using OFFSET, so deep pages cost the same as the first one.
+Offset pagination is still accepted for older clients.
+"""
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Tuple
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import literal, tuple_
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort_value: Any, row_id: int) -> str:
+    """Encode a page boundary as an opaque URL-safe token."""
+    if isinstance(sort_value, (date, datetime)):
+        sort_value = sort_value.isoformat()
+    payload = json.dumps([sort_value, row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_column) -> Tuple[Any, int]:
+    """Decode a cursor back into ``(sort_value, id)`` for ``sort_column``."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        python_type = sort_column.type.python_type
+        if python_type is datetime:
+            sort_value = datetime.fromisoformat(sort_value)
+        elif python_type is date:
+            sort_value = date.fromisoformat(sort_value)
+        return sort_value, int(row_id)
+    except (ValueError, TypeError, json.JSONDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+async def paginate(
+    session: AsyncSession,
+    query,
+    sort_column,
+    id_column,
+    *,
+    limit: int,
+    cursor: Optional[str] = None,
+    offset: int = 0,
+    descending: bool = True,
+) -> Tuple[List[Any], Optional[str]]:
+    """Fetch one page of ``query`` ordered on ``(sort_column, id_column)``.
+
+    When ``cursor`` is given it takes precedence over ``offset``. Returns the
+    rows and the cursor for the following page (None on the last page).
+    """
+    key = tuple_(sort_column, id_column)
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor, sort_column)
+        boundary = tuple_(
+            literal(sort_value, sort_column.type), literal(row_id, id_column.type)
+        )
+        query = query.where(key < boundary if descending else key > boundary)
+    elif offset:
+        query = query.offset(offset)
+
+    if descending:
+        query = query.order_by(sort_column.desc(), id_column.desc())
+    else:
+        query = query.order_by(sort_column.asc(), id_column.asc())
+
+    rows = (await session.exec(query.limit(limit + 1))).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    last = rows[-1]
+    sort_value, row_id = getattr(last, sort_column.key), getattr(last, id_column.key)
+    return rows, encode_cursor(sort_value, row_id)
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    """Expose the next page cursor on the response, if there is one."""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
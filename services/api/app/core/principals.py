@@ -0,0 +1,80 @@
+"""
+Cache of authenticated principals resolved from JWTs.
+
+Entries are keyed by user id, a per-user generation counter and a digest of
+the bearer token. Bumping the generation in :func:`invalidate_principal`
+orphans every cached entry for that user at once, which also works when the
+backend is shared by several workers.
+"""
+import hashlib
+from dataclasses import asdict, dataclass
+from typing import Optional
+
+from app.core.cache import create_cache_backend
+from app.core.config import settings
+from app.core.metrics import record_cache_lookup
+from app.models.user import User, UserRole
+
+principal_cache = create_cache_backend(
+    settings.PRINCIPAL_CACHE_BACKEND,
+    maxsize=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+@dataclass(frozen=True)
+class Principal:
+    """The identity attributes request handlers need for authorization."""
+    id: int
+    role: UserRole
+    organization_id: Optional[int]
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user: User) -> "Principal":
+        return cls(
+            id=user.id,
+            role=UserRole(user.role),
+            organization_id=user.organization_id,
+            is_active=user.is_active,
+        )
+
+
+def _generation_key(user_id: int) -> str:
+    return f"principal-gen:{user_id}"
+
+
+async def _entry_key(user_id: int, token: str) -> str:
+    generation = await principal_cache.get(_generation_key(user_id)) or 0
+    digest = hashlib.sha256(token.encode()).hexdigest()
+    return f"principal:{user_id}:{generation}:{digest}"
+
+
+async def get_cached_principal(user_id: int, token: str) -> Optional[Principal]:
+    """Return the cached principal for this user and token, if any."""
+    data = await principal_cache.get(await _entry_key(user_id, token))
+    record_cache_lookup("principal", data is not None)
+    if data is None:
+        return None
+    return Principal(
+        id=data["id"],
+        role=UserRole(data["role"]),
+        organization_id=data["organization_id"],
+        is_active=data["is_active"],
+    )
+
+
+async def cache_principal(principal: Principal, token: str) -> None:
+    """Remember a resolved principal for this token."""
+    data = asdict(principal)
+    data["role"] = principal.role.value
+    await principal_cache.set(
+        await _entry_key(principal.id, token),
+        data,
+        settings.PRINCIPAL_CACHE_TTL_SECONDS,
+    )
+
+
+async def invalidate_principal(user_id: int) -> None:
+    """Drop every cached principal for a user (profile or password change)."""
+    await principal_cache.incr(_generation_key(user_id))
@@ -0,0 +1,152 @@
+"""
+On-demand statistical profiling of individual requests.
+
+With ``PROFILING_ENABLED`` set, :class:`ProfilingMiddleware` samples the call
+stack of:
+
+- requests from administrators that carry ``X-Profile: 1``, and
+- a random ``PROFILING_SAMPLE_RATE`` fraction of all requests.
+
+The profile is stored in the blob store as a speedscope file
+(``profiles/<day>/<id>.speedscope.json``; open it at https://www.speedscope.app
+or convert it for other flamegraph tools). A ``.meta.json`` file next to it
+records the route, status, user and organization, and the request's query
+statistics. Profiled responses carry the id in ``X-Profile-Id``.
+
+Requests are profiled with pyinstrument (the ``profiling`` extra) in async
+mode, so concurrent requests on the same worker do not appear in each
+other's profiles. When ``PROFILING_ENABLED`` is off the middleware is not
+installed at all, so requests pay nothing for it.
+"""
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict
+
+from app.core.config import settings
+from app.core.query_stats import current_query_stats
+from app.core.storage import blob_store
+from app.models.user import UserRole
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+
+def profile_key(profile_id: str, started_at: datetime, suffix: str) -> str:
+    return f"profiles/{started_at:%Y-%m-%d}/{profile_id}{suffix}"
+
+
+async def store_profile(
+    profile_id: str, started_at: datetime, session, metadata: Dict[str, Any]
+) -> None:
+    """Write a pyinstrument session and its metadata to the blob store."""
+    from pyinstrument.renderers import SpeedscopeRenderer
+
+    files = {
+        ".speedscope.json": SpeedscopeRenderer().render(session),
+        ".meta.json": json.dumps(metadata, default=str, indent=2),
+    }
+    with tempfile.TemporaryDirectory() as workdir:
+        for suffix, content in files.items():
+            path = os.path.join(workdir, "profile" + suffix)
+            with open(path, "w") as handle:
+                handle.write(content)
+            await blob_store.put_file(path, profile_key(profile_id, started_at, suffix))
+
+
+class ProfilingMiddleware:
+    """ASGI middleware profiling requested or sampled HTTP requests.
+
+    The header is seen before authentication has run. The middleware checks
+    whether the caller is an administrator once the response starts, and
+    discards the profiles of everyone else.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        requested = (PROFILE_HEADER.lower().encode(), b"1") in scope["headers"]
+        sampled = (
+            not requested
+            and self.sample_rate > 0
+            and random.random() < self.sample_rate
+        )
+        if not (requested or sampled):
+            await self.app(scope, receive, send)
+            return
+
+        from pyinstrument import Profiler
+
+        profile_id = uuid.uuid4().hex
+        started_at = datetime.utcnow()
+        status_code = 500
+
+        def keep() -> bool:
+            # Authentication has run by the time the response starts
+            principal = scope.get("state", {}).get("principal")
+            return sampled or (
+                principal is not None and principal.role == UserRole.ADMIN
+            )
+
+        async def send_with_profile_id(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if keep():
+                    headers = list(message.get("headers", []))
+                    headers.append((PROFILE_ID_HEADER.encode(), profile_id.encode()))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        profiler = Profiler(
+            interval=settings.PROFILING_INTERVAL_SECONDS, async_mode="enabled"
+        )
+        started = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profiler.stop()
+            duration_ms = (time.perf_counter() - started) * 1000
+
+        if not keep():
+            return
+
+        principal = scope.get("state", {}).get("principal")
+        stats = current_query_stats()
+        metadata = {
+            "id": profile_id,
+            "started_at": started_at.isoformat(),
+            "duration_ms": round(duration_ms, 1),
+            "method": scope["method"],
+            "path": scope["path"],
+            "route": getattr(scope.get("route"), "name", None),
+            "status": status_code,
+            "trigger": "header" if requested else "sampled",
+            "user_id": principal.id if principal else None,
+            "organization_id": principal.organization_id if principal else None,
+            "db": stats.log_fields() if stats else None,
+        }
+        try:
+            await store_profile(profile_id, started_at, profiler.last_session, metadata)
+        except Exception:
+            logger.exception("Could not store profile %s", profile_id)
+            return
+        logger.info(
+            "Stored profile %s for %s %s (%.1f ms)",
+            profile_id, scope["method"], scope["path"], duration_ms,
+            extra={"profile_id": profile_id, "route": metadata["route"]},
+        )
@@ -0,0 +1,180 @@
+"""
+Per-request database query statistics and the slow-query log.
+
+:func:`instrument_engine` hooks SQLAlchemy's cursor events so every statement
+is timed. While a request is in flight, :class:`QueryStatsMiddleware` keeps a
+:class:`QueryStats` in a context variable; the hooks add to it, and the totals
+go out as a ``Server-Timing`` header and as fields on the ``app.db.requests``
+log record. Statements slower than ``SLOW_QUERY_THRESHOLD_MS`` are logged to
+``app.db.slow`` with the route and the shape (names and types, never values)
+of their bound parameters, whether or not they ran inside a request.
+"""
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+
+request_logger = logging.getLogger("app.db.requests")
+slow_query_logger = logging.getLogger("app.db.slow")
+
+SERVER_TIMING_HEADER = "Server-Timing"
+STATEMENT_PREVIEW_LENGTH = 200
+
+_START_TIMES = "query_stats_start_times"
+
+
+@dataclass
+class QueryStats:
+    """Queries run on behalf of one request."""
+    scope: dict
+    count: int = 0
+    total_ms: float = 0.0
+    slowest_ms: float = 0.0
+    slowest_statement: Optional[str] = None
+
+    @property
+    def route(self) -> str:
+        """Name of the matched route (its endpoint), else the raw path."""
+        route = self.scope.get("route")
+        return getattr(route, "name", None) or self.scope.get("path", "")
+
+    def record(self, statement: str, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if elapsed_ms > self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_statement = statement
+
+    def server_timing(self) -> str:
+        """``Server-Timing`` value: total DB time and the slowest statement."""
+        return (
+            f'db;dur={self.total_ms:.1f};desc="{self.count} queries", '
+            f"db-slowest;dur={self.slowest_ms:.1f}"
+        )
+
+    def log_fields(self) -> dict:
+        """Structured fields for the per-request log record."""
+        return {
+            "route": self.route,
+            "path": self.scope.get("path"),
+            "db_queries": self.count,
+            "db_time_ms": round(self.total_ms, 1),
+            "db_slowest_ms": round(self.slowest_ms, 1),
+            "db_slowest_statement": preview(self.slowest_statement),
+        }
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """Statistics of the request being served, if any."""
+    return _current.get()
+
+
+def preview(statement: Optional[str]) -> Optional[str]:
+    """One-line, truncated form of a SQL statement for logs."""
+    if statement is None:
+        return None
+    statement = " ".join(statement.split())
+    if len(statement) > STATEMENT_PREVIEW_LENGTH:
+        return statement[:STATEMENT_PREVIEW_LENGTH] + "..."
+    return statement
+
+
+def parameter_shape(parameters: Any, executemany: bool = False) -> Any:
+    """Bound parameters with each value replaced by its type name."""
+    if executemany:
+        rows = list(parameters or ())
+        return {"rows": len(rows), "each": parameter_shape(rows[0]) if rows else None}
+    if isinstance(parameters, dict):
+        return {name: type(value).__name__ for name, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        return [type(value).__name__ for value in parameters]
+    return type(parameters).__name__
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_START_TIMES, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info[_START_TIMES].pop()) * 1000
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed_ms)
+    if elapsed_ms >= settings.SLOW_QUERY_THRESHOLD_MS:
+        slow_query_logger.warning(
+            "Slow query (%.1f ms) on %s: %s",
+            elapsed_ms,
+            stats.route if stats else "-",
+            preview(statement),
+            extra={
+                "route": stats.route if stats else None,
+                "db_time_ms": round(elapsed_ms, 1),
+                "statement": statement,
+                "parameters": parameter_shape(parameters, executemany),
+            },
+        )
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    connection = exception_context.connection
+    if connection is not None and connection.info.get(_START_TIMES):
+        connection.info[_START_TIMES].pop()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Time every statement ``engine`` runs.
+
+    Pass ``async_engine.sync_engine`` for an async engine.
+    """
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+class QueryStatsMiddleware:
+    """ASGI middleware collecting query statistics per HTTP request.
+
+    The header reflects queries run before the response starts; the log
+    record, written when the response is complete, covers all of them.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(scope=scope)
+        token = _current.set(stats)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append(
+                    (SERVER_TIMING_HEADER.encode(), stats.server_timing().encode())
+                )
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            request_logger.info(
+                "%s %s (%s): %d queries in %.1f ms",
+                scope["method"], scope["path"],
+                stats.route, stats.count, stats.total_ms,
+                extra=stats.log_fields(),
+            )
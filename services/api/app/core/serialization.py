@@ -0,0 +1,76 @@
+"""
+Sparse fieldsets and fast JSON responses for read endpoints.
+
+``?fields=id,first_name,last_name`` narrows a list endpoint to the named
+columns of its read schema; :func:`parse_fields` validates the list and
+:func:`project` turns it into a column-projected SELECT.
+
+Rows loaded from our own tables are already valid, so list endpoints hand
+them to :func:`json_response` instead of returning them for FastAPI to
+validate against ``response_model`` and dump again. The read schema still
+decides which attributes are exposed and documents the response.
+"""
+from typing import Any, Iterable, List, Optional, Sequence, Type
+
+import orjson
+from fastapi import HTTPException, Response, status
+from sqlmodel import SQLModel, select
+
+
+def read_fields(model: Type[SQLModel], read_model: Type[SQLModel]) -> List[str]:
+    """Fields of ``read_model`` stored as columns of the ``model`` table."""
+    columns = model.__table__.columns
+    return [name for name in read_model.model_fields if name in columns]
+
+
+def parse_fields(
+    fields: Optional[str], model: Type[SQLModel], read_model: Type[SQLModel]
+) -> List[str]:
+    """Field names requested with ``fields=``; every read field when omitted.
+
+    ``id`` is always included so clients can address the rows they get back.
+    """
+    available = read_fields(model, read_model)
+    if not fields:
+        return available
+
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in available]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+    return list(dict.fromkeys(["id", *requested]))
+
+
+def project(model: Type[SQLModel], field_names: Sequence[str], *extra_columns):
+    """SELECT of only ``field_names`` from ``model``.
+
+    ``extra_columns`` (e.g. sort keys) are appended if not already selected.
+    """
+    columns = [getattr(model, name) for name in field_names]
+    columns += [column for column in extra_columns if column.key not in field_names]
+    return select(*columns)
+
+
+def dump_rows(rows: Iterable[Any], field_names: Sequence[str]) -> bytes:
+    """Serialize ORM objects or projected rows to a JSON array of ``field_names``."""
+    return orjson.dumps(
+        [{name: getattr(row, name) for name in field_names} for row in rows]
+    )
+
+
+def json_response(
+    rows: Iterable[Any], field_names: Sequence[str], response: Response
+) -> Response:
+    """JSON response for trusted rows, bypassing ``response_model`` validation.
+
+    Headers already set on the endpoint's injected ``response`` (such as the
+    next page cursor) are carried over.
+    """
+    return Response(
+        content=dump_rows(rows, field_names),
+        media_type="application/json",
+        headers=dict(response.headers),
+    )
@@ -0,0 +1,42 @@
+"""
+Dialect-aware SQL expression helpers.
+"""
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional
+
+from sqlalchemy import DateTime, Integer, cast, extract, func
+
+
+def date_range(
+    column, from_date: Optional[date] = None, to_date: Optional[date] = None
+) -> List:
+    """Predicates restricting ``column`` to the calendar days ``[from_date, to_date]``.
+
+    Timestamp columns are compared against a half-open range
+    ``[from_date 00:00, to_date + 1 day 00:00)`` instead of being wrapped in
+    ``date()``/``CAST``, so an index on the column can still be used.
+    """
+    predicates = []
+    is_timestamp = isinstance(column.type, DateTime)
+    if from_date is not None:
+        lower = datetime.combine(from_date, time.min) if is_timestamp else from_date
+        predicates.append(column >= lower)
+    if to_date is not None:
+        if is_timestamp:
+            upper = datetime.combine(to_date + timedelta(days=1), time.min)
+            predicates.append(column < upper)
+        else:
+            predicates.append(column <= to_date)
+    return predicates
+
+
+def hour_of_day(column, dialect: str):
+    """Hour-of-day expression (0-23)."""
+    if dialect == "sqlite":
+        return cast(func.strftime("%H", column), Integer)
+    return cast(extract("hour", column), Integer)
+
+
+def calendar_day(column):
+    """Truncate a timestamp to its calendar day."""
+    return func.date(column)
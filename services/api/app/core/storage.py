@@ -0,0 +1,330 @@
+"""
+Content-addressed blob storage for uploaded files.
+
+Uploads are streamed to a staging file in fixed-size chunks and hashed with
+SHA-256 as they are written, so memory use stays flat however large the file
+is. Blobs are stored under a key derived from that hash, which deduplicates
+identical uploads. The local filesystem backend renames the staged file
+into place. The S3 backend uploads it only if the key is not already
+present.
+"""
+import abc
+import asyncio
+import hashlib
+import os
+import shutil
+import tempfile
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Optional, Tuple
+from urllib.parse import quote
+
+from fastapi import HTTPException, Request, Response, UploadFile, status
+from fastapi.responses import FileResponse, RedirectResponse
+
+from app.core.config import settings
+from app.core.etags import REVALIDATE, etag_matches, not_modified
+
+
+@dataclass(frozen=True)
+class StoredBlob:
+    """Result of storing an upload."""
+    key: str
+    sha256: str
+    size: int
+    created: bool  # False when identical content was already stored
+
+
+def content_disposition(filename: str, disposition: str = "inline") -> str:
+    """Content-Disposition header value for ``filename``."""
+    return f"{disposition}; filename*=utf-8''{quote(filename)}"
+
+
+def blob_key(sha256: str) -> str:
+    """Storage key for content with the given SHA-256 digest."""
+    return f"sha256/{sha256[:2]}/{sha256[2:4]}/{sha256}"
+
+
+async def iter_upload(file: UploadFile, chunk_size: int) -> AsyncIterator[bytes]:
+    """Yield an upload's body in ``chunk_size`` blocks."""
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+def _write_chunk(handle, digest, chunk: bytes) -> None:
+    # hashlib releases the GIL on large buffers, so hashing overlaps other work
+    digest.update(chunk)
+    handle.write(chunk)
+
+
+def _finish(handle) -> None:
+    handle.flush()
+    os.fsync(handle.fileno())
+    handle.close()
+
+
+def _discard(path: str) -> None:
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+async def _spool(
+    chunks: AsyncIterator[bytes], directory: str, max_bytes: int
+) -> Tuple[str, str, int]:
+    """Write ``chunks`` to a staging file, returning ``(path, sha256, size)``."""
+    os.makedirs(directory, exist_ok=True)
+    fd, path = tempfile.mkstemp(dir=directory, prefix="upload-")
+    handle = os.fdopen(fd, "wb")
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async for chunk in chunks:
+            size += len(chunk)
+            if size > max_bytes:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"File exceeds the {max_bytes} byte upload limit"
+                )
+            await asyncio.to_thread(_write_chunk, handle, digest, chunk)
+        await asyncio.to_thread(_finish, handle)
+    except BaseException:
+        handle.close()
+        _discard(path)
+        raise
+    return path, digest.hexdigest(), size
+
+
+class BlobStore(abc.ABC):
+    """Store for immutable, content-addressed blobs."""
+
+    @abc.abstractmethod
+    async def put_stream(self, chunks: AsyncIterator[bytes]) -> StoredBlob:
+        """Store a stream of bytes under its content address."""
+
+    @abc.abstractmethod
+    async def put_file(self, path: str, key: str) -> None:
+        """Store a local file under ``key`` (derived files such as previews)."""
+
+    @abc.abstractmethod
+    def fetch(self, key: str):
+        """Async context manager yielding a local file path with the blob's content."""
+
+    @abc.abstractmethod
+    async def exists(self, key: str) -> bool:
+        """Whether a blob is stored under ``key``."""
+
+    @abc.abstractmethod
+    async def delete(self, key: str) -> None:
+        """Remove the blob stored under ``key``, if any."""
+
+    def local_path(self, key: str) -> Optional[str]:
+        """Filesystem path of a blob, for backends that keep blobs on local disk."""
+        return None
+
+    async def download_url(
+        self,
+        key: str,
+        filename: Optional[str],
+        mime_type: Optional[str],
+        disposition: str = "inline",
+    ) -> Optional[str]:
+        """Short-lived URL clients can fetch a blob from directly, if supported."""
+        return None
+
+
+class LocalBlobStore(BlobStore):
+    """Blobs stored as files under ``root``."""
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = os.path.abspath(root)
+        self.max_bytes = max_bytes
+        self._staging = os.path.join(self.root, "staging")
+
+    def local_path(self, key: str) -> str:
+        return os.path.join(self.root, *key.split("/"))
+
+    async def put_stream(self, chunks: AsyncIterator[bytes]) -> StoredBlob:
+        staged, sha256, size = await _spool(chunks, self._staging, self.max_bytes)
+        key = blob_key(sha256)
+        path = self.local_path(key)
+        if os.path.exists(path):
+            _discard(staged)
+            return StoredBlob(key=key, sha256=sha256, size=size, created=False)
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.replace(staged, path)
+        return StoredBlob(key=key, sha256=sha256, size=size, created=True)
+
+    async def put_file(self, path: str, key: str) -> None:
+        target = self.local_path(key)
+        os.makedirs(self._staging, exist_ok=True)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        fd, staged = tempfile.mkstemp(dir=self._staging, prefix="put-")
+        os.close(fd)
+        try:
+            await asyncio.to_thread(shutil.copyfile, path, staged)
+            os.replace(staged, target)
+        except BaseException:
+            _discard(staged)
+            raise
+
+    @asynccontextmanager
+    async def fetch(self, key: str):
+        yield self.local_path(key)
+
+    async def exists(self, key: str) -> bool:
+        return os.path.exists(self.local_path(key))
+
+    async def delete(self, key: str) -> None:
+        _discard(self.local_path(key))
+
+
+class S3BlobStore(BlobStore):
+    """Blobs stored in an S3-compatible bucket.
+
+    Uploads are staged on local disk first: the key depends on the content
+    hash, and a duplicate never needs to be sent at all.
+    """
+
+    def __init__(self, bucket: str, staging_dir: str, max_bytes: int, **client_options):
+        import boto3
+
+        self.bucket = bucket
+        self.max_bytes = max_bytes
+        self._staging = staging_dir
+        self._client = boto3.client("s3", **client_options)
+
+    async def put_stream(self, chunks: AsyncIterator[bytes]) -> StoredBlob:
+        staged, sha256, size = await _spool(chunks, self._staging, self.max_bytes)
+        key = blob_key(sha256)
+        try:
+            if await self.exists(key):
+                return StoredBlob(key=key, sha256=sha256, size=size, created=False)
+            # upload_file switches to multipart transfers for large files
+            await asyncio.to_thread(self._client.upload_file, staged, self.bucket, key)
+            return StoredBlob(key=key, sha256=sha256, size=size, created=True)
+        finally:
+            _discard(staged)
+
+    async def put_file(self, path: str, key: str) -> None:
+        await asyncio.to_thread(self._client.upload_file, path, self.bucket, key)
+
+    @asynccontextmanager
+    async def fetch(self, key: str):
+        os.makedirs(self._staging, exist_ok=True)
+        fd, path = tempfile.mkstemp(dir=self._staging, prefix="fetch-")
+        os.close(fd)
+        try:
+            await asyncio.to_thread(self._client.download_file, self.bucket, key, path)
+            yield path
+        finally:
+            _discard(path)
+
+    async def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        try:
+            await asyncio.to_thread(
+                self._client.head_object, Bucket=self.bucket, Key=key
+            )
+        except ClientError as error:
+            code = error.response.get("Error", {}).get("Code")
+            if code in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return True
+
+    async def delete(self, key: str) -> None:
+        await asyncio.to_thread(self._client.delete_object, Bucket=self.bucket, Key=key)
+
+    async def download_url(
+        self,
+        key: str,
+        filename: Optional[str],
+        mime_type: Optional[str],
+        disposition: str = "inline",
+    ) -> Optional[str]:
+        # S3 serves Range and conditional requests itself
+        params = {"Bucket": self.bucket, "Key": key}
+        if mime_type:
+            params["ResponseContentType"] = mime_type
+        if filename:
+            params["ResponseContentDisposition"] = content_disposition(
+                filename, disposition
+            )
+        return self._client.generate_presigned_url(
+            "get_object", Params=params, ExpiresIn=settings.BLOB_URL_EXPIRES_SECONDS
+        )
+
+
+async def blob_response(
+    request: Request,
+    key: str,
+    etag: str,
+    media_type: Optional[str],
+    filename: Optional[str],
+    disposition: str = "inline",
+) -> Response:
+    """Respond with a stored blob, honoring If-None-Match and Range."""
+    # Cacheable, but revalidated so revoked access takes effect immediately
+    headers = {"ETag": etag, "Cache-Control": REVALIDATE}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag, {"Cache-Control": headers["Cache-Control"]})
+
+    # Object stores serve the bytes (and ranges) themselves
+    url = await blob_store.download_url(key, filename, media_type, disposition)
+    if url:
+        return RedirectResponse(
+            url, status_code=status.HTTP_307_TEMPORARY_REDIRECT, headers=headers
+        )
+
+    path = blob_store.local_path(key)
+    if path is None or not os.path.exists(path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File is missing from storage"
+        )
+
+    if settings.BLOB_ACCEL_REDIRECT_PREFIX:
+        # nginx sends the file with sendfile(), handling Range itself
+        if filename:
+            headers["Content-Disposition"] = content_disposition(filename, disposition)
+        headers["X-Accel-Redirect"] = (
+            settings.BLOB_ACCEL_REDIRECT_PREFIX.rstrip("/") + "/" + key
+        )
+        return Response(media_type=media_type, headers=headers)
+
+    return FileResponse(
+        path,
+        media_type=media_type,
+        filename=filename,
+        content_disposition_type=disposition,
+        headers=headers,
+    )
+
+
+def create_blob_store(backend: str) -> BlobStore:
+    """Build the blob store named in settings ("local" or "s3")."""
+    if backend == "local":
+        return LocalBlobStore(
+            settings.BLOB_STORE_PATH, max_bytes=settings.MAX_UPLOAD_BYTES
+        )
+    if backend == "s3":
+        return S3BlobStore(
+            settings.S3_BUCKET,
+            staging_dir=os.path.join(tempfile.gettempdir(), "accompli-uploads"),
+            max_bytes=settings.MAX_UPLOAD_BYTES,
+            endpoint_url=settings.S3_ENDPOINT,
+            aws_access_key_id=settings.S3_ACCESS_KEY or None,
+            aws_secret_access_key=settings.S3_SECRET_KEY or None,
+            region_name=settings.S3_REGION,
+        )
+    raise ValueError(f"Unknown blob store backend '{backend}'")
+
+
+blob_store = create_blob_store(settings.BLOB_STORE_BACKEND)
@@ -0,0 +1,55 @@
+"""
+Tenant (organization) scoping for queries.
+
+Every organization's rows live in the same tables. Routers take a
+:class:`TenantScope` from :func:`get_tenant_scope` and pass their queries
+through it, so the organization predicate is part of the query itself:
+rows of other organizations are never loaded and are simply "not found".
+Tables read per organization carry an ``organization_id`` column with an
+index leading on it, so a school's requests only touch its own index range.
+"""
+from dataclasses import dataclass
+from typing import List, Optional
+
+from fastapi import Depends, HTTPException, status
+
+from app.core.auth import get_current_user
+from app.core.principals import Principal
+from app.models.user import UserRole
+
+
+@dataclass(frozen=True)
+class TenantScope:
+    """The organizations a request may read and write."""
+    organization_id: Optional[int]  # None: every organization (administrators)
+
+    def predicates(self, column) -> List:
+        """Predicates restricting an organization id ``column`` to this scope."""
+        if self.organization_id is None:
+            return []
+        return [column == self.organization_id]
+
+    def apply(self, query, column):
+        """Restrict ``query`` to this scope on the organization id ``column``."""
+        return query.where(*self.predicates(column))
+
+    def allows(self, organization_id: Optional[int]) -> bool:
+        """Whether a row belonging to ``organization_id`` is in scope."""
+        return self.organization_id is None or organization_id == self.organization_id
+
+
+async def get_tenant_scope(
+    current_user: Principal = Depends(get_current_user),
+) -> TenantScope:
+    """Dependency: the tenant scope of the authenticated user.
+
+    Administrators see every organization; everyone else only their own.
+    """
+    if current_user.role == UserRole.ADMIN:
+        return TenantScope(organization_id=None)
+    if current_user.organization_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="User is not assigned to an organization"
+        )
+    return TenantScope(organization_id=current_user.organization_id)
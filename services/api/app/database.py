@@ -1,19 +1,74 @@
 """Database connection and session management."""
 
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlmodel import create_engine, Session, SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.core.config import settings
+from app.core.metrics import instrument_pool, timed_pool_class
+from app.core.query_stats import instrument_engine
 
-# Create engine with connection pooling
+# Async drivers used by the request path
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def async_database_url(url: str) -> str:
+    """Translate a sync database URL to its async-driver equivalent."""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for database backend '{backend}'")
+    async_url = parsed.set(drivername=ASYNC_DRIVERS[backend])
+    return async_url.render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or async_database_url(
+    settings.DATABASE_URL
+)
+
+# Create engine with connection pooling (scripts, migrations, CLI tools)
 engine = create_engine(
     settings.DATABASE_URL,
     echo=settings.ENVIRONMENT == "development",
     pool_pre_ping=True,
     pool_recycle=300,  # Recycle connections every 5 minutes
+    poolclass=timed_pool_class(settings.DATABASE_URL, "sync"),
 )
 
+# Async engine used by the API routers
+async_engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    echo=settings.ENVIRONMENT == "development",
+    pool_pre_ping=True,
+    pool_recycle=300,
+    poolclass=timed_pool_class(ASYNC_DATABASE_URL, "async"),
+)
 
-def get_session():
-    """Dependency to get database session."""
+# Query counts, timings and the slow-query log
+instrument_engine(engine)
+instrument_engine(async_engine.sync_engine)
+
+# Pool utilization for /metrics
+instrument_pool(engine, "sync")
+instrument_pool(async_engine.sync_engine, "async")
+
+# Objects stay usable after commit; async sessions cannot lazily refresh them
+async_session_factory = async_sessionmaker(
+    async_engine, class_=AsyncSession, expire_on_commit=False
+)
+
+
+async def get_session():
+    """Dependency to get an async database session."""
+    async with async_session_factory() as session:
+        yield session
+
+
+def get_sync_session():
+    """Get a synchronous database session for scripts and CLI tools."""
     with Session(engine) as session:
         try:
             yield session
@@ -24,11 +79,8 @@ def get_session():
 def create_db_and_tables():
     """Create database tables."""
     # Import all models to ensure they're registered
-    from app.models import (
-        User, Organization, Student, IEP, IEPGoal,
-        BehaviorEvent, LessonPlan, Evidence
-    )
-    
+    from app import models  # noqa: F401
+
     SQLModel.metadata.create_all(engine)
 
 
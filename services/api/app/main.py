@@ -1,12 +1,20 @@
 """
 FastAPI main application for Accompli API service.
 """
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 
 from app.core.config import settings
+from app.core.hashing import password_hasher
+from app.core.jobs import job_queue
 from app.core.logging import setup_logging
+from app.core.metrics import MetricsMiddleware, metrics_response, shutdown_metrics
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.profiling import PROFILE_ID_HEADER, ProfilingMiddleware
+from app.core.query_stats import SERVER_TIMING_HEADER, QueryStatsMiddleware
 from app.routers import (
     auth,
     students,
@@ -17,16 +25,28 @@ from app.routers import (
     evidence,
     reports,
     analytics,
+    sync,
 )
 
 # Setup logging
 setup_logging()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Release worker pools on shutdown."""
+    yield
+    job_queue.shutdown()
+    password_hasher.shutdown()
+    shutdown_metrics()
+
+
 app = FastAPI(
     title="Accompli API",
     description="Special education platform API for IEP management and behavior tracking",
     version="0.1.0",
     openapi_url=f"{settings.API_V1_PREFIX}/openapi.json",
+    lifespan=lifespan,
 )
 
 # Security middleware
@@ -37,6 +57,7 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, SERVER_TIMING_HEADER, PROFILE_ID_HEADER],
     )
 
 app.add_middleware(
@@ -44,6 +65,13 @@ app.add_middleware(
     allowed_hosts=settings.ALLOWED_HOSTS,
 )
 
+# Inside QueryStatsMiddleware, so profiles can include the request's query statistics
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+app.add_middleware(QueryStatsMiddleware)
+app.add_middleware(MetricsMiddleware)
+
 # Include routers
 app.include_router(auth.router, prefix=f"{settings.API_V1_PREFIX}/auth", tags=["auth"])
 app.include_router(students.router, prefix=f"{settings.API_V1_PREFIX}/students", tags=["students"])
@@ -54,6 +82,7 @@ app.include_router(lesson_plans.router, prefix=f"{settings.API_V1_PREFIX}/lesson
 app.include_router(evidence.router, prefix=f"{settings.API_V1_PREFIX}/evidence", tags=["evidence"])
 app.include_router(reports.router, prefix=f"{settings.API_V1_PREFIX}/reports", tags=["reports"])
 app.include_router(analytics.router, prefix=f"{settings.API_V1_PREFIX}/analytics", tags=["analytics"])
+app.include_router(sync.router, prefix=f"{settings.API_V1_PREFIX}/sync", tags=["sync"])
 
 
 @app.get("/health")
@@ -62,6 +91,12 @@ async def health_check():
     return {"status": "healthy", "service": "accompli-api"}
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics."""
+    return metrics_response()
+
+
 @app.get("/")
 async def root():
     """Root endpoint."""
@@ -70,4 +105,5 @@ async def root():
         "version": "0.1.0",
         "docs": "/docs",
         "health": "/health",
+        "metrics": "/metrics",
     }
@@ -5,8 +5,11 @@ from .organization import Organization
 from .student import Student
 from .iep import IEP, IEPGoal
 from .behavior_event import BehaviorEvent
+from .behavior_rollup import BehaviorDailyRollup
 from .lesson_plan import LessonPlan
-from .evidence import Evidence
+from .evidence import Evidence, BlobDeletion
+from .sync import Tombstone
+from .report_batch import ReportBatch
 
 __all__ = [
     "User",
@@ -15,6 +18,10 @@ __all__ = [
     "IEP",
     "IEPGoal",
     "BehaviorEvent",
+    "BehaviorDailyRollup",
     "LessonPlan",
     "Evidence",
+    "BlobDeletion",
+    "Tombstone",
+    "ReportBatch",
 ]
@@ -3,9 +3,13 @@
 from enum import Enum
 from datetime import datetime
 from typing import Optional, Dict, Any, List
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship, JSON, Column
 from .base import BaseModel
 
+# Upper bound on items accepted by POST /behavior-events/bulk
+BULK_MAX_ITEMS = 500
+
 
 class BehaviorType(str, Enum):
     """Types of behaviors."""
@@ -43,9 +47,20 @@ class InterventionType(str, Enum):
 class BehaviorEvent(BaseModel, table=True):
     """Behavior event tracking model."""
     __tablename__ = "behavior_events"
+    __table_args__ = (
+        Index("ix_behavior_events_student_id_date_time", "student_id", "date_time"),
+        Index(
+            "ix_behavior_events_organization_id_date_time",
+            "organization_id",
+            "date_time",
+        ),
+    )
     
     # Basic info
     student_id: int = Field(foreign_key="students.id")
+    # The student's, for tenant-scoped reads. Nullable until rows from before the
+    # column are backfilled (app.services.tenancy); write endpoints always set it.
+    organization_id: Optional[int] = Field(default=None, foreign_key="organizations.id")
     date_time: datetime
     duration_minutes: Optional[int] = None
     
@@ -100,6 +115,26 @@ class BehaviorEventCreate(SQLModel):
     notes: Optional[str] = None
 
 
+class BehaviorEventBulkCreate(SQLModel):
+    """Bulk behavior event creation schema."""
+    items: List[BehaviorEventCreate] = Field(min_length=1, max_length=BULK_MAX_ITEMS)
+
+
+class BehaviorEventBulkResult(SQLModel):
+    """Outcome of a single item in a bulk create."""
+    index: int
+    status: str  # "created" or "rejected"
+    id: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class BehaviorEventBulkResponse(SQLModel):
+    """Bulk behavior event creation response."""
+    created: int
+    rejected: int
+    results: List[BehaviorEventBulkResult]
+
+
 class BehaviorEventUpdate(SQLModel):
     """Behavior event update schema."""
     antecedent: Optional[str] = None
@@ -0,0 +1,30 @@
+"""Pre-aggregated behavior event rollup model."""
+
+from datetime import date
+from sqlalchemy import UniqueConstraint
+from sqlmodel import Field
+from .base import BaseModel
+from .behavior_event import BehaviorType, Intensity
+
+
+class BehaviorDailyRollup(BaseModel, table=True):
+    """Daily behavior event counts per student, type, intensity and hour."""
+    __tablename__ = "behavior_daily_rollup"
+    __table_args__ = (
+        UniqueConstraint(
+            "student_id", "day", "behavior_type", "intensity", "hour_bucket",
+            name="uq_behavior_daily_rollup_bucket",
+        ),
+    )
+    
+    # Bucket
+    student_id: int = Field(foreign_key="students.id")
+    organization_id: int = Field(foreign_key="organizations.id", index=True)
+    day: date = Field(index=True)
+    behavior_type: BehaviorType
+    intensity: Intensity
+    hour_bucket: int = Field(ge=0, le=23)
+    
+    # Aggregates
+    event_count: int = Field(default=0)
+    total_duration_minutes: int = Field(default=0)
@@ -3,6 +3,7 @@
 from enum import Enum
 from datetime import datetime
 from typing import Optional
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field
 from .base import BaseModel
 
@@ -22,6 +23,14 @@ class EvidenceType(str, Enum):
 class Evidence(BaseModel, table=True):
     """Evidence/documentation model."""
     __tablename__ = "evidence"
+    __table_args__ = (
+        Index("ix_evidence_student_id_collected_date", "student_id", "collected_date"),
+        Index(
+            "ix_evidence_organization_id_collected_date",
+            "organization_id",
+            "collected_date",
+        ),
+    )
     
     # Basic info
     title: str
@@ -33,6 +42,10 @@ class Evidence(BaseModel, table=True):
     file_name: Optional[str] = None
     file_size: Optional[int] = None  # in bytes
     mime_type: Optional[str] = None
+    # Blob content address
+    content_sha256: Optional[str] = Field(default=None, index=True)
+    # JPEG thumbnail / first page, set by the preview job
+    preview_path: Optional[str] = None
     
     # Associations
     student_id: Optional[int] = Field(foreign_key="students.id")
@@ -43,6 +56,8 @@ class Evidence(BaseModel, table=True):
     # Collection info
     collected_date: datetime
     collected_by_id: int = Field(foreign_key="users.id")
+    # The student's organization, or the collector's for evidence without a student
+    organization_id: Optional[int] = Field(default=None, foreign_key="organizations.id")
     
     # Privacy and sharing
     is_confidential: bool = Field(default=True)
@@ -52,6 +67,13 @@ class Evidence(BaseModel, table=True):
     tags: Optional[str] = None  # comma-separated tags
 
 
+class BlobDeletion(BaseModel, table=True):
+    """Blob key whose last evidence record was deleted, awaiting the sweep."""
+    __tablename__ = "blob_deletions"
+    
+    key: str = Field(index=True)
+
+
 class EvidenceCreate(SQLModel):
     """Evidence creation schema."""
     title: str
@@ -89,6 +111,8 @@ class EvidenceRead(SQLModel):
     file_name: Optional[str] = None
     file_size: Optional[int] = None
     mime_type: Optional[str] = None
+    content_sha256: Optional[str] = None
+    preview_path: Optional[str] = None
     student_id: Optional[int] = None
     iep_goal_id: Optional[int] = None
     behavior_event_id: Optional[int] = None
@@ -3,6 +3,7 @@
 from enum import Enum
 from datetime import date
 from typing import Optional, List, Dict, Any
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, JSON, Column
 from .base import BaseModel
 
@@ -28,6 +29,10 @@ class SubjectArea(str, Enum):
 class LessonPlan(BaseModel, table=True):
     """Lesson plan model."""
     __tablename__ = "lesson_plans"
+    __table_args__ = (
+        Index("ix_lesson_plans_date", "date"),
+        Index("ix_lesson_plans_organization_id_date", "organization_id", "date"),
+    )
     
     # Basic info
     title: str
@@ -65,6 +70,8 @@ class LessonPlan(BaseModel, table=True):
     
     # Created by
     created_by_id: int = Field(foreign_key="users.id")
+    # The creator's organization
+    organization_id: Optional[int] = Field(default=None, foreign_key="organizations.id")
     
     # Status
     is_template: bool = Field(default=False)
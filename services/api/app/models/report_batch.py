@@ -0,0 +1,60 @@
+"""Report batch models."""
+
+from enum import Enum
+from datetime import date, datetime
+from typing import Optional
+from sqlmodel import SQLModel, Field
+from .base import BaseModel
+
+
+class ReportBatchStatus(str, Enum):
+    """Report batch status."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class ReportBatch(BaseModel, table=True):
+    """Organization-wide report run, e.g. at the end of a grading period."""
+    __tablename__ = "report_batches"
+    
+    organization_id: int = Field(foreign_key="organizations.id", index=True)
+    requested_by_id: Optional[int] = Field(default=None, foreign_key="users.id")
+    report: str = Field(default="progress_report")
+    format: str  # ReportFormat value
+    from_date: date
+    to_date: date
+    
+    # Progress, updated by the batch job as it runs
+    status: ReportBatchStatus = Field(default=ReportBatchStatus.QUEUED)
+    total: int = Field(default=0)  # students in the organization
+    completed: int = Field(default=0)  # rendered now or reused from an earlier render
+    reused: int = Field(default=0)
+    failed: int = Field(default=0)
+    error: Optional[str] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    
+    # ZIP of every report in the batch
+    archive_key: Optional[str] = None
+
+
+class ReportBatchRead(SQLModel):
+    """Report batch read schema."""
+    id: int
+    organization_id: int
+    report: str
+    format: str
+    from_date: date
+    to_date: date
+    status: ReportBatchStatus
+    total: int
+    completed: int
+    reused: int
+    failed: int
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    download_url: Optional[str] = None  # set once the archive is ready
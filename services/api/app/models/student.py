@@ -3,6 +3,7 @@
 from enum import Enum
 from datetime import date
 from typing import Optional, List
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 from .base import BaseModel
 
@@ -59,6 +60,12 @@ class StudentParentLink(BaseModel, table=True):
 class Student(BaseModel, table=True):
     """Student model."""
     __tablename__ = "students"
+    __table_args__ = (
+        # Caseload lists are per organization, oldest first
+        Index(
+            "ix_students_organization_id_created_at", "organization_id", "created_at"
+        ),
+    )
     
     # Basic Info
     first_name: str
@@ -92,6 +99,9 @@ class Student(BaseModel, table=True):
     goals_progress: Optional[int] = Field(default=0, ge=0, le=100)
     recent_behaviors: Optional[int] = Field(default=0)
     
+    # Cleared by DELETE /students/{id} (soft delete)
+    is_active: bool = Field(default=True)
+    
     # Organization/School
     organization_id: int = Field(foreign_key="organizations.id")
     organization: "Organization" = Relationship(back_populates="students")
@@ -0,0 +1,50 @@
+"""Delta sync models."""
+
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import Index
+from sqlmodel import SQLModel, Field
+from .base import BaseModel
+from .behavior_event import BehaviorEventRead
+from .iep import IEPRead, IEPGoalRead
+from .lesson_plan import LessonPlanRead
+from .student import StudentRead
+
+
+class Tombstone(BaseModel, table=True):
+    """Record of a deleted row, kept so sync clients can drop their copy."""
+    __tablename__ = "tombstones"
+    __table_args__ = (
+        Index(
+            "ix_tombstones_organization_id_deleted_at", "organization_id", "deleted_at"
+        ),
+    )
+    
+    entity_type: str  # key of the entity in SyncChanges, e.g. "behavior_events"
+    entity_id: int
+    organization_id: Optional[int] = Field(default=None, foreign_key="organizations.id")
+    deleted_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class TombstoneRead(SQLModel):
+    """Tombstone read schema."""
+    entity_type: str
+    entity_id: int
+    deleted_at: datetime
+
+
+class SyncChanges(SQLModel):
+    """Rows created or updated since the client's watermark."""
+    students: List[StudentRead] = []
+    ieps: List[IEPRead] = []
+    goals: List[IEPGoalRead] = []
+    behavior_events: List[BehaviorEventRead] = []
+    lesson_plans: List[LessonPlanRead] = []
+
+
+class SyncResponse(SQLModel):
+    """Delta sync response."""
+    watermark: str  # pass back as ?since= on the next sync
+    full: bool  # True when no watermark was given and every row is included
+    changes: SyncChanges
+    deleted: List[TombstoneRead]
@@ -1,6 +1,7 @@
 """User model."""
 
 from enum import Enum
+from datetime import datetime
 from typing import Optional, List
 from sqlmodel import SQLModel, Field, Relationship
 from .base import BaseModel
@@ -25,6 +26,7 @@ class User(BaseModel, table=True):
     role: UserRole = Field(default=UserRole.TEACHER)
     is_active: bool = Field(default=True)
     is_verified: bool = Field(default=False)
+    last_login: Optional[datetime] = None
     
     # Organization relationship
     organization_id: Optional[int] = Field(default=None, foreign_key="organizations.id")
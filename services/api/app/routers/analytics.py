@@ -4,14 +4,16 @@ from typing import List, Optional, Dict, Any
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, Query, status
-from sqlmodel import Session, select, func, and_, text
+from sqlmodel import select, func
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ..models.student import Student
 from ..models.iep import IEP, IEPGoal
-from ..models.behavior_event import BehaviorEvent
-from ..models.lesson_plan import LessonPlan
 from ..models.evidence import Evidence
 from ..core.auth import get_current_user
+from ..core.tenancy import TenantScope, get_tenant_scope
+from ..services.behavior_patterns import compute_behavior_patterns
+from ..services.dashboard import get_dashboard
 from ..database import get_session
 
 router = APIRouter(prefix="/analytics", tags=["analytics"])
@@ -19,61 +21,19 @@ router = APIRouter(prefix="/analytics", tags=["analytics"])
 @router.get("/dashboard")
 async def get_dashboard_analytics(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: dict = Depends(get_current_user),
+    scope: TenantScope = Depends(get_tenant_scope),
 ):
     """Get high-level analytics for the main dashboard."""
-    # Total counts
-    total_students = session.scalar(select(func.count(Student.id)))
-    total_goals = session.scalar(select(func.count(IEPGoal.id)))
-    total_behavior_events = session.scalar(select(func.count(BehaviorEvent.id)))
-    total_lesson_plans = session.scalar(select(func.count(LessonPlan.id)))
-    
-    # Recent activity (last 30 days)
-    thirty_days_ago = date.today() - timedelta(days=30)
-    
-    recent_behavior_events = session.scalar(
-        select(func.count(BehaviorEvent.id))
-        .where(func.date(BehaviorEvent.date) >= thirty_days_ago)
-    )
-    
-    recent_lesson_plans = session.scalar(
-        select(func.count(LessonPlan.id))
-        .where(func.date(LessonPlan.date) >= thirty_days_ago)
-    )
-    
-    # Goal progress statistics
-    goals_completed = session.scalar(
-        select(func.count(IEPGoal.id))
-        .where(IEPGoal.progress >= 100)
-    )
-    
-    average_goal_progress = session.scalar(
-        select(func.avg(IEPGoal.progress))
-    ) or 0
-    
-    return {
-        "totals": {
-            "students": total_students or 0,
-            "goals": total_goals or 0,
-            "behavior_events": total_behavior_events or 0,
-            "lesson_plans": total_lesson_plans or 0
-        },
-        "recent_activity": {
-            "behavior_events_30d": recent_behavior_events or 0,
-            "lesson_plans_30d": recent_lesson_plans or 0
-        },
-        "goal_progress": {
-            "completed_goals": goals_completed or 0,
-            "average_progress": round(float(average_goal_progress), 2)
-        }
-    }
+    return await get_dashboard(session, scope.organization_id)
 
 @router.get("/student-performance")
 async def get_student_performance_analytics(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: dict = Depends(get_current_user),
+    scope: TenantScope = Depends(get_tenant_scope),
     from_date: Optional[date] = Query(None, description="Start date for analysis"),
     to_date: Optional[date] = Query(None, description="End date for analysis"),
 ):
@@ -85,22 +45,24 @@ async def get_student_performance_analytics(
         from_date = to_date - timedelta(days=90)
     
     # Get students with their goal progress
-    students_query = """
-    SELECT 
-        s.id,
-        s.first_name,
-        s.last_name,
-        COUNT(g.id) as total_goals,
-        AVG(g.progress) as avg_progress,
-        COUNT(CASE WHEN g.progress >= 100 THEN 1 END) as completed_goals
-    FROM student s
-    LEFT JOIN iep i ON s.id = i.student_id
-    LEFT JOIN iepgoal g ON i.id = g.iep_id
-    GROUP BY s.id, s.first_name, s.last_name
-    ORDER BY avg_progress DESC
-    """
+    average_progress = func.avg(IEPGoal.progress_percentage)
+    students_query = scope.apply(
+        select(
+            Student.id,
+            Student.first_name,
+            Student.last_name,
+            func.count(IEPGoal.id),
+            average_progress,
+            func.count(IEPGoal.id).filter(IEPGoal.progress_percentage >= 100),
+        )
+        .outerjoin(IEP, IEP.student_id == Student.id)
+        .outerjoin(IEPGoal, IEPGoal.iep_id == IEP.id)
+        .group_by(Student.id, Student.first_name, Student.last_name)
+        .order_by(average_progress.desc()),
+        Student.organization_id,
+    )
     
-    result = session.exec(text(students_query))
+    result = await session.execute(students_query)
     student_performance = [
         {
             "student_id": row[0],
@@ -120,8 +82,9 @@ async def get_student_performance_analytics(
 @router.get("/behavior-patterns")
 async def get_behavior_pattern_analytics(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: dict = Depends(get_current_user),
+    scope: TenantScope = Depends(get_tenant_scope),
     from_date: Optional[date] = Query(None, description="Start date"),
     to_date: Optional[date] = Query(None, description="End date"),
 ):
@@ -131,68 +94,33 @@ async def get_behavior_pattern_analytics(
     if not from_date:
         from_date = to_date - timedelta(days=90)
     
-    # Behavior events in date range
-    behavior_query = select(BehaviorEvent).where(
-        and_(
-            func.date(BehaviorEvent.date) >= from_date,
-            func.date(BehaviorEvent.date) <= to_date
-        )
-    )
-    behavior_events = session.exec(behavior_query).all()
-    
-    # Analyze patterns
-    patterns = {
-        "by_day_of_week": {},
-        "by_time_of_day": {},
-        "by_type": {},
-        "by_severity": {},
-        "by_student": {}
-    }
-    
-    for event in behavior_events:
-        # Day of week (0=Monday, 6=Sunday)
-        day_name = event.date.strftime('%A')
-        patterns["by_day_of_week"][day_name] = patterns["by_day_of_week"].get(day_name, 0) + 1
-        
-        # Time of day (hour)
-        hour = event.date.hour
-        time_period = "Morning" if 6 <= hour < 12 else "Afternoon" if 12 <= hour < 18 else "Evening"
-        patterns["by_time_of_day"][time_period] = patterns["by_time_of_day"].get(time_period, 0) + 1
-        
-        # By type
-        patterns["by_type"][event.incident_type] = patterns["by_type"].get(event.incident_type, 0) + 1
-        
-        # By severity
-        patterns["by_severity"][event.severity] = patterns["by_severity"].get(event.severity, 0) + 1
-        
-        # By student (top 10)
-        student_key = str(event.student_id)
-        patterns["by_student"][student_key] = patterns["by_student"].get(student_key, 0) + 1
-    
-    # Sort student patterns and take top 10
-    patterns["by_student"] = dict(
-        sorted(patterns["by_student"].items(), key=lambda x: x[1], reverse=True)[:10]
+    result = await compute_behavior_patterns(
+        session, from_date, to_date, organization_id=scope.organization_id
     )
     
     return {
         "period": {"from_date": from_date, "to_date": to_date},
-        "total_events": len(behavior_events),
-        "patterns": patterns
+        "total_events": result["total_events"],
+        "patterns": result["patterns"]
     }
 
 @router.get("/goal-effectiveness")
 async def get_goal_effectiveness_analytics(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: dict = Depends(get_current_user),
+    scope: TenantScope = Depends(get_tenant_scope),
     domain: Optional[str] = Query(None, description="Filter by goal domain"),
 ):
     """Analyze the effectiveness of different types of IEP goals."""
-    query = select(IEPGoal)
+    query = scope.apply(
+        select(IEPGoal).join(IEP).join(Student, Student.id == IEP.student_id),
+        Student.organization_id,
+    )
     if domain:
         query = query.where(IEPGoal.domain == domain)
     
-    goals = session.exec(query).all()
+    goals = (await session.exec(query)).all()
     
     # Analyze by domain
     domain_analysis = {}
@@ -5,13 +5,15 @@ from datetime import datetime, timedelta
 from typing import Dict, Any
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.database import get_session
 from app.core.auth import (
-    authenticate_user, create_access_token, get_current_active_user,
-    get_password_hash
+    authenticate_user, create_access_token, get_current_user_record
 )
+from app.core.hashing import password_hasher
+from app.core.principals import invalidate_principal
 from app.models.user import User, UserCreate, UserLogin, Token, UserPublic, UserUpdate
 from app.core.config import settings
 
@@ -22,10 +24,12 @@ security = HTTPBearer()
 @router.post("/login", response_model=Token)
 async def login(
     user_credentials: UserLogin,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ):
     """Login endpoint."""
-    user = authenticate_user(session, user_credentials.email, user_credentials.password)
+    user = await authenticate_user(
+        session, user_credentials.email, user_credentials.password
+    )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -41,7 +45,7 @@ async def login(
     # Update last login
     user.last_login = datetime.utcnow()
     session.add(user)
-    session.commit()
+    await session.commit()
     
     return {"access_token": access_token, "token_type": "bearer"}
 
@@ -49,12 +53,12 @@ async def login(
 @router.post("/signup", response_model=UserPublic)
 async def signup(
     user_data: UserCreate,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session)
 ):
     """User signup endpoint."""
     # Check if user already exists
     statement = select(User).where(User.email == user_data.email)
-    existing_user = session.exec(statement).first()
+    existing_user = (await session.exec(statement)).first()
     
     if existing_user:
         raise HTTPException(
@@ -63,7 +67,7 @@ async def signup(
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await password_hasher.hash(user_data.password)
     db_user = User(
         email=user_data.email,
         hashed_password=hashed_password,
@@ -74,15 +78,15 @@ async def signup(
     )
     
     session.add(db_user)
-    session.commit()
-    session.refresh(db_user)
+    await session.commit()
+    await session.refresh(db_user)
     
     return db_user
 
 
 @router.get("/me", response_model=UserPublic)
 async def get_current_user(
-    current_user: User = Depends(get_current_active_user)
+    current_user: User = Depends(get_current_user_record)
 ):
     """Get current authenticated user."""
     return current_user
@@ -91,8 +95,8 @@ async def get_current_user(
 @router.put("/me", response_model=UserPublic)
 async def update_current_user(
     user_update: UserUpdate,
-    current_user: User = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+    current_user: User = Depends(get_current_user_record),
+    session: AsyncSession = Depends(get_session)
 ):
     """Update current user profile."""
     user_data = user_update.model_dump(exclude_unset=True)
@@ -100,8 +104,9 @@ async def update_current_user(
         setattr(current_user, key, value)
     
     session.add(current_user)
-    session.commit()
-    session.refresh(current_user)
+    await session.commit()
+    await session.refresh(current_user)
+    await invalidate_principal(current_user.id)
     
     return current_user
 
@@ -110,20 +115,19 @@ async def update_current_user(
 async def change_password(
     current_password: str,
     new_password: str,
-    current_user: User = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+    current_user: User = Depends(get_current_user_record),
+    session: AsyncSession = Depends(get_session)
 ):
     """Change user password."""
-    from app.core.auth import verify_password
-    
-    if not verify_password(current_password, current_user.hashed_password):
+    if not await password_hasher.verify(current_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Incorrect current password"
         )
     
-    current_user.hashed_password = get_password_hash(new_password)
+    current_user.hashed_password = await password_hasher.hash(new_password)
     session.add(current_user)
-    session.commit()
+    await session.commit()
+    await invalidate_principal(current_user.id)
     
     return {"message": "Password updated successfully"}
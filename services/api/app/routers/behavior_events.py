@@ -1,33 +1,89 @@
 """Behavior events router for managing student behavior incidents and tracking."""
 from datetime import datetime, date
 from typing import List, Optional
-from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlmodel import Session, select, col
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlalchemy import insert
+from sqlmodel import select, col
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from ..models.behavior_event import BehaviorEvent, BehaviorEventCreate, BehaviorEventUpdate, BehaviorEventRead
+from ..models.behavior_event import (
+    BehaviorEvent, BehaviorEventCreate, BehaviorEventUpdate, BehaviorEventRead,
+    BehaviorEventBulkCreate, BehaviorEventBulkResult, BehaviorEventBulkResponse,
+)
 from ..models.student import Student
 from ..core.auth import get_current_user
+from ..core.pagination import paginate, set_next_cursor
+from ..core.serialization import json_response, parse_fields, project
+from ..core.sql import date_range
+from ..core.tenancy import TenantScope, get_tenant_scope
 from ..database import get_session
+from ..services import behavior_rollup
+from ..services.dashboard import invalidate_dashboard
+from ..services.sync import record_deletion
 
 router = APIRouter(prefix="/behavior-events", tags=["behavior-events"])
 
+
+async def _get_scoped_event(
+    session: AsyncSession, behavior_event_id: int, scope: TenantScope
+) -> BehaviorEvent:
+    """Load a behavior event within the caller's tenant scope."""
+    behavior_event = (await session.exec(scope.apply(
+        select(BehaviorEvent).where(BehaviorEvent.id == behavior_event_id),
+        BehaviorEvent.organization_id,
+    ))).first()
+    if not behavior_event:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Behavior event not found"
+        )
+    return behavior_event
+
+
+async def _event_organization(
+    session: AsyncSession, behavior_event: BehaviorEvent
+) -> int:
+    """Organization of an event, backfilled from its student when unset.
+
+    Rows written before ``organization_id`` existed carry NULL, and the
+    rollup needs a real organization for every bucket it touches.
+    """
+    if behavior_event.organization_id is None:
+        behavior_event.organization_id = await session.scalar(
+            select(Student.organization_id)
+            .where(Student.id == behavior_event.student_id)
+        )
+    return behavior_event.organization_id
+
+
 @router.get("/", response_model=List[BehaviorEventRead])
 async def list_behavior_events(
     *,
-    session: Session = Depends(get_session),
+    response: Response,
+    session: AsyncSession = Depends(get_session),
     current_user: dict = Depends(get_current_user),
-    student_id: Optional[UUID] = Query(None, description="Filter by student ID"),
+    scope: TenantScope = Depends(get_tenant_scope),
+    student_id: Optional[int] = Query(None, description="Filter by student ID"),
     incident_type: Optional[str] = Query(None, description="Filter by incident type"),
     severity: Optional[str] = Query(None, description="Filter by severity"),
     from_date: Optional[date] = Query(None, description="Filter events from this date"),
     to_date: Optional[date] = Query(None, description="Filter events to this date"),
     limit: int = Query(default=50, le=100),
     offset: int = Query(default=0, ge=0),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from a previous page's X-Next-Cursor header"
+    ),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return (default: all)"
+    ),
 ):
     """Retrieve behavior events with filtering options."""
-    query = select(BehaviorEvent)
+    field_names = parse_fields(fields, BehaviorEvent, BehaviorEventRead)
+    query = scope.apply(
+        project(BehaviorEvent, field_names, BehaviorEvent.date_time),
+        BehaviorEvent.organization_id,
+    )
     
     # Apply filters
     if student_id:
@@ -36,95 +92,166 @@ async def list_behavior_events(
         query = query.where(BehaviorEvent.incident_type == incident_type)
     if severity:
         query = query.where(BehaviorEvent.severity == severity)
-    if from_date:
-        query = query.where(col(BehaviorEvent.date).cast(date) >= from_date)
-    if to_date:
-        query = query.where(col(BehaviorEvent.date).cast(date) <= to_date)
-    
-    # Add pagination
-    query = query.offset(offset).limit(limit)
+    if from_date or to_date:
+        query = query.where(*date_range(BehaviorEvent.date_time, from_date, to_date))
     
-    behavior_events = session.exec(query).all()
-    return behavior_events
+    # Newest first, paginated on (date_time, id)
+    behavior_events, next_cursor = await paginate(
+        session, query, BehaviorEvent.date_time, BehaviorEvent.id,
+        limit=limit, cursor=cursor, offset=offset,
+    )
+    set_next_cursor(response, next_cursor)
+    return json_response(behavior_events, field_names, response)
+
 
 @router.post("/", response_model=BehaviorEventRead)
 async def create_behavior_event(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: dict = Depends(get_current_user),
+    scope: TenantScope = Depends(get_tenant_scope),
     behavior_event: BehaviorEventCreate,
 ):
     """Create a new behavior event."""
-    # Verify student exists
-    student = session.get(Student, behavior_event.student_id)
-    if not student:
+    # Verify the student exists within the caller's organization
+    organization_id = await session.scalar(scope.apply(
+        select(Student.organization_id).where(Student.id == behavior_event.student_id),
+        Student.organization_id,
+    ))
+    if organization_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Student not found"
         )
     
-    db_behavior_event = BehaviorEvent.model_validate(behavior_event)
+    db_behavior_event = BehaviorEvent.model_validate(
+        behavior_event,
+        update={
+            "data_collector_id": current_user.id,
+            "organization_id": organization_id,
+        },
+    )
     session.add(db_behavior_event)
-    session.commit()
-    session.refresh(db_behavior_event)
+    await behavior_rollup.add_event(session, db_behavior_event, organization_id)
+    await session.commit()
+    await invalidate_dashboard(organization_id)
+    await session.refresh(db_behavior_event)
     return db_behavior_event
 
+@router.post("/bulk", response_model=BehaviorEventBulkResponse)
+async def create_behavior_events_bulk(
+    *,
+    session: AsyncSession = Depends(get_session),
+    current_user: dict = Depends(get_current_user),
+    scope: TenantScope = Depends(get_tenant_scope),
+    bulk: BehaviorEventBulkCreate,
+):
+    """Create many behavior events in one transaction.
+
+    Items for unknown students are rejected individually; the rest are
+    inserted together and reported with their new ids, in request order.
+    """
+    student_ids = {item.student_id for item in bulk.items}
+    organizations = dict(
+        (await session.execute(scope.apply(
+            select(Student.id, Student.organization_id)
+            .where(col(Student.id).in_(student_ids)),
+            Student.organization_id,
+        ))).all()
+    )
+
+    results: List[Optional[BehaviorEventBulkResult]] = [None] * len(bulk.items)
+    accepted = []
+    for index, item in enumerate(bulk.items):
+        if item.student_id not in organizations:
+            results[index] = BehaviorEventBulkResult(
+                index=index, status="rejected", detail="Student not found"
+            )
+            continue
+        event = BehaviorEvent.model_validate(
+            item,
+            update={
+                "data_collector_id": current_user.id,
+                "organization_id": organizations[item.student_id],
+            },
+        )
+        accepted.append((index, event))
+
+    if accepted:
+        table = BehaviorEvent.__table__
+        inserted = await session.execute(
+            insert(table).returning(table.c.id, sort_by_parameter_order=True),
+            [event.model_dump(exclude={"id"}) for _, event in accepted],
+        )
+        for (index, event), event_id in zip(accepted, inserted.scalars().all()):
+            results[index] = BehaviorEventBulkResult(
+                index=index, status="created", id=event_id
+            )
+        await behavior_rollup.add_events(
+            session, [(event, event.organization_id) for _, event in accepted]
+        )
+        await session.commit()
+        for organization_id in {event.organization_id for _, event in accepted}:
+            await invalidate_dashboard(organization_id)
+
+    return BehaviorEventBulkResponse(
+        created=len(accepted),
+        rejected=len(bulk.items) - len(accepted),
+        results=results,
+    )
+
 @router.get("/{behavior_event_id}", response_model=BehaviorEventRead)
 async def get_behavior_event(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: dict = Depends(get_current_user),
-    behavior_event_id: UUID,
+    scope: TenantScope = Depends(get_tenant_scope),
+    behavior_event_id: int,
 ):
     """Get a specific behavior event by ID."""
-    behavior_event = session.get(BehaviorEvent, behavior_event_id)
-    if not behavior_event:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Behavior event not found"
-        )
-    return behavior_event
+    return await _get_scoped_event(session, behavior_event_id, scope)
 
 @router.patch("/{behavior_event_id}", response_model=BehaviorEventRead)
 async def update_behavior_event(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: dict = Depends(get_current_user),
-    behavior_event_id: UUID,
+    scope: TenantScope = Depends(get_tenant_scope),
+    behavior_event_id: int,
     behavior_event_update: BehaviorEventUpdate,
 ):
     """Update a behavior event."""
-    behavior_event = session.get(BehaviorEvent, behavior_event_id)
-    if not behavior_event:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Behavior event not found"
-        )
+    behavior_event = await _get_scoped_event(session, behavior_event_id, scope)
+    
+    # Move the event between rollup buckets around the change
+    organization_id = await _event_organization(session, behavior_event)
+    await behavior_rollup.remove_event(session, behavior_event, organization_id)
     
     behavior_event_data = behavior_event_update.model_dump(exclude_unset=True)
     for field, value in behavior_event_data.items():
         setattr(behavior_event, field, value)
     
     session.add(behavior_event)
-    session.commit()
-    session.refresh(behavior_event)
+    await behavior_rollup.add_event(session, behavior_event, organization_id)
+    await session.commit()
+    await invalidate_dashboard(organization_id)
+    await session.refresh(behavior_event)
     return behavior_event
 
 @router.delete("/{behavior_event_id}")
 async def delete_behavior_event(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: dict = Depends(get_current_user),
-    behavior_event_id: UUID,
+    scope: TenantScope = Depends(get_tenant_scope),
+    behavior_event_id: int,
 ):
     """Delete a behavior event."""
-    behavior_event = session.get(BehaviorEvent, behavior_event_id)
-    if not behavior_event:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Behavior event not found"
-        )
-    
-    session.delete(behavior_event)
-    session.commit()
+    behavior_event = await _get_scoped_event(session, behavior_event_id, scope)
+    organization_id = await _event_organization(session, behavior_event)
+    await behavior_rollup.remove_event(session, behavior_event, organization_id)
+    record_deletion(session, "behavior_events", behavior_event.id, organization_id)
+    await session.delete(behavior_event)
+    await session.commit()
+    await invalidate_dashboard(organization_id)
     return {"message": "Behavior event deleted successfully"}
@@ -1,180 +1,376 @@
 """Evidence router for managing goal progress documentation and evidence files."""
-from typing import List, Optional
-from uuid import UUID
+import mimetypes
+from datetime import datetime
+from typing import List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status, UploadFile, File
-from sqlmodel import Session, select
+from fastapi import (
+    APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile,
+    status,
+)
+from sqlmodel import select, func
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from ..models.evidence import Evidence, EvidenceCreate, EvidenceUpdate, EvidenceRead
-from ..models.iep import IEPGoal
+from ..models.evidence import (
+    Evidence, EvidenceCreate, EvidenceUpdate, EvidenceRead, EvidenceType
+)
+from ..models.iep import IEP, IEPGoal
+from ..models.student import Student, StudentParentLink
+from ..models.user import UserRole
 from ..core.auth import get_current_user
+from ..core.config import settings
+from ..core.etags import strong_etag
+from ..core.pagination import paginate, set_next_cursor
+from ..core.principals import Principal
+from ..core.storage import blob_response, blob_store, iter_upload
+from ..core.tenancy import TenantScope, get_tenant_scope
 from ..database import get_session
+from ..services.blobs import keep_blob, schedule_blob_deletion
+from ..services.previews import enqueue_preview
 
 router = APIRouter(prefix="/evidence", tags=["evidence"])
 
+
+async def _get_scoped_evidence(
+    session: AsyncSession, evidence_id: int, scope: TenantScope
+) -> Evidence:
+    """Load an evidence record within the caller's tenant scope."""
+    evidence = (await session.exec(scope.apply(
+        select(Evidence).where(Evidence.id == evidence_id),
+        Evidence.organization_id,
+    ))).first()
+    if not evidence:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Evidence record not found"
+        )
+    return evidence
+
+
+async def _get_accessible_evidence(
+    session: AsyncSession, evidence_id: int, current_user: Principal, scope: TenantScope
+) -> Evidence:
+    """Load an evidence record the current user may see.
+
+    Staff see evidence from their own organization. Parents only see records
+    shared with parents for students they are linked to.
+    """
+    evidence = await _get_scoped_evidence(session, evidence_id, scope)
+    
+    if current_user.role == UserRole.PARENT:
+        linked = evidence.student_id is not None and await session.scalar(
+            select(func.count()).select_from(StudentParentLink).where(
+                StudentParentLink.student_id == evidence.student_id,
+                StudentParentLink.parent_id == current_user.id,
+            )
+        )
+        if not (linked and evidence.shared_with_parents):
+            raise HTTPException(status_code=403, detail="Access denied")
+    
+    return evidence
+
+
+def _visibility_predicates(current_user: Principal) -> List:
+    """The parent rule of :func:`_get_accessible_evidence` as list query filters."""
+    if current_user.role != UserRole.PARENT:
+        return []
+    linked_students = select(StudentParentLink.student_id).where(
+        StudentParentLink.parent_id == current_user.id
+    )
+    return [
+        Evidence.shared_with_parents.is_(True),
+        Evidence.student_id.in_(linked_students),
+    ]
+
+
+async def _get_scoped_goal(
+    session: AsyncSession, goal_id: int, scope: TenantScope
+) -> Tuple[int, int]:
+    """Student and organization of an IEP goal within the caller's tenant scope."""
+    row = (await session.exec(scope.apply(
+        select(IEP.student_id, Student.organization_id)
+        .select_from(IEPGoal)
+        .join(IEP, IEP.id == IEPGoal.iep_id)
+        .join(Student, Student.id == IEP.student_id)
+        .where(IEPGoal.id == goal_id),
+        Student.organization_id,
+    ))).first()
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="IEP goal not found"
+        )
+    return row
+
+
+async def _get_scoped_student_organization(
+    session: AsyncSession, student_id: int, scope: TenantScope
+) -> int:
+    """Organization of a student within the caller's tenant scope."""
+    organization_id = (await session.exec(scope.apply(
+        select(Student.organization_id).where(Student.id == student_id),
+        Student.organization_id,
+    ))).first()
+    if organization_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Student not found"
+        )
+    return organization_id
+
+
 @router.get("/", response_model=List[EvidenceRead])
 async def list_evidence(
     *,
-    session: Session = Depends(get_session),
-    current_user: dict = Depends(get_current_user),
-    goal_id: Optional[UUID] = Query(None, description="Filter by IEP goal ID"),
+    response: Response,
+    session: AsyncSession = Depends(get_session),
+    current_user: Principal = Depends(get_current_user),
+    scope: TenantScope = Depends(get_tenant_scope),
+    goal_id: Optional[int] = Query(None, description="Filter by IEP goal ID"),
     evidence_type: Optional[str] = Query(None, description="Filter by evidence type"),
     limit: int = Query(default=50, le=100),
     offset: int = Query(default=0, ge=0),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from a previous page's X-Next-Cursor header"
+    ),
 ):
     """Retrieve evidence records with filtering options."""
-    query = select(Evidence)
+    query = scope.apply(
+        select(Evidence).where(*_visibility_predicates(current_user)),
+        Evidence.organization_id,
+    )
     
     # Apply filters
     if goal_id:
-        query = query.where(Evidence.goal_id == goal_id)
+        query = query.where(Evidence.iep_goal_id == goal_id)
     if evidence_type:
         query = query.where(Evidence.evidence_type == evidence_type)
     
-    # Add pagination and ordering
-    query = query.order_by(Evidence.date_collected.desc()).offset(offset).limit(limit)
-    
-    evidence_records = session.exec(query).all()
+    # Newest first, paginated on (collected_date, id)
+    evidence_records, next_cursor = await paginate(
+        session, query, Evidence.collected_date, Evidence.id,
+        limit=limit, cursor=cursor, offset=offset,
+    )
+    set_next_cursor(response, next_cursor)
     return evidence_records
 
 @router.post("/", response_model=EvidenceRead)
 async def create_evidence(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: dict = Depends(get_current_user),
+    scope: TenantScope = Depends(get_tenant_scope),
     evidence: EvidenceCreate,
 ):
     """Create a new evidence record."""
-    # Verify goal exists
-    goal = session.get(IEPGoal, evidence.goal_id)
-    if not goal:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="IEP goal not found"
+    # Verify the goal or student exists in scope; evidence belongs to its
+    # student's organization
+    if evidence.iep_goal_id:
+        student_id, organization_id = await _get_scoped_goal(
+            session, evidence.iep_goal_id, scope
+        )
+    elif evidence.student_id:
+        student_id = evidence.student_id
+        organization_id = await _get_scoped_student_organization(
+            session, student_id, scope
         )
+    else:
+        student_id, organization_id = None, current_user.organization_id
     
-    db_evidence = Evidence.model_validate(evidence)
+    db_evidence = Evidence.model_validate(
+        evidence,
+        update={
+            "student_id": student_id,
+            "collected_by_id": current_user.id,
+            "organization_id": organization_id,
+        },
+    )
     session.add(db_evidence)
-    session.commit()
-    session.refresh(db_evidence)
+    await session.commit()
+    await session.refresh(db_evidence)
     return db_evidence
 
 @router.post("/upload", response_model=EvidenceRead)
 async def upload_evidence_file(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: dict = Depends(get_current_user),
-    goal_id: UUID,
-    evidence_type: str,
-    description: str,
+    scope: TenantScope = Depends(get_tenant_scope),
+    goal_id: int,
+    evidence_type: EvidenceType,
+    description: Optional[str] = None,
+    title: Optional[str] = None,
     file: UploadFile = File(...),
 ):
-    """Upload an evidence file (photo, video, document, etc.)."""
+    """Upload an evidence file (photo, video, document, etc.).
+
+    The file is streamed into the blob store in chunks; identical content
+    uploaded twice is stored once.
+    """
     # Verify goal exists
-    goal = session.get(IEPGoal, goal_id)
-    if not goal:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="IEP goal not found"
-        )
+    student_id, organization_id = await _get_scoped_goal(session, goal_id, scope)
     
-    # TODO: Implement file storage (S3, local storage, etc.)
-    # For now, we'll just store metadata
-    file_path = f"evidence/{goal_id}/{file.filename}"
+    stored = await blob_store.put_stream(iter_upload(file, settings.UPLOAD_CHUNK_SIZE))
+    mime_type = (
+        file.content_type
+        or mimetypes.guess_type(file.filename or "")[0]
+        or "application/octet-stream"
+    )
     
-    evidence_data = EvidenceCreate(
-        goal_id=goal_id,
-        evidence_type=evidence_type,
+    db_evidence = Evidence(
+        title=title or file.filename or "Untitled upload",
         description=description,
-        file_path=file_path,
-        file_type=file.content_type
+        evidence_type=evidence_type,
+        file_path=stored.key,
+        file_name=file.filename,
+        file_size=stored.size,
+        mime_type=mime_type,
+        content_sha256=stored.sha256,
+        student_id=student_id,
+        iep_goal_id=goal_id,
+        collected_date=datetime.utcnow(),
+        collected_by_id=current_user.id,
+        organization_id=organization_id,
     )
-    
-    db_evidence = Evidence.model_validate(evidence_data)
     session.add(db_evidence)
-    session.commit()
-    session.refresh(db_evidence)
+    if not stored.created:
+        await keep_blob(session, stored.key)
+    try:
+        await session.commit()
+    except Exception:
+        # Don't leave a blob behind that no record points to
+        if stored.created:
+            await blob_store.delete(stored.key)
+        raise
+    await session.refresh(db_evidence)
+    await enqueue_preview(db_evidence)
     
     return db_evidence
 
 @router.get("/goal/{goal_id}", response_model=List[EvidenceRead])
 async def get_evidence_for_goal(
     *,
-    session: Session = Depends(get_session),
-    current_user: dict = Depends(get_current_user),
-    goal_id: UUID,
+    session: AsyncSession = Depends(get_session),
+    current_user: Principal = Depends(get_current_user),
+    scope: TenantScope = Depends(get_tenant_scope),
+    goal_id: int,
 ):
     """Get all evidence records for a specific IEP goal."""
     # Verify goal exists
-    goal = session.get(IEPGoal, goal_id)
-    if not goal:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="IEP goal not found"
-        )
+    await _get_scoped_goal(session, goal_id, scope)
     
-    query = select(Evidence).where(Evidence.goal_id == goal_id).order_by(Evidence.date_collected.desc())
-    evidence_records = session.exec(query).all()
+    query = scope.apply(
+        select(Evidence).where(
+            Evidence.iep_goal_id == goal_id, *_visibility_predicates(current_user)
+        ),
+        Evidence.organization_id,
+    ).order_by(Evidence.collected_date.desc())
+    evidence_records = (await session.exec(query)).all()
     return evidence_records
 
 @router.get("/{evidence_id}", response_model=EvidenceRead)
 async def get_evidence(
     *,
-    session: Session = Depends(get_session),
-    current_user: dict = Depends(get_current_user),
-    evidence_id: UUID,
+    session: AsyncSession = Depends(get_session),
+    current_user: Principal = Depends(get_current_user),
+    scope: TenantScope = Depends(get_tenant_scope),
+    evidence_id: int,
 ):
     """Get a specific evidence record by ID."""
-    evidence = session.get(Evidence, evidence_id)
-    if not evidence:
+    return await _get_accessible_evidence(session, evidence_id, current_user, scope)
+
+@router.get("/{evidence_id}/content")
+async def get_evidence_content(
+    *,
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    current_user: Principal = Depends(get_current_user),
+    scope: TenantScope = Depends(get_tenant_scope),
+    evidence_id: int,
+):
+    """Download an evidence file.
+
+    The content hash is the ETag, so If-None-Match revalidation is answered
+    with 304. Range requests are honored so media players can seek without
+    re-downloading the file.
+    """
+    evidence = await _get_accessible_evidence(session, evidence_id, current_user, scope)
+    if not evidence.file_path or not evidence.content_sha256:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="Evidence record not found"
+            detail="Evidence record has no stored file"
         )
-    return evidence
+    
+    return await blob_response(
+        request,
+        evidence.file_path,
+        strong_etag(evidence.content_sha256),
+        evidence.mime_type,
+        evidence.file_name,
+    )
+
+@router.get("/{evidence_id}/preview")
+async def get_evidence_preview(
+    *,
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    current_user: Principal = Depends(get_current_user),
+    scope: TenantScope = Depends(get_tenant_scope),
+    evidence_id: int,
+):
+    """Download the JPEG preview of an evidence file, once it has been generated."""
+    evidence = await _get_accessible_evidence(session, evidence_id, current_user, scope)
+    if not evidence.preview_path or not evidence.content_sha256:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Evidence record has no preview"
+        )
+    
+    return await blob_response(
+        request,
+        evidence.preview_path,
+        strong_etag(f"{evidence.content_sha256}-preview"),
+        "image/jpeg",
+        None,
+    )
 
 @router.patch("/{evidence_id}", response_model=EvidenceRead)
 async def update_evidence(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: dict = Depends(get_current_user),
-    evidence_id: UUID,
+    scope: TenantScope = Depends(get_tenant_scope),
+    evidence_id: int,
     evidence_update: EvidenceUpdate,
 ):
     """Update an evidence record."""
-    evidence = session.get(Evidence, evidence_id)
-    if not evidence:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Evidence record not found"
-        )
+    evidence = await _get_scoped_evidence(session, evidence_id, scope)
     
     evidence_data = evidence_update.model_dump(exclude_unset=True)
     for field, value in evidence_data.items():
         setattr(evidence, field, value)
     
     session.add(evidence)
-    session.commit()
-    session.refresh(evidence)
+    await session.commit()
+    await session.refresh(evidence)
     return evidence
 
 @router.delete("/{evidence_id}")
 async def delete_evidence(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: dict = Depends(get_current_user),
-    evidence_id: UUID,
+    scope: TenantScope = Depends(get_tenant_scope),
+    evidence_id: int,
 ):
     """Delete an evidence record."""
-    evidence = session.get(Evidence, evidence_id)
-    if not evidence:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Evidence record not found"
-        )
+    evidence = await _get_scoped_evidence(session, evidence_id, scope)
     
-    # TODO: Also delete the associated file from storage
+    # Blobs are shared by identical uploads; the sweep deletes them once
+    # nothing references them
+    for key in (evidence.file_path, evidence.preview_path):
+        if key:
+            schedule_blob_deletion(session, key)
+    await session.delete(evidence)
+    await session.commit()
     
-    session.delete(evidence)
-    session.commit()
     return {"message": "Evidence record deleted successfully"}
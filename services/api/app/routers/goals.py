@@ -1,59 +1,89 @@
 """
 IEP Goals router with CRUD operations.
 """
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import Session, select
+from typing import List, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.database import get_session
+from app.core.pagination import paginate, set_next_cursor
 from app.core.auth import get_current_active_user
-from app.models.user import User
+from app.core.principals import Principal
+from app.core.tenancy import TenantScope, get_tenant_scope
 from app.models.iep import IEP, IEPGoal, IEPGoalCreate, IEPGoalUpdate, IEPGoalRead
+from app.models.student import Student
+from app.services.dashboard import invalidate_dashboard
+from app.services.sync import record_deletion
 
 router = APIRouter()
 
 
+async def _get_accessible_goal(
+    session: AsyncSession, goal_id: int, scope: TenantScope
+) -> Tuple[IEPGoal, int]:
+    """Load a goal the user may access, with its organization, in one query.
+
+    Goals outside the caller's tenant scope are simply not found.
+    """
+    row = (await session.exec(scope.apply(
+        select(IEPGoal, Student.organization_id)
+        .join(IEP, IEP.id == IEPGoal.iep_id)
+        .join(Student, Student.id == IEP.student_id)
+        .where(IEPGoal.id == goal_id),
+        Student.organization_id,
+    ))).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="Goal not found")
+    return row
+
+
 @router.get("/", response_model=List[IEPGoalRead])
 async def list_goals(
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_active_user),
+    response: Response,
+    session: AsyncSession = Depends(get_session),
+    current_user: Principal = Depends(get_current_active_user),
+    scope: TenantScope = Depends(get_tenant_scope),
     student_id: Optional[int] = Query(None, description="Filter by student"),
     iep_id: Optional[int] = Query(None, description="Filter by IEP"),
     skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=1000)
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from a previous page's X-Next-Cursor header"
+    )
 ):
     """List IEP goals with optional filtering."""
-    query = select(IEPGoal)
+    query = scope.apply(
+        select(IEPGoal)
+        .join(IEP, IEP.id == IEPGoal.iep_id)
+        .join(Student, Student.id == IEP.student_id),
+        Student.organization_id,
+    )
     
     if student_id:
-        query = query.where(IEPGoal.student_id == student_id)
+        query = query.where(IEP.student_id == student_id)
     
     if iep_id:
         query = query.where(IEPGoal.iep_id == iep_id)
     
-    # Filter by organization for non-admin users
-    if current_user.role != "ADMIN":
-        query = query.join(IEP).where(IEP.organization_id == current_user.organization_id)
-    
-    query = query.offset(skip).limit(limit)
-    goals = session.exec(query).all()
+    # Oldest first, paginated on (created_at, id)
+    goals, next_cursor = await paginate(
+        session, query, IEPGoal.created_at, IEPGoal.id,
+        limit=limit, cursor=cursor, offset=skip, descending=False,
+    )
+    set_next_cursor(response, next_cursor)
     return goals
 
 
 @router.get("/{goal_id}", response_model=IEPGoalRead)
 async def get_goal(
     goal_id: int,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_active_user)
+    session: AsyncSession = Depends(get_session),
+    current_user: Principal = Depends(get_current_active_user),
+    scope: TenantScope = Depends(get_tenant_scope)
 ):
     """Get a specific IEP goal."""
-    goal = session.get(IEPGoal, goal_id)
-    if not goal:
-        raise HTTPException(status_code=404, detail="Goal not found")
-    
-    # Check organization access
-    if current_user.role != "ADMIN" and goal.iep.organization_id != current_user.organization_id:
-        raise HTTPException(status_code=403, detail="Access denied")
+    goal, organization_id = await _get_accessible_goal(session, goal_id, scope)
     
     return goal
 
@@ -61,22 +91,26 @@ async def get_goal(
 @router.post("/", response_model=IEPGoalRead)
 async def create_goal(
     goal: IEPGoalCreate,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_active_user)
+    session: AsyncSession = Depends(get_session),
+    current_user: Principal = Depends(get_current_active_user),
+    scope: TenantScope = Depends(get_tenant_scope)
 ):
     """Create a new IEP goal."""
-    # Verify IEP exists and user has access
-    iep = session.get(IEP, goal.iep_id)
-    if not iep:
+    # Verify the IEP exists and the user has access
+    organization_id = await session.scalar(scope.apply(
+        select(Student.organization_id)
+        .join(IEP, IEP.student_id == Student.id)
+        .where(IEP.id == goal.iep_id),
+        Student.organization_id,
+    ))
+    if organization_id is None:
         raise HTTPException(status_code=404, detail="IEP not found")
     
-    if current_user.role != "ADMIN" and iep.organization_id != current_user.organization_id:
-        raise HTTPException(status_code=403, detail="Access denied")
-    
     db_goal = IEPGoal.model_validate(goal)
     session.add(db_goal)
-    session.commit()
-    session.refresh(db_goal)
+    await session.commit()
+    await session.refresh(db_goal)
+    await invalidate_dashboard(organization_id)
     return db_goal
 
 
@@ -84,45 +118,38 @@ async def create_goal(
 async def update_goal(
     goal_id: int,
     goal_update: IEPGoalUpdate,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_active_user)
+    session: AsyncSession = Depends(get_session),
+    current_user: Principal = Depends(get_current_active_user),
+    scope: TenantScope = Depends(get_tenant_scope)
 ):
     """Update an IEP goal."""
-    db_goal = session.get(IEPGoal, goal_id)
-    if not db_goal:
-        raise HTTPException(status_code=404, detail="Goal not found")
-    
-    # Check organization access
-    if current_user.role != "ADMIN" and db_goal.iep.organization_id != current_user.organization_id:
-        raise HTTPException(status_code=403, detail="Access denied")
+    db_goal, organization_id = await _get_accessible_goal(session, goal_id, scope)
     
     goal_data = goal_update.model_dump(exclude_unset=True)
     for key, value in goal_data.items():
         setattr(db_goal, key, value)
     
     session.add(db_goal)
-    session.commit()
-    session.refresh(db_goal)
+    await session.commit()
+    await session.refresh(db_goal)
+    await invalidate_dashboard(organization_id)
     return db_goal
 
 
 @router.delete("/{goal_id}")
 async def delete_goal(
     goal_id: int,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_active_user)
+    session: AsyncSession = Depends(get_session),
+    current_user: Principal = Depends(get_current_active_user),
+    scope: TenantScope = Depends(get_tenant_scope)
 ):
     """Delete an IEP goal."""
-    db_goal = session.get(IEPGoal, goal_id)
-    if not db_goal:
-        raise HTTPException(status_code=404, detail="Goal not found")
+    db_goal, organization_id = await _get_accessible_goal(session, goal_id, scope)
     
-    # Check organization access
-    if current_user.role != "ADMIN" and db_goal.iep.organization_id != current_user.organization_id:
-        raise HTTPException(status_code=403, detail="Access denied")
-    
-    session.delete(db_goal)
-    session.commit()
+    record_deletion(session, "goals", db_goal.id, organization_id)
+    await session.delete(db_goal)
+    await session.commit()
+    await invalidate_dashboard(organization_id)
     return {"message": "Goal deleted successfully"}
 
 
@@ -130,17 +157,12 @@ async def delete_goal(
 async def update_goal_progress(
     goal_id: int,
     progress_data: dict,
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_active_user)
+    session: AsyncSession = Depends(get_session),
+    current_user: Principal = Depends(get_current_active_user),
+    scope: TenantScope = Depends(get_tenant_scope)
 ):
     """Update progress on an IEP goal."""
-    db_goal = session.get(IEPGoal, goal_id)
-    if not db_goal:
-        raise HTTPException(status_code=404, detail="Goal not found")
-    
-    # Check organization access
-    if current_user.role != "ADMIN" and db_goal.iep.organization_id != current_user.organization_id:
-        raise HTTPException(status_code=403, detail="Access denied")
+    db_goal, organization_id = await _get_accessible_goal(session, goal_id, scope)
     
     # Update progress fields
     if "progress_percentage" in progress_data:
@@ -150,7 +172,8 @@ async def update_goal_progress(
         db_goal.progress_notes = progress_data["notes"]
     
     session.add(db_goal)
-    session.commit()
-    session.refresh(db_goal)
+    await session.commit()
+    await session.refresh(db_goal)
+    await invalidate_dashboard(organization_id)
     
     return {"message": "Progress updated successfully", "goal": db_goal}
@@ -3,21 +3,46 @@ from datetime import datetime, date
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlmodel import Session, select, col
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ..models.lesson_plan import LessonPlan, LessonPlanCreate, LessonPlanUpdate, LessonPlanRead
 from ..models.student import Student
 from ..core.auth import get_current_user
+from ..core.pagination import paginate, set_next_cursor
+from ..core.sql import date_range
+from ..core.tenancy import TenantScope, get_tenant_scope
 from ..database import get_session
+from ..services.dashboard import invalidate_dashboard
+from ..services.sync import record_deletion
 
 router = APIRouter(prefix="/lesson-plans", tags=["lesson-plans"])
 
+
+async def _get_scoped_lesson_plan(
+    session: AsyncSession, lesson_plan_id: int, scope: TenantScope
+) -> LessonPlan:
+    """Load a lesson plan within the caller's tenant scope."""
+    lesson_plan = (await session.exec(scope.apply(
+        select(LessonPlan).where(LessonPlan.id == lesson_plan_id),
+        LessonPlan.organization_id,
+    ))).first()
+    if not lesson_plan:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Lesson plan not found"
+        )
+    return lesson_plan
+
+
 @router.get("/", response_model=List[LessonPlanRead])
 async def list_lesson_plans(
     *,
-    session: Session = Depends(get_session),
+    response: Response,
+    session: AsyncSession = Depends(get_session),
     current_user: dict = Depends(get_current_user),
+    scope: TenantScope = Depends(get_tenant_scope),
     student_id: Optional[UUID] = Query(None, description="Filter by student ID"),
     subject: Optional[str] = Query(None, description="Filter by subject"),
     status: Optional[str] = Query(None, description="Filter by status"),
@@ -25,9 +50,12 @@ async def list_lesson_plans(
     to_date: Optional[date] = Query(None, description="Filter to this date"),
     limit: int = Query(default=50, le=100),
     offset: int = Query(default=0, ge=0),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from a previous page's X-Next-Cursor header"
+    ),
 ):
     """Retrieve lesson plans with filtering options."""
-    query = select(LessonPlan)
+    query = scope.apply(select(LessonPlan), LessonPlan.organization_id)
     
     # Apply filters
     if student_id:
@@ -36,112 +64,119 @@ async def list_lesson_plans(
         query = query.where(LessonPlan.subject == subject)
     if status:
         query = query.where(LessonPlan.status == status)
-    if from_date:
-        query = query.where(col(LessonPlan.date).cast(date) >= from_date)
-    if to_date:
-        query = query.where(col(LessonPlan.date).cast(date) <= to_date)
-    
-    # Add pagination and ordering
-    query = query.order_by(LessonPlan.date.desc()).offset(offset).limit(limit)
+    if from_date or to_date:
+        query = query.where(*date_range(LessonPlan.date, from_date, to_date))
     
-    lesson_plans = session.exec(query).all()
+    # Newest first, paginated on (date, id)
+    lesson_plans, next_cursor = await paginate(
+        session, query, LessonPlan.date, LessonPlan.id,
+        limit=limit, cursor=cursor, offset=offset,
+    )
+    set_next_cursor(response, next_cursor)
     return lesson_plans
 
 @router.post("/", response_model=LessonPlanRead)
 async def create_lesson_plan(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: dict = Depends(get_current_user),
+    scope: TenantScope = Depends(get_tenant_scope),
     lesson_plan: LessonPlanCreate,
 ):
     """Create a new lesson plan."""
     # Verify student exists if student_id is provided
     if lesson_plan.student_id:
-        student = session.get(Student, lesson_plan.student_id)
+        student = (await session.exec(scope.apply(
+            select(Student).where(Student.id == lesson_plan.student_id),
+            Student.organization_id,
+        ))).first()
         if not student:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Student not found"
             )
     
-    db_lesson_plan = LessonPlan.model_validate(lesson_plan)
+    db_lesson_plan = LessonPlan.model_validate(
+        lesson_plan,
+        update={
+            "created_by_id": current_user.id,
+            "organization_id": current_user.organization_id,
+        },
+    )
     session.add(db_lesson_plan)
-    session.commit()
-    session.refresh(db_lesson_plan)
+    await session.commit()
+    await session.refresh(db_lesson_plan)
+    await invalidate_dashboard(db_lesson_plan.organization_id)
     return db_lesson_plan
 
 @router.get("/templates", response_model=List[LessonPlanRead])
 async def list_lesson_plan_templates(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: dict = Depends(get_current_user),
+    scope: TenantScope = Depends(get_tenant_scope),
     subject: Optional[str] = Query(None, description="Filter by subject"),
 ):
     """Retrieve lesson plan templates (those not assigned to specific students)."""
-    query = select(LessonPlan).where(LessonPlan.student_id.is_(None))
+    query = scope.apply(
+        select(LessonPlan).where(LessonPlan.student_id.is_(None)),
+        LessonPlan.organization_id,
+    )
     
     if subject:
         query = query.where(LessonPlan.subject == subject)
     
-    templates = session.exec(query).all()
+    templates = (await session.exec(query)).all()
     return templates
 
 @router.get("/{lesson_plan_id}", response_model=LessonPlanRead)
 async def get_lesson_plan(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: dict = Depends(get_current_user),
-    lesson_plan_id: UUID,
+    scope: TenantScope = Depends(get_tenant_scope),
+    lesson_plan_id: int,
 ):
     """Get a specific lesson plan by ID."""
-    lesson_plan = session.get(LessonPlan, lesson_plan_id)
-    if not lesson_plan:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Lesson plan not found"
-        )
+    lesson_plan = await _get_scoped_lesson_plan(session, lesson_plan_id, scope)
     return lesson_plan
 
 @router.patch("/{lesson_plan_id}", response_model=LessonPlanRead)
 async def update_lesson_plan(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: dict = Depends(get_current_user),
-    lesson_plan_id: UUID,
+    scope: TenantScope = Depends(get_tenant_scope),
+    lesson_plan_id: int,
     lesson_plan_update: LessonPlanUpdate,
 ):
     """Update a lesson plan."""
-    lesson_plan = session.get(LessonPlan, lesson_plan_id)
-    if not lesson_plan:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Lesson plan not found"
-        )
+    lesson_plan = await _get_scoped_lesson_plan(session, lesson_plan_id, scope)
     
     lesson_plan_data = lesson_plan_update.model_dump(exclude_unset=True)
     for field, value in lesson_plan_data.items():
         setattr(lesson_plan, field, value)
     
     session.add(lesson_plan)
-    session.commit()
-    session.refresh(lesson_plan)
+    await session.commit()
+    await session.refresh(lesson_plan)
+    await invalidate_dashboard(lesson_plan.organization_id)
     return lesson_plan
 
 @router.delete("/{lesson_plan_id}")
 async def delete_lesson_plan(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: dict = Depends(get_current_user),
-    lesson_plan_id: UUID,
+    scope: TenantScope = Depends(get_tenant_scope),
+    lesson_plan_id: int,
 ):
     """Delete a lesson plan."""
-    lesson_plan = session.get(LessonPlan, lesson_plan_id)
-    if not lesson_plan:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Lesson plan not found"
-        )
+    lesson_plan = await _get_scoped_lesson_plan(session, lesson_plan_id, scope)
     
-    session.delete(lesson_plan)
-    session.commit()
+    organization_id = lesson_plan.organization_id
+    record_deletion(session, "lesson_plans", lesson_plan.id, organization_id)
+    await session.delete(lesson_plan)
+    await session.commit()
+    await invalidate_dashboard(organization_id)
     return {"message": "Lesson plan deleted successfully"}
@@ -1,111 +1,366 @@
 """Reports router for generating student progress and analytics reports."""
+import os
 from datetime import datetime, date, timedelta
-from typing import List, Optional, Dict, Any
-from uuid import UUID
+from typing import Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlmodel import Session, select, func, and_, text
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from fastapi.encoders import jsonable_encoder
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ..models.student import Student
 from ..models.iep import IEP, IEPGoal
-from ..models.behavior_event import BehaviorEvent
-from ..models.lesson_plan import LessonPlan
+from ..models.report_batch import ReportBatch, ReportBatchRead
+from ..models.user import UserRole
 from ..core.auth import get_current_user
+from ..core.etags import conditional_get, strong_etag, version_etag
+from ..core.jobs import SUCCEEDED, job_queue
+from ..core.metrics import record_cache_lookup
+from ..core.principals import Principal
+from ..core.tenancy import TenantScope, get_tenant_scope
+from ..core.storage import blob_response, blob_store
+from ..services.behavior_patterns import compute_weekly_trends
+from ..services.report_batches import create_report_batch, enqueue_report_batch
+from ..services.progress_reports import (
+    REPORT_SECTIONS, compute_progress_report, report_fingerprint, report_period
+)
+from ..services.report_rendering import (
+    MEDIA_TYPES, RENDER_TASK, ReportFormat, progress_report_key
+)
 from ..database import get_session
 
 router = APIRouter(prefix="/reports", tags=["reports"])
 
+async def _get_accessible_student(
+    session: AsyncSession, student_id: int, scope: TenantScope
+) -> Student:
+    """Load a student the current user may report on."""
+    student = (await session.exec(scope.apply(
+        select(Student).where(Student.id == student_id), Student.organization_id
+    ))).first()
+    if not student:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Student not found"
+        )
+    return student
+
+
+def _render_id(
+    student_id: int,
+    from_date: date,
+    to_date: date,
+    fingerprint: str,
+    report_format: ReportFormat,
+) -> str:
+    return (
+        f"{student_id}.{from_date:%Y%m%d}.{to_date:%Y%m%d}"
+        f".{fingerprint}.{report_format.value}"
+    )
+
+
+def _parse_render_id(job_id: str) -> Tuple[int, date, date, str, ReportFormat]:
+    try:
+        student_id, from_date, to_date, fingerprint, report_format = job_id.split(".")
+        return (
+            int(student_id),
+            datetime.strptime(from_date, "%Y%m%d").date(),
+            datetime.strptime(to_date, "%Y%m%d").date(),
+            fingerprint,
+            ReportFormat(report_format),
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Render job not found"
+        )
+
+
 @router.get("/student/{student_id}/progress")
 async def get_student_progress_report(
     *,
-    session: Session = Depends(get_session),
-    current_user: dict = Depends(get_current_user),
-    student_id: UUID,
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_session),
+    current_user: Principal = Depends(get_current_user),
+    scope: TenantScope = Depends(get_tenant_scope),
+    student_id: int,
     from_date: Optional[date] = Query(None, description="Start date for report"),
     to_date: Optional[date] = Query(None, description="End date for report"),
+    include: Optional[str] = Query(
+        None,
+        description="Comma-separated detail lists to include: goals, behavior_events",
+    ),
 ):
-    """Generate a comprehensive progress report for a student."""
-    # Verify student exists
-    student = session.get(Student, student_id)
-    if not student:
+    """Generate a comprehensive progress report for a student.
+
+    Returns the summary only; pass ``include`` for the raw goal and behavior
+    event lists. Supports If-None-Match.
+    """
+    sections = (
+        {section.strip() for section in include.split(",") if section.strip()}
+        if include
+        else set()
+    )
+    unknown = sections.difference(REPORT_SECTIONS)
+    if unknown:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Student not found"
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown include: {', '.join(sorted(unknown))}"
         )
     
-    # Set default date range if not provided
-    if not to_date:
-        to_date = date.today()
-    if not from_date:
-        from_date = to_date - timedelta(days=30)
-    
-    # Get IEP goals progress
-    goals_query = select(IEPGoal).join(IEP).where(IEP.student_id == student_id)
-    goals = session.exec(goals_query).all()
-    
-    # Get behavior events
-    behavior_query = select(BehaviorEvent).where(
-        and_(
-            BehaviorEvent.student_id == student_id,
-            func.date(BehaviorEvent.date) >= from_date,
-            func.date(BehaviorEvent.date) <= to_date
+    student = await _get_accessible_student(session, student_id, scope)
+    from_date, to_date = report_period(from_date, to_date)
+    
+    # The fingerprint probe is enough to answer a matching If-None-Match
+    fingerprint = await report_fingerprint(session, student, from_date, to_date)
+    unchanged = conditional_get(
+        request, response, version_etag(fingerprint, *sorted(sections))
+    )
+    if unchanged:
+        return unchanged
+    return await compute_progress_report(
+        session, student, from_date, to_date, include=sections
+    )
+
+
+@router.post(
+    "/student/{student_id}/progress/render", status_code=status.HTTP_202_ACCEPTED
+)
+async def render_student_progress_report(
+    *,
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    current_user: Principal = Depends(get_current_user),
+    scope: TenantScope = Depends(get_tenant_scope),
+    student_id: int,
+    format: ReportFormat = Query(ReportFormat.PDF, description="Output format"),
+    from_date: Optional[date] = Query(None, description="Start date for report"),
+    to_date: Optional[date] = Query(None, description="End date for report"),
+):
+    """Render a student progress report to PDF or DOCX in the background.
+
+    Returns a job id to poll at ``/reports/renders/{job_id}``. Renders are
+    cached until the report's data changes, so repeat requests for an
+    unchanged report complete immediately.
+    """
+    student = await _get_accessible_student(session, student_id, scope)
+    from_date, to_date = report_period(from_date, to_date)
+    fingerprint = await report_fingerprint(session, student, from_date, to_date)
+    job_id = _render_id(student.id, from_date, to_date, fingerprint, format)
+    key = progress_report_key(student.id, from_date, to_date, fingerprint, format)
+    
+    rendered = await blob_store.exists(key)
+    record_cache_lookup("report_render", rendered)
+    if not rendered:
+        context = jsonable_encoder(
+            await compute_progress_report(
+                session, student, from_date, to_date, include=("goals",)
+            )
+        )
+        await job_queue.enqueue(
+            RENDER_TASK,
+            {
+                "key": key,
+                "report": "progress_report",
+                "format": format.value,
+                "context": context,
+            },
+            job_id=job_id,
         )
+    return await get_report_render(
+        request=request,
+        session=session,
+        current_user=current_user,
+        scope=scope,
+        job_id=job_id,
+    )
+
+@router.get("/renders/{job_id}")
+async def get_report_render(
+    *,
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    current_user: Principal = Depends(get_current_user),
+    scope: TenantScope = Depends(get_tenant_scope),
+    job_id: str,
+):
+    """Status of a report render job."""
+    student_id, from_date, to_date, fingerprint, report_format = _parse_render_id(
+        job_id
     )
-    behavior_events = session.exec(behavior_query).all()
-    
-    # Get lesson plans
-    lesson_query = select(LessonPlan).where(
-        and_(
-            LessonPlan.student_id == student_id,
-            func.date(LessonPlan.date) >= from_date,
-            func.date(LessonPlan.date) <= to_date
+    await _get_accessible_student(session, student_id, scope)
+    
+    key = progress_report_key(
+        student_id, from_date, to_date, fingerprint, report_format
+    )
+    if await blob_store.exists(key):
+        return {
+            "job_id": job_id,
+            "status": SUCCEEDED,
+            "download_url": str(
+                request.url_for("download_report_render", job_id=job_id)
+            ),
+        }
+    
+    job = await job_queue.get(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Render job not found"
         )
+    return {"job_id": job_id, "status": job.state, "error": job.error}
+
+@router.get("/renders/{job_id}/download")
+async def download_report_render(
+    *,
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    current_user: Principal = Depends(get_current_user),
+    scope: TenantScope = Depends(get_tenant_scope),
+    job_id: str,
+):
+    """Download a finished report render."""
+    student_id, from_date, to_date, fingerprint, report_format = _parse_render_id(
+        job_id
+    )
+    student = await _get_accessible_student(session, student_id, scope)
+    key = progress_report_key(
+        student_id, from_date, to_date, fingerprint, report_format
     )
-    lesson_plans = session.exec(lesson_query).all()
+    if not await blob_store.exists(key):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report has not been rendered yet"
+        )
     
-    # Calculate behavior trends
-    behavior_by_type = {}
-    for event in behavior_events:
-        if event.incident_type not in behavior_by_type:
-            behavior_by_type[event.incident_type] = 0
-        behavior_by_type[event.incident_type] += 1
+    filename = (
+        f"progress-report-{student.last_name}-{student.first_name}"
+        f"-{from_date}-{to_date}.{report_format.value}"
+    )
+    return await blob_response(
+        request,
+        key,
+        strong_etag(f"{fingerprint}-{report_format.value}"),
+        MEDIA_TYPES[report_format],
+        filename,
+        disposition="attachment",
+    )
+
+async def _get_accessible_batch(
+    session: AsyncSession, batch_id: int, scope: TenantScope
+) -> ReportBatch:
+    """Load a report batch the current user may see."""
+    batch = (await session.exec(scope.apply(
+        select(ReportBatch).where(ReportBatch.id == batch_id),
+        ReportBatch.organization_id,
+    ))).first()
+    if not batch:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report batch not found"
+        )
+    return batch
+
+
+def _batch_read(request: Request, batch: ReportBatch) -> ReportBatchRead:
+    read = ReportBatchRead.model_validate(batch)
+    if batch.archive_key:
+        read.download_url = str(
+            request.url_for("download_report_batch", batch_id=batch.id)
+        )
+    return read
+
+
+@router.post(
+    "/organization/progress/batches",
+    response_model=ReportBatchRead,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def create_progress_report_batch(
+    *,
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    current_user: Principal = Depends(get_current_user),
+    scope: TenantScope = Depends(get_tenant_scope),
+    organization_id: Optional[int] = Query(
+        None, description="Organization (defaults to your own)"
+    ),
+    format: ReportFormat = Query(ReportFormat.PDF, description="Output format"),
+    from_date: Optional[date] = Query(None, description="Start date for reports"),
+    to_date: Optional[date] = Query(None, description="End date for reports"),
+):
+    """Render progress reports for every student in an organization.
+
+    Runs as a background job; poll ``/reports/batches/{batch_id}`` for
+    progress and download the ZIP archive once it has succeeded.
+    """
+    if current_user.role == UserRole.PARENT:
+        raise HTTPException(status_code=403, detail="Access denied")
+    organization_id = organization_id or current_user.organization_id
+    if organization_id is None:
+        raise HTTPException(status_code=400, detail="organization_id is required")
+    if not scope.allows(organization_id):
+        raise HTTPException(status_code=403, detail="Access denied")
     
-    # Calculate goal progress summary
-    goal_progress = {
-        "total_goals": len(goals),
-        "goals_met": len([g for g in goals if g.progress >= 100]),
-        "goals_in_progress": len([g for g in goals if 0 < g.progress < 100]),
-        "goals_not_started": len([g for g in goals if g.progress == 0]),
-        "average_progress": sum(g.progress for g in goals) / len(goals) if goals else 0
-    }
+    from_date, to_date = report_period(from_date, to_date)
+    batch = await create_report_batch(
+        session,
+        organization_id,
+        from_date,
+        to_date,
+        format,
+        requested_by_id=current_user.id,
+    )
+    await enqueue_report_batch(batch)
+    return _batch_read(request, batch)
+
+
+@router.get("/batches/{batch_id}", response_model=ReportBatchRead)
+async def get_report_batch(
+    *,
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    current_user: Principal = Depends(get_current_user),
+    scope: TenantScope = Depends(get_tenant_scope),
+    batch_id: int,
+):
+    """Progress of a report batch."""
+    return _batch_read(request, await _get_accessible_batch(session, batch_id, scope))
+
+@router.get("/batches/{batch_id}/download")
+async def download_report_batch(
+    *,
+    request: Request,
+    session: AsyncSession = Depends(get_session),
+    current_user: Principal = Depends(get_current_user),
+    scope: TenantScope = Depends(get_tenant_scope),
+    batch_id: int,
+):
+    """Download the ZIP archive of a finished report batch."""
+    batch = await _get_accessible_batch(session, batch_id, scope)
+    if not batch.archive_key:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Report batch has not finished yet"
+        )
     
-    return {
-        "student": student,
-        "report_period": {
-            "from_date": from_date,
-            "to_date": to_date
-        },
-        "goal_progress": goal_progress,
-        "goals": goals,
-        "behavior_summary": {
-            "total_incidents": len(behavior_events),
-            "incidents_by_type": behavior_by_type
-        },
-        "behavior_events": behavior_events,
-        "lesson_plans": {
-            "total": len(lesson_plans),
-            "completed": len([lp for lp in lesson_plans if lp.status == "completed"]),
-            "in_progress": len([lp for lp in lesson_plans if lp.status == "in_progress"]),
-            "planned": len([lp for lp in lesson_plans if lp.status == "planned"])
-        }
-    }
+    return await blob_response(
+        request,
+        batch.archive_key,
+        strong_etag(batch.archive_key),
+        "application/zip",
+        os.path.basename(batch.archive_key),
+        disposition="attachment",
+    )
 
 @router.get("/behavior/trends")
 async def get_behavior_trends(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: dict = Depends(get_current_user),
-    student_id: Optional[UUID] = Query(None, description="Filter by student"),
+    scope: TenantScope = Depends(get_tenant_scope),
+    student_id: Optional[int] = Query(None, description="Filter by student"),
     from_date: Optional[date] = Query(None, description="Start date"),
     to_date: Optional[date] = Query(None, description="End date"),
 ):
@@ -116,64 +371,34 @@ async def get_behavior_trends(
     if not from_date:
         from_date = to_date - timedelta(days=90)
     
-    query = select(BehaviorEvent).where(
-        and_(
-            func.date(BehaviorEvent.date) >= from_date,
-            func.date(BehaviorEvent.date) <= to_date
-        )
+    result = await compute_weekly_trends(
+        session, from_date, to_date, student_id, organization_id=scope.organization_id
     )
     
-    if student_id:
-        query = query.where(BehaviorEvent.student_id == student_id)
-    
-    behavior_events = session.exec(query).all()
-    
-    # Analyze trends
-    trends_by_week = {}
-    for event in behavior_events:
-        # Group by week
-        week_start = event.date.date() - timedelta(days=event.date.weekday())
-        week_key = week_start.isoformat()
-        
-        if week_key not in trends_by_week:
-            trends_by_week[week_key] = {
-                "total": 0,
-                "by_type": {},
-                "by_severity": {}
-            }
-        
-        trends_by_week[week_key]["total"] += 1
-        
-        # By type
-        if event.incident_type not in trends_by_week[week_key]["by_type"]:
-            trends_by_week[week_key]["by_type"][event.incident_type] = 0
-        trends_by_week[week_key]["by_type"][event.incident_type] += 1
-        
-        # By severity
-        if event.severity not in trends_by_week[week_key]["by_severity"]:
-            trends_by_week[week_key]["by_severity"][event.severity] = 0
-        trends_by_week[week_key]["by_severity"][event.severity] += 1
-    
     return {
         "period": {"from_date": from_date, "to_date": to_date},
-        "total_incidents": len(behavior_events),
-        "weekly_trends": trends_by_week
+        "total_incidents": result["total_incidents"],
+        "weekly_trends": result["weekly_trends"]
     }
 
 @router.get("/goals/summary")
 async def get_goals_summary(
     *,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
     current_user: dict = Depends(get_current_user),
-    student_id: Optional[UUID] = Query(None, description="Filter by student"),
+    scope: TenantScope = Depends(get_tenant_scope),
+    student_id: Optional[int] = Query(None, description="Filter by student"),
 ):
     """Get IEP goals summary and progress statistics."""
-    query = select(IEPGoal).join(IEP)
+    query = scope.apply(
+        select(IEPGoal).join(IEP).join(Student, Student.id == IEP.student_id),
+        Student.organization_id,
+    )
     
     if student_id:
         query = query.where(IEP.student_id == student_id)
     
-    goals = session.exec(query).all()
+    goals = (await session.exec(query)).all()
     
     # Calculate statistics
     if not goals:
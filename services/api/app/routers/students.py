@@ -1,24 +1,54 @@
 """Students router with CRUD operations."""
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from app.core.etags import conditional_get, version_etag
+from app.core.pagination import paginate, set_next_cursor
+from app.core.serialization import json_response, parse_fields, project
+from app.core.tenancy import TenantScope, get_tenant_scope
 from app.database import get_session
 from app.models.student import Student, StudentCreate, StudentUpdate, StudentRead
 from app.models.user import User
+from app.services.dashboard import invalidate_dashboard
+from app.services.sync import record_deletion
 
 router = APIRouter()
 
 
+async def _get_scoped_student(
+    session: AsyncSession, student_id: int, scope: TenantScope
+) -> Student:
+    """Load a student within the caller's tenant scope."""
+    student = (await session.exec(scope.apply(
+        select(Student).where(Student.id == student_id), Student.organization_id
+    ))).first()
+    if not student:
+        raise HTTPException(status_code=404, detail="Student not found")
+    return student
+
+
 @router.get("/", response_model=List[StudentRead])
 async def list_students(
-    session: Session = Depends(get_session),
+    response: Response,
+    session: AsyncSession = Depends(get_session),
+    scope: TenantScope = Depends(get_tenant_scope),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of records to return"),
     organization_id: Optional[int] = Query(None, description="Filter by organization"),
-    active_only: bool = Query(True, description="Only return active students")
+    active_only: bool = Query(True, description="Only return active students"),
+    cursor: Optional[str] = Query(
+        None, description="Cursor from a previous page's X-Next-Cursor header"
+    ),
+    fields: Optional[str] = Query(
+        None, description="Comma-separated fields to return (default: all)"
+    ),
 ):
     """List all students with optional filtering."""
-    query = select(Student)
+    field_names = parse_fields(fields, Student, StudentRead)
+    query = scope.apply(
+        project(Student, field_names, Student.created_at), Student.organization_id
+    )
     
     if organization_id:
         query = query.where(Student.organization_id == organization_id)
@@ -26,33 +56,49 @@ async def list_students(
     if active_only:
         query = query.where(Student.is_active == True)
     
-    query = query.offset(skip).limit(limit)
-    students = session.exec(query).all()
-    return students
+    # Oldest first, paginated on (created_at, id)
+    students, next_cursor = await paginate(
+        session, query, Student.created_at, Student.id,
+        limit=limit, cursor=cursor, offset=skip, descending=False,
+    )
+    set_next_cursor(response, next_cursor)
+    return json_response(students, field_names, response)
 
 
 @router.get("/{student_id}", response_model=StudentRead)
 async def get_student(
     student_id: int,
-    session: Session = Depends(get_session)
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_session),
+    scope: TenantScope = Depends(get_tenant_scope)
 ):
-    """Get a specific student by ID."""
-    student = session.get(Student, student_id)
-    if not student:
-        raise HTTPException(status_code=404, detail="Student not found")
+    """Get a specific student by ID (supports If-None-Match)."""
+    student = await _get_scoped_student(session, student_id, scope)
+    
+    unchanged = conditional_get(
+        request, response, version_etag("student", student.id, student.updated_at)
+    )
+    if unchanged:
+        return unchanged
     return student
 
 
 @router.post("/", response_model=StudentRead)
 async def create_student(
     student: StudentCreate,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session),
+    scope: TenantScope = Depends(get_tenant_scope)
 ):
     """Create a new student."""
+    if not scope.allows(student.organization_id):
+        raise HTTPException(status_code=403, detail="Access denied")
+    
     db_student = Student.model_validate(student)
     session.add(db_student)
-    session.commit()
-    session.refresh(db_student)
+    await session.commit()
+    await session.refresh(db_student)
+    await invalidate_dashboard(db_student.organization_id)
     return db_student
 
 
@@ -60,81 +106,91 @@ async def create_student(
 async def update_student(
     student_id: int,
     student_update: StudentUpdate,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session),
+    scope: TenantScope = Depends(get_tenant_scope)
 ):
     """Update an existing student."""
-    db_student = session.get(Student, student_id)
-    if not db_student:
-        raise HTTPException(status_code=404, detail="Student not found")
+    db_student = await _get_scoped_student(session, student_id, scope)
     
     student_data = student_update.model_dump(exclude_unset=True)
     for key, value in student_data.items():
         setattr(db_student, key, value)
     
     session.add(db_student)
-    session.commit()
-    session.refresh(db_student)
+    await session.commit()
+    await session.refresh(db_student)
+    await invalidate_dashboard(db_student.organization_id)
     return db_student
 
 
 @router.delete("/{student_id}")
 async def delete_student(
     student_id: int,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_session),
+    scope: TenantScope = Depends(get_tenant_scope)
 ):
     """Delete a student (soft delete by setting is_active=False)."""
-    db_student = session.get(Student, student_id)
-    if not db_student:
-        raise HTTPException(status_code=404, detail="Student not found")
+    db_student = await _get_scoped_student(session, student_id, scope)
     
     db_student.is_active = False
     session.add(db_student)
-    session.commit()
+    # Deactivated students leave the caseload on synced devices
+    record_deletion(session, "students", db_student.id, db_student.organization_id)
+    await session.commit()
+    await invalidate_dashboard(db_student.organization_id)
     return {"message": "Student deactivated successfully"}
 
 
 @router.get("/{student_id}/iep")
 async def get_student_iep(
     student_id: int,
-    session: Session = Depends(get_session)
+    request: Request,
+    response: Response,
+    session: AsyncSession = Depends(get_session),
+    scope: TenantScope = Depends(get_tenant_scope)
 ):
-    """Get the current IEP for a student."""
+    """Get the current IEP for a student (supports If-None-Match)."""
     # Import here to avoid circular imports
     from app.models.iep import IEP
     
-    student = session.get(Student, student_id)
-    if not student:
-        raise HTTPException(status_code=404, detail="Student not found")
-    
-    # Get the most recent active IEP
-    query = select(IEP).where(
-        IEP.student_id == student_id,
-        IEP.status == "active"
-    ).order_by(IEP.created_at.desc())
+    # Most recent active IEP; the probe alone answers a matching If-None-Match
+    current = scope.apply(
+        select(IEP.id, IEP.updated_at)
+        .join(Student, Student.id == IEP.student_id)
+        .where(IEP.student_id == student_id, IEP.is_active.is_(True)),
+        Student.organization_id,
+    ).order_by(IEP.created_at.desc(), IEP.id.desc()).limit(1)
     
-    iep = session.exec(query).first()
-    if not iep:
+    version = (await session.exec(current)).first()
+    if not version:
+        await _get_scoped_student(session, student_id, scope)
         raise HTTPException(status_code=404, detail="No active IEP found for student")
     
-    return iep
+    iep_id, updated_at = version
+    unchanged = conditional_get(
+        request, response, version_etag("iep", iep_id, updated_at)
+    )
+    if unchanged:
+        return unchanged
+    return await session.get(IEP, iep_id)
 
 
 @router.get("/{student_id}/behavior-events")
 async def get_student_behavior_events(
     student_id: int,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_session),
+    scope: TenantScope = Depends(get_tenant_scope),
     limit: int = Query(50, ge=1, le=500)
 ):
     """Get recent behavior events for a student."""
     from app.models.behavior_event import BehaviorEvent
     
-    student = session.get(Student, student_id)
-    if not student:
-        raise HTTPException(status_code=404, detail="Student not found")
+    await _get_scoped_student(session, student_id, scope)
     
-    query = select(BehaviorEvent).where(
-        BehaviorEvent.student_id == student_id
+    query = scope.apply(
+        select(BehaviorEvent).where(BehaviorEvent.student_id == student_id),
+        BehaviorEvent.organization_id,
     ).order_by(BehaviorEvent.created_at.desc()).limit(limit)
     
-    events = session.exec(query).all()
+    events = (await session.exec(query)).all()
     return events
@@ -0,0 +1,30 @@
+"""
+Delta sync router for offline-first clients.
+"""
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.database import get_session
+from app.core.auth import get_current_active_user
+from app.core.principals import Principal
+from app.core.tenancy import TenantScope, get_tenant_scope
+from app.models.sync import SyncResponse
+from app.services.sync import compute_changes
+
+router = APIRouter()
+
+
+@router.get("/", response_model=SyncResponse)
+async def sync(
+    since: Optional[str] = Query(
+        None,
+        description="Watermark returned by the previous sync; omit for a full sync",
+    ),
+    session: AsyncSession = Depends(get_session),
+    current_user: Principal = Depends(get_current_active_user),
+    scope: TenantScope = Depends(get_tenant_scope),
+):
+    """Return students, IEPs, goals, behavior events and lesson plans changed
+    since ``since``, with tombstones for deleted rows and a new watermark."""
+    return await compute_changes(session, scope, since)
@@ -0,0 +1 @@
+"""Domain services shared across routers."""
@@ -0,0 +1,153 @@
+"""Set-based aggregation of behavior event patterns."""
+from datetime import date, timedelta
+from typing import Any, Dict, Optional
+
+from sqlmodel import select, func, and_
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..core.sql import date_range
+from ..models.behavior_rollup import BehaviorDailyRollup
+
+TOP_STUDENTS = 10
+
+
+def time_period(hour: int) -> str:
+    """Map an hour of the day to the dashboard's time-of-day bucket."""
+    if 6 <= hour < 12:
+        return "Morning"
+    if 12 <= hour < 18:
+        return "Afternoon"
+    return "Evening"
+
+
+async def compute_behavior_patterns(
+    session: AsyncSession,
+    from_date: date,
+    to_date: date,
+    student_id: Optional[int] = None,
+    organization_id: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Tally behavior events by day, time, type, intensity and student.
+
+    Reads the pre-aggregated ``behavior_daily_rollup`` table, so the number of
+    rows scanned grows with days in the window rather than with incidents.
+    """
+    window = and_(*date_range(BehaviorDailyRollup.day, from_date, to_date))
+    if student_id is not None:
+        window = and_(window, BehaviorDailyRollup.student_id == student_id)
+    if organization_id is not None:
+        window = and_(window, BehaviorDailyRollup.organization_id == organization_id)
+
+    patterns: Dict[str, Dict[str, int]] = {
+        "by_day_of_week": {},
+        "by_time_of_day": {},
+        "by_type": {},
+        "by_severity": {},
+        "by_student": {},
+    }
+    event_count = func.sum(BehaviorDailyRollup.event_count)
+
+    # Day x hour: at most days * 24 rows
+    calendar_rows = (await session.exec(
+        select(BehaviorDailyRollup.day, BehaviorDailyRollup.hour_bucket, event_count)
+        .where(window)
+        .group_by(BehaviorDailyRollup.day, BehaviorDailyRollup.hour_bucket)
+    )).all()
+
+    total_events = 0
+    for day, hour, count in calendar_rows:
+        total_events += count
+        day_name = day.strftime('%A')
+        patterns["by_day_of_week"][day_name] = (
+            patterns["by_day_of_week"].get(day_name, 0) + count
+        )
+        period = time_period(hour)
+        patterns["by_time_of_day"][period] = (
+            patterns["by_time_of_day"].get(period, 0) + count
+        )
+
+    # Type x intensity: bounded by the two enums
+    classification_rows = (await session.exec(
+        select(
+            BehaviorDailyRollup.behavior_type,
+            BehaviorDailyRollup.intensity,
+            event_count,
+        )
+        .where(window)
+        .group_by(BehaviorDailyRollup.behavior_type, BehaviorDailyRollup.intensity)
+    )).all()
+
+    for behavior_type, intensity, count in classification_rows:
+        type_key = behavior_type.value
+        intensity_key = intensity.value
+        patterns["by_type"][type_key] = patterns["by_type"].get(type_key, 0) + count
+        patterns["by_severity"][intensity_key] = (
+            patterns["by_severity"].get(intensity_key, 0) + count
+        )
+
+    # Top students by incident count
+    student_total = event_count.label("event_count")
+    student_rows = (await session.exec(
+        select(BehaviorDailyRollup.student_id, student_total)
+        .where(window)
+        .group_by(BehaviorDailyRollup.student_id)
+        .order_by(student_total.desc(), BehaviorDailyRollup.student_id)
+        .limit(TOP_STUDENTS)
+    )).all()
+    patterns["by_student"] = {
+        str(row_student_id): count for row_student_id, count in student_rows
+    }
+
+    return {
+        "total_events": total_events,
+        "patterns": patterns,
+    }
+
+
+async def compute_weekly_trends(
+    session: AsyncSession,
+    from_date: date,
+    to_date: date,
+    student_id: Optional[int] = None,
+    organization_id: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Weekly behavior totals broken down by type and intensity."""
+    window = and_(*date_range(BehaviorDailyRollup.day, from_date, to_date))
+    if student_id is not None:
+        window = and_(window, BehaviorDailyRollup.student_id == student_id)
+    if organization_id is not None:
+        window = and_(window, BehaviorDailyRollup.organization_id == organization_id)
+
+    rows = (await session.exec(
+        select(
+            BehaviorDailyRollup.day,
+            BehaviorDailyRollup.behavior_type,
+            BehaviorDailyRollup.intensity,
+            func.sum(BehaviorDailyRollup.event_count),
+        )
+        .where(window)
+        .group_by(
+            BehaviorDailyRollup.day,
+            BehaviorDailyRollup.behavior_type,
+            BehaviorDailyRollup.intensity,
+        )
+        .order_by(BehaviorDailyRollup.day)
+    )).all()
+
+    total_incidents = 0
+    trends_by_week: Dict[str, Dict[str, Any]] = {}
+    for day, behavior_type, intensity, count in rows:
+        total_incidents += count
+        week_key = (day - timedelta(days=day.weekday())).isoformat()
+        week = trends_by_week.setdefault(
+            week_key, {"total": 0, "by_type": {}, "by_severity": {}}
+        )
+        week["total"] += count
+        by_type, by_severity = week["by_type"], week["by_severity"]
+        by_type[behavior_type.value] = by_type.get(behavior_type.value, 0) + count
+        by_severity[intensity.value] = by_severity.get(intensity.value, 0) + count
+
+    return {
+        "total_incidents": total_incidents,
+        "weekly_trends": trends_by_week,
+    }
@@ -0,0 +1,231 @@
+"""Maintenance of the behavior_daily_rollup table.
+
+Writes to ``behavior_events`` call :func:`add_event` (:func:`add_events` for
+batches) and :func:`remove_event` inside the same transaction, so the rollup
+stays consistent with the raw events. :func:`rebuild_rollup` recomputes it
+from scratch for backfills.
+"""
+import argparse
+import asyncio
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import DateTime, delete, insert, literal, update
+from sqlmodel import select, func, and_
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..core.sql import calendar_day, date_range, hour_of_day
+from ..models.behavior_event import BehaviorEvent
+from ..models.behavior_rollup import BehaviorDailyRollup
+from ..models.student import Student
+
+BUCKET_COLUMNS = ("student_id", "day", "behavior_type", "intensity", "hour_bucket")
+
+
+def bucket_for(event: BehaviorEvent, organization_id: int) -> Dict[str, Any]:
+    """Rollup bucket key for a behavior event."""
+    return {
+        "student_id": event.student_id,
+        "organization_id": organization_id,
+        "day": event.date_time.date(),
+        "behavior_type": event.behavior_type,
+        "intensity": event.intensity,
+        "hour_bucket": event.date_time.hour,
+    }
+
+
+def _bucket_filter(bucket: Dict[str, Any]):
+    table = BehaviorDailyRollup.__table__
+    return and_(*(table.c[column] == bucket[column] for column in BUCKET_COLUMNS))
+
+
+def _dialect_insert(session: AsyncSession):
+    """Dialect-specific INSERT supporting ON CONFLICT, if available."""
+    dialect = session.bind.dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        return dialect_insert
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        return dialect_insert
+    return None
+
+
+async def add_event(
+    session: AsyncSession, event: BehaviorEvent, organization_id: int
+) -> None:
+    """Count a behavior event into its rollup bucket."""
+    await add_events(session, [(event, organization_id)])
+
+
+async def add_events(
+    session: AsyncSession, events: Iterable[Tuple[BehaviorEvent, int]]
+) -> None:
+    """Count ``(event, organization_id)`` pairs into their rollup buckets.
+
+    Events sharing a bucket are summed first, so each bucket is written once
+    and the upsert runs as a single executemany.
+    """
+    table = BehaviorDailyRollup.__table__
+    deltas: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+    for event, organization_id in events:
+        bucket = bucket_for(event, organization_id)
+        key = tuple(bucket[column] for column in BUCKET_COLUMNS)
+        delta = deltas.setdefault(
+            key, {**bucket, "event_count": 0, "total_duration_minutes": 0}
+        )
+        delta["event_count"] += 1
+        delta["total_duration_minutes"] += event.duration_minutes or 0
+    if not deltas:
+        return
+
+    now = datetime.utcnow()
+    rows = [
+        {**delta, "created_at": now, "updated_at": now} for delta in deltas.values()
+    ]
+
+    dialect_insert = _dialect_insert(session)
+    if dialect_insert is not None:
+        statement = dialect_insert(table)
+        statement = statement.on_conflict_do_update(
+            index_elements=list(BUCKET_COLUMNS),
+            set_={
+                "event_count": table.c.event_count + statement.excluded.event_count,
+                "total_duration_minutes": (
+                    table.c.total_duration_minutes
+                    + statement.excluded.total_duration_minutes
+                ),
+                "updated_at": statement.excluded.updated_at,
+            },
+        )
+        await session.execute(statement, rows)
+        return
+
+    for row in rows:
+        result = await session.execute(
+            update(table)
+            .where(_bucket_filter(row))
+            .values(
+                event_count=table.c.event_count + row["event_count"],
+                total_duration_minutes=(
+                    table.c.total_duration_minutes + row["total_duration_minutes"]
+                ),
+                updated_at=now,
+            )
+        )
+        if result.rowcount == 0:
+            await session.execute(insert(table).values(**row))
+
+
+async def remove_event(
+    session: AsyncSession, event: BehaviorEvent, organization_id: int
+) -> None:
+    """Subtract a behavior event from its rollup bucket, dropping empty buckets."""
+    table = BehaviorDailyRollup.__table__
+    bucket = bucket_for(event, organization_id)
+    duration = event.duration_minutes or 0
+
+    await session.execute(
+        update(table)
+        .where(_bucket_filter(bucket))
+        .values(
+            event_count=table.c.event_count - 1,
+            total_duration_minutes=table.c.total_duration_minutes - duration,
+            updated_at=datetime.utcnow(),
+        )
+    )
+    await session.execute(
+        delete(table).where(and_(_bucket_filter(bucket), table.c.event_count <= 0))
+    )
+
+
+async def rebuild_rollup(
+    session: AsyncSession,
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+) -> int:
+    """Recompute rollup rows from raw behavior events.
+
+    Only days in ``[from_date, to_date]`` are rebuilt when bounds are given.
+    Returns the number of buckets written. The caller commits.
+    """
+    table = BehaviorDailyRollup.__table__
+    dialect = session.bind.dialect.name
+
+    event_filters = date_range(BehaviorEvent.date_time, from_date, to_date)
+    rollup_filters = date_range(table.c.day, from_date, to_date)
+
+    await session.execute(delete(table).where(*rollup_filters))
+
+    day = calendar_day(BehaviorEvent.date_time)
+    hour = hour_of_day(BehaviorEvent.date_time, dialect)
+    now = literal(datetime.utcnow(), DateTime)
+    grouped = (
+        select(
+            BehaviorEvent.student_id,
+            Student.organization_id,
+            day,
+            BehaviorEvent.behavior_type,
+            BehaviorEvent.intensity,
+            hour,
+            func.count(BehaviorEvent.id),
+            func.coalesce(func.sum(BehaviorEvent.duration_minutes), 0),
+            now,
+            now,
+        )
+        .join(Student, Student.id == BehaviorEvent.student_id)
+        .where(*event_filters)
+        .group_by(
+            BehaviorEvent.student_id,
+            Student.organization_id,
+            day,
+            BehaviorEvent.behavior_type,
+            BehaviorEvent.intensity,
+            hour,
+        )
+    )
+    await session.execute(
+        insert(table).from_select(
+            [
+                "student_id",
+                "organization_id",
+                "day",
+                "behavior_type",
+                "intensity",
+                "hour_bucket",
+                "event_count",
+                "total_duration_minutes",
+                "created_at",
+                "updated_at",
+            ],
+            grouped,
+        )
+    )
+    buckets = select(func.count()).select_from(table).where(*rollup_filters)
+    return await session.scalar(buckets) or 0
+
+
+async def _rebuild(from_date: Optional[date], to_date: Optional[date]) -> int:
+    from ..database import async_session_factory
+
+    async with async_session_factory() as session:
+        buckets = await rebuild_rollup(session, from_date, to_date)
+        await session.commit()
+    return buckets
+
+
+def main():
+    """Rebuild the behavior rollup from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Rebuild the behavior_daily_rollup table."
+    )
+    parser.add_argument("--from-date", type=date.fromisoformat, default=None)
+    parser.add_argument("--to-date", type=date.fromisoformat, default=None)
+    args = parser.parse_args()
+
+    buckets = asyncio.run(_rebuild(args.from_date, args.to_date))
+    print(f"Rebuilt {buckets} behavior rollup buckets")
+
+
+if __name__ == "__main__":
+    main()
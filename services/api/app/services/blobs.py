@@ -0,0 +1,94 @@
+"""Deletion of evidence blobs that nothing references any more.
+
+Blobs are content-addressed, so identical uploads share one. Deleting an
+evidence record therefore never deletes its blob directly. It calls
+:func:`schedule_blob_deletion` in the same transaction instead, and
+:func:`sweep_blobs` later deletes blobs that are still unreferenced once
+``BLOB_DELETION_GRACE_SECONDS`` have passed.
+
+The sweep claims a key by deleting its pending rows, and checks references
+and deletes the blob before committing. An upload that reuses an existing
+blob calls :func:`keep_blob`, which deletes the same rows. The two
+therefore serialize on those rows: an upload that waited for the sweep sees
+that the blob is gone, and the sweep sees the upload's record otherwise.
+"""
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete, or_
+from sqlmodel import func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..core.config import settings
+from ..core.storage import blob_store
+from ..models.evidence import BlobDeletion, Evidence
+
+
+def schedule_blob_deletion(session: AsyncSession, key: str) -> None:
+    """Queue a blob for the sweep. The caller commits."""
+    session.add(BlobDeletion(key=key))
+
+
+async def keep_blob(session: AsyncSession, key: str) -> None:
+    """Cancel pending deletions of a blob a new record is about to reference.
+
+    Raises 409 if the sweep deleted the blob first. The caller commits.
+    """
+    await session.execute(delete(BlobDeletion).where(BlobDeletion.key == key))
+    if not await blob_store.exists(key):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="The stored file was removed while uploading, upload it again"
+        )
+
+
+async def sweep_blobs(session: AsyncSession, before: datetime) -> int:
+    """Delete blobs queued before ``before`` that nothing references.
+
+    Commits once per key, so rows are not held locked for the whole sweep.
+    Returns the number of blobs deleted.
+    """
+    keys = (await session.exec(
+        select(BlobDeletion.key).where(BlobDeletion.created_at < before).distinct()
+    )).all()
+    swept = 0
+    for key in keys:
+        claimed = await session.execute(
+            delete(BlobDeletion).where(
+                BlobDeletion.key == key, BlobDeletion.created_at < before
+            )
+        )
+        if claimed.rowcount:
+            references = await session.scalar(
+                select(func.count(Evidence.id)).where(
+                    or_(Evidence.file_path == key, Evidence.preview_path == key)
+                )
+            )
+            if not references:
+                await blob_store.delete(key)
+                swept += 1
+        await session.commit()
+    return swept
+
+
+async def _sweep() -> int:
+    from ..database import async_session_factory
+
+    before = datetime.utcnow() - timedelta(seconds=settings.BLOB_DELETION_GRACE_SECONDS)
+    async with async_session_factory() as session:
+        return await sweep_blobs(session, before)
+
+
+def main():
+    """Sweep unreferenced evidence blobs from the command line."""
+    argparse.ArgumentParser(
+        description="Delete queued evidence blobs that are still unreferenced."
+    ).parse_args()
+    swept = asyncio.run(_sweep())
+    print(f"Deleted {swept} blobs")
+
+
+if __name__ == "__main__":
+    main()
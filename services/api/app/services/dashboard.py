@@ -0,0 +1,152 @@
+"""Dashboard analytics with a per-organization cache.
+
+The payload is computed with a single statement of scalar subqueries and
+cached per organization. Entries are keyed by a per-organization
+generation counter, like the principal cache: write endpoints for students,
+goals, behavior events and lesson plans call :func:`invalidate_dashboard`,
+which bumps it, so every worker sharing the backend recomputes on its next
+load.
+"""
+from datetime import date, timedelta
+from typing import Any, Dict, Optional
+
+from sqlmodel import select, func, and_
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..core.cache import create_cache_backend
+from ..core.metrics import record_cache_lookup
+from ..core.config import settings
+from ..models.behavior_rollup import BehaviorDailyRollup
+from ..models.iep import IEP, IEPGoal
+from ..models.lesson_plan import LessonPlan
+from ..models.student import Student
+
+dashboard_cache = create_cache_backend(
+    settings.DASHBOARD_CACHE_BACKEND,
+    maxsize=settings.DASHBOARD_CACHE_MAX_ENTRIES,
+    ttl=settings.DASHBOARD_CACHE_TTL_SECONDS,
+)
+
+
+def _generation_key(organization_id: Optional[int]) -> str:
+    # The cross-organization dashboard has its own counter
+    return f"dashboard-gen:{organization_id or 'all'}"
+
+
+async def _generation(organization_id: Optional[int]) -> int:
+    return await dashboard_cache.get(_generation_key(organization_id)) or 0
+
+
+def _entry_key(organization_id: Optional[int], generation: int) -> str:
+    return f"dashboard:{organization_id or 'all'}:{generation}"
+
+
+def _scalar(statement):
+    return statement.scalar_subquery()
+
+
+async def compute_dashboard(
+    session: AsyncSession, organization_id: Optional[int]
+) -> Dict[str, Any]:
+    """Compute dashboard totals for an organization (all organizations if None)."""
+    thirty_days_ago = date.today() - timedelta(days=30)
+
+    student_scope, rollup_scope, lesson_scope = [], [], []
+    if organization_id:
+        student_scope = [Student.organization_id == organization_id]
+        rollup_scope = [BehaviorDailyRollup.organization_id == organization_id]
+        lesson_scope = [LessonPlan.organization_id == organization_id]
+
+    def goals(*columns):
+        statement = select(*columns)
+        if organization_id:
+            statement = (
+                statement.join(IEP, IEP.id == IEPGoal.iep_id)
+                .join(Student, Student.id == IEP.student_id)
+                .where(*student_scope)
+            )
+        return statement
+
+    behavior_events = func.coalesce(func.sum(BehaviorDailyRollup.event_count), 0)
+    row = (await session.exec(
+        select(
+            _scalar(select(func.count(Student.id)).where(*student_scope)),
+            _scalar(goals(func.count(IEPGoal.id))),
+            _scalar(select(behavior_events).where(*rollup_scope)),
+            _scalar(select(func.count(LessonPlan.id)).where(*lesson_scope)),
+            _scalar(
+                select(behavior_events).where(
+                    and_(BehaviorDailyRollup.day >= thirty_days_ago, *rollup_scope)
+                )
+            ),
+            _scalar(
+                select(func.count(LessonPlan.id)).where(
+                    and_(LessonPlan.date >= thirty_days_ago, *lesson_scope)
+                )
+            ),
+            _scalar(
+                goals(func.count(IEPGoal.id)).where(IEPGoal.progress_percentage >= 100)
+            ),
+            _scalar(goals(func.avg(IEPGoal.progress_percentage))),
+        )
+    )).one()
+    (
+        total_students,
+        total_goals,
+        total_behavior_events,
+        total_lesson_plans,
+        recent_behavior_events,
+        recent_lesson_plans,
+        goals_completed,
+        average_goal_progress,
+    ) = row
+
+    return {
+        "totals": {
+            "students": total_students or 0,
+            "goals": total_goals or 0,
+            "behavior_events": total_behavior_events or 0,
+            "lesson_plans": total_lesson_plans or 0
+        },
+        "recent_activity": {
+            "behavior_events_30d": recent_behavior_events or 0,
+            "lesson_plans_30d": recent_lesson_plans or 0
+        },
+        "goal_progress": {
+            "completed_goals": goals_completed or 0,
+            "average_progress": round(float(average_goal_progress or 0), 2)
+        }
+    }
+
+
+async def get_dashboard(
+    session: AsyncSession, organization_id: Optional[int]
+) -> Dict[str, Any]:
+    """Return cached dashboard totals, computing them on a miss.
+
+    Totals are only stored if no write invalidated the dashboard while they
+    were being computed.
+    """
+    generation = await _generation(organization_id)
+    payload = await dashboard_cache.get(_entry_key(organization_id, generation))
+    record_cache_lookup("dashboard", payload is not None)
+    if payload is None:
+        payload = await compute_dashboard(session, organization_id)
+        if await _generation(organization_id) == generation:
+            await dashboard_cache.set(
+                _entry_key(organization_id, generation),
+                payload,
+                settings.DASHBOARD_CACHE_TTL_SECONDS,
+            )
+    return payload
+
+
+async def invalidate_dashboard(organization_id: Optional[int] = None) -> None:
+    """Orphan cached dashboards affected by a write to ``organization_id``.
+
+    The cross-organization entry is always invalidated, since it includes
+    every organization's data.
+    """
+    if organization_id is not None:
+        await dashboard_cache.incr(_generation_key(organization_id))
+    await dashboard_cache.incr(_generation_key(None))
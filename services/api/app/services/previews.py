@@ -0,0 +1,157 @@
+"""Thumbnails and first-page previews for evidence files.
+
+Uploads enqueue :func:`generate_preview` on the background job queue, so
+preview rendering never holds up the upload request. The job writes a JPEG
+whose longest edge is ``PREVIEW_MAX_SIZE``:
+
+- images are scaled down;
+- PDFs render their first page;
+- office documents are converted to PDF with LibreOffice first, when
+  ``soffice`` is installed.
+
+The preview is stored next to the original blob as ``<key>.preview.jpg`` and
+recorded on every evidence row with the same content. Rendering needs the
+``previews`` extra (Pillow and pypdfium2).
+"""
+import os
+import shutil
+import subprocess
+import tempfile
+from typing import Any, Dict, Optional
+
+from sqlalchemy import update
+from sqlmodel import Session
+
+from ..core.config import settings
+from ..core.jobs import job_queue
+from ..core.storage import blob_store
+from ..models.evidence import Evidence
+
+PREVIEW_SUFFIX = ".preview.jpg"
+PREVIEW_TASK = "app.services.previews:generate_preview"
+
+PDF_TYPE = "application/pdf"
+DOCUMENT_TYPES = {
+    "application/msword",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "application/vnd.ms-powerpoint",
+    "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+    "application/vnd.oasis.opendocument.text",
+    "application/vnd.oasis.opendocument.presentation",
+    "application/rtf",
+}
+
+
+def previewable(mime_type: Optional[str]) -> bool:
+    """Whether a preview can be generated for this content type."""
+    if not mime_type:
+        return False
+    return (
+        mime_type.startswith("image/")
+        or mime_type == PDF_TYPE
+        or mime_type in DOCUMENT_TYPES
+    )
+
+
+async def enqueue_preview(evidence: Evidence) -> Optional[str]:
+    """Queue preview generation for a stored evidence file, returning the job id."""
+    if (
+        not evidence.file_path
+        or not evidence.content_sha256
+        or not previewable(evidence.mime_type)
+    ):
+        return None
+    return await job_queue.enqueue(
+        PREVIEW_TASK,
+        {
+            "key": evidence.file_path,
+            "sha256": evidence.content_sha256,
+            "mime_type": evidence.mime_type,
+        },
+    )
+
+
+def _first_pdf_page(path: str):
+    import pypdfium2
+
+    document = pypdfium2.PdfDocument(path)
+    try:
+        page = document[0]
+        # Render near the preview size instead of at full resolution
+        scale = settings.PREVIEW_MAX_SIZE / max(page.get_size())
+        return page.render(scale=max(scale, 0.1)).to_pil()
+    finally:
+        document.close()
+
+
+def _convert_to_pdf(path: str, workdir: str) -> Optional[str]:
+    soffice = shutil.which("soffice") or shutil.which("libreoffice")
+    if soffice is None:
+        return None
+    subprocess.run(
+        [soffice, "--headless", "--convert-to", "pdf", "--outdir", workdir, path],
+        check=True,
+        capture_output=True,
+        timeout=120,
+    )
+    converted = os.path.join(
+        workdir, os.path.splitext(os.path.basename(path))[0] + ".pdf"
+    )
+    return converted if os.path.exists(converted) else None
+
+
+def render_preview(source: str, mime_type: str, output: str, workdir: str) -> bool:
+    """Write a JPEG preview of ``source`` to ``output``.
+
+    Returns False when no preview can be made for the file.
+    """
+    from PIL import Image, ImageOps
+
+    if mime_type.startswith("image/"):
+        with Image.open(source) as original:
+            # Lets the JPEG decoder downscale while decoding
+            original.draft(
+                "RGB", (settings.PREVIEW_MAX_SIZE, settings.PREVIEW_MAX_SIZE)
+            )
+            image = ImageOps.exif_transpose(original)
+    elif mime_type == PDF_TYPE:
+        image = _first_pdf_page(source)
+    elif mime_type in DOCUMENT_TYPES:
+        converted = _convert_to_pdf(source, workdir)
+        if converted is None:
+            return False
+        image = _first_pdf_page(converted)
+    else:
+        return False
+
+    image.thumbnail((settings.PREVIEW_MAX_SIZE, settings.PREVIEW_MAX_SIZE))
+    image.convert("RGB").save(output, "JPEG", quality=80, optimize=True)
+    return True
+
+
+def _record_preview(sha256: str, preview_key: str) -> None:
+    from ..database import engine
+
+    with Session(engine) as session:
+        session.execute(
+            update(Evidence)
+            .where(Evidence.content_sha256 == sha256)
+            .values(preview_path=preview_key)
+        )
+        session.commit()
+
+
+async def generate_preview(payload: Dict[str, Any]) -> Optional[str]:
+    """Job: render and store the preview for a blob, returning its key."""
+    preview_key = payload["key"] + PREVIEW_SUFFIX
+    if not await blob_store.exists(preview_key):
+        with tempfile.TemporaryDirectory() as workdir:
+            output = os.path.join(workdir, "preview.jpg")
+            async with blob_store.fetch(payload["key"]) as source:
+                rendered = render_preview(source, payload["mime_type"], output, workdir)
+            if not rendered:
+                return None
+            await blob_store.put_file(output, preview_key)
+
+    _record_preview(payload["sha256"], preview_key)
+    return preview_key
@@ -0,0 +1,364 @@
+"""Student progress report data.
+
+:func:`compute_progress_report` gathers the data shown by the progress report
+endpoint and its rendered PDF/DOCX documents: a summary from SQL aggregates,
+plus goal and behavior event detail lists on request. :func:`report_fingerprint`
+summarizes everything the report depends on in a single probe query, so
+rendered reports can be cached until the underlying data changes.
+:func:`compute_progress_reports` produces both for a whole organization with
+set-based queries, for batch runs.
+"""
+import hashlib
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import true
+from sqlmodel import select, func
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..core.sql import date_range
+from ..models.behavior_event import BehaviorEvent, BehaviorType
+from ..models.iep import IEP, IEPGoal
+from ..models.lesson_plan import LessonPlan
+from ..models.student import Student
+
+# Bump when the report's content or templates change, to retire cached renders
+REPORT_VERSION = 1
+
+# Detail lists a report can opt into with ``include``
+REPORT_SECTIONS = ("goals", "behavior_events")
+
+GOAL_COLUMNS = (
+    IEPGoal.id,
+    IEPGoal.iep_id,
+    IEPGoal.area,
+    IEPGoal.description,
+    IEPGoal.status,
+    IEPGoal.progress_percentage,
+    IEPGoal.target_date,
+    IEPGoal.mastery_date,
+    IEPGoal.is_priority,
+)
+
+BEHAVIOR_EVENT_COLUMNS = (
+    BehaviorEvent.id,
+    BehaviorEvent.date_time,
+    BehaviorEvent.duration_minutes,
+    BehaviorEvent.behavior_type,
+    BehaviorEvent.intensity,
+    BehaviorEvent.location,
+    BehaviorEvent.activity,
+    BehaviorEvent.intervention_used,
+    BehaviorEvent.intervention_effective,
+)
+
+
+def report_period(
+    from_date: Optional[date], to_date: Optional[date], days: int = 30
+) -> Tuple[date, date]:
+    """Fill in a missing report period, ending today and spanning ``days``."""
+    to_date = to_date or date.today()
+    return from_date or to_date - timedelta(days=days), to_date
+
+
+def _lesson_plan_filters(student: Student, from_date: date, to_date: date):
+    # Lesson plans are not linked to students; report the case manager's
+    return [
+        LessonPlan.created_by_id == student.case_manager_id,
+        *date_range(LessonPlan.date, from_date, to_date),
+    ]
+
+
+def _goal_progress(goals: List[IEPGoal]) -> Dict[str, Any]:
+    progress = [goal.progress_percentage for goal in goals]
+    return {
+        "total_goals": len(goals),
+        "goals_met": len([p for p in progress if p >= 100]),
+        "goals_in_progress": len([p for p in progress if 0 < p < 100]),
+        "goals_not_started": len([p for p in progress if p == 0]),
+        "average_progress": sum(progress) / len(progress) if progress else 0
+    }
+
+
+def _summarize(
+    student: Student,
+    from_date: date,
+    to_date: date,
+    goal_progress: Dict[str, Any],
+    incidents_by_type: Dict[str, int],
+    lesson_plans: Dict[str, int],
+) -> Dict[str, Any]:
+    return {
+        "student": student,
+        "report_period": {
+            "from_date": from_date,
+            "to_date": to_date
+        },
+        "goal_progress": goal_progress,
+        "behavior_summary": {
+            "total_incidents": sum(incidents_by_type.values()),
+            "incidents_by_type": incidents_by_type
+        },
+        "lesson_plans": lesson_plans
+    }
+
+
+def _fingerprint(
+    student_id: int, from_date: date, to_date: date, student_updated_at, *probes
+) -> str:
+    # probes: (count, max(updated_at)) for goals, in-range events and lesson plans
+    values = [value for probe in probes for value in probe]
+    material = "|".join(
+        str(value)
+        for value in (
+            REPORT_VERSION, student_id, from_date, to_date, student_updated_at, *values
+        )
+    )
+    return hashlib.sha256(material.encode()).hexdigest()[:32]
+
+
+async def compute_progress_report(
+    session: AsyncSession,
+    student: Student,
+    from_date: date,
+    to_date: date,
+    include: Iterable[str] = (),
+) -> Dict[str, Any]:
+    """Collect goal progress, behavior and lesson plan data for a student.
+
+    The summary comes from one aggregate query. ``include`` opts into the
+    detail lists (:data:`REPORT_SECTIONS`), each fetched with a
+    column-projected query.
+    """
+    goal_stats = (
+        select(
+            func.count(IEPGoal.id).label("total_goals"),
+            func.count(IEPGoal.id)
+            .filter(IEPGoal.progress_percentage >= 100)
+            .label("goals_met"),
+            func.count(IEPGoal.id)
+            .filter(IEPGoal.progress_percentage > 0, IEPGoal.progress_percentage < 100)
+            .label("goals_in_progress"),
+            func.count(IEPGoal.id)
+            .filter(IEPGoal.progress_percentage == 0)
+            .label("goals_not_started"),
+            func.coalesce(func.avg(IEPGoal.progress_percentage), 0)
+            .label("average_progress"),
+        )
+        .join(IEP, IEP.id == IEPGoal.iep_id)
+        .where(IEP.student_id == student.id)
+        .subquery()
+    )
+    plan_stats = (
+        select(
+            func.count(LessonPlan.id).label("plans_total"),
+            func.count(LessonPlan.id)
+            .filter(LessonPlan.is_published.is_(True))
+            .label("plans_published"),
+        )
+        .where(*_lesson_plan_filters(student, from_date, to_date))
+        .subquery()
+    )
+    incidents = (
+        select(
+            BehaviorEvent.behavior_type, func.count(BehaviorEvent.id).label("incidents")
+        )
+        .where(
+            BehaviorEvent.student_id == student.id,
+            *date_range(BehaviorEvent.date_time, from_date, to_date)
+        )
+        .group_by(BehaviorEvent.behavior_type)
+        .subquery()
+    )
+    # One row per behavior type (or a single row with no incidents), each
+    # carrying the goal and lesson plan aggregates
+    rows = (await session.exec(
+        select(
+            *goal_stats.c, *plan_stats.c,
+            incidents.c.behavior_type, incidents.c.incidents,
+        )
+        .select_from(goal_stats.join(plan_stats, true()).outerjoin(incidents, true()))
+    )).all()
+
+    first = rows[0]._mapping
+    report = _summarize(
+        student,
+        from_date,
+        to_date,
+        {
+            "total_goals": first["total_goals"],
+            "goals_met": first["goals_met"],
+            "goals_in_progress": first["goals_in_progress"],
+            "goals_not_started": first["goals_not_started"],
+            "average_progress": float(first["average_progress"]),
+        },
+        {
+            BehaviorType(row.behavior_type).value: row.incidents
+            for row in rows if row.behavior_type is not None
+        },
+        {"total": first["plans_total"], "published": first["plans_published"]},
+    )
+
+    include = set(include)
+    if "goals" in include:
+        report["goals"] = [dict(row._mapping) for row in (await session.exec(
+            select(*GOAL_COLUMNS)
+            .join(IEP, IEP.id == IEPGoal.iep_id)
+            .where(IEP.student_id == student.id)
+            .order_by(IEPGoal.id)
+        )).all()]
+    if "behavior_events" in include:
+        report["behavior_events"] = [dict(row._mapping) for row in (await session.exec(
+            select(*BEHAVIOR_EVENT_COLUMNS)
+            .where(
+                BehaviorEvent.student_id == student.id,
+                *date_range(BehaviorEvent.date_time, from_date, to_date)
+            )
+            .order_by(BehaviorEvent.date_time)
+        )).all()]
+    return report
+
+
+async def compute_progress_reports(
+    session: AsyncSession, organization_id: int, from_date: date, to_date: date
+) -> List[Tuple[Student, Dict[str, Any], str]]:
+    """Progress reports and fingerprints for every student in an organization.
+
+    The set-based counterpart of :func:`compute_progress_report` and
+    :func:`report_fingerprint` for batch runs: four queries in total,
+    whatever the number of students. Behavior events are aggregated in SQL,
+    so the reports carry the behavior summary but not the raw events.
+    Returns ``(student, report, fingerprint)`` tuples ordered by student name.
+    """
+    students = (await session.exec(
+        select(Student)
+        .where(Student.organization_id == organization_id)
+        .order_by(Student.last_name, Student.first_name, Student.id)
+    )).all()
+    if not students:
+        return []
+
+    in_organization = select(Student.id).where(
+        Student.organization_id == organization_id
+    )
+
+    goals_by_student: Dict[int, List[IEPGoal]] = defaultdict(list)
+    for student_id, goal in (await session.exec(
+        select(IEP.student_id, IEPGoal)
+        .join(IEP, IEP.id == IEPGoal.iep_id)
+        .where(IEP.student_id.in_(in_organization))
+        .order_by(IEPGoal.id)
+    )).all():
+        goals_by_student[student_id].append(goal)
+
+    incidents: Dict[int, Dict[str, int]] = defaultdict(dict)
+    event_probes: Dict[int, Tuple[int, Optional[datetime]]] = {}
+    for student_id, behavior_type, count, updated_at in (await session.exec(
+        select(
+            BehaviorEvent.student_id,
+            BehaviorEvent.behavior_type,
+            func.count(BehaviorEvent.id),
+            func.max(BehaviorEvent.updated_at),
+        )
+        .where(
+            BehaviorEvent.student_id.in_(in_organization),
+            *date_range(BehaviorEvent.date_time, from_date, to_date)
+        )
+        .group_by(BehaviorEvent.student_id, BehaviorEvent.behavior_type)
+    )).all():
+        incidents[student_id][behavior_type.value] = count
+        total, latest = event_probes.get(student_id, (0, None))
+        event_probes[student_id] = (total + count, _latest(latest, updated_at))
+
+    case_manager_ids = {
+        student.case_manager_id for student in students if student.case_manager_id
+    }
+    plans: Dict[int, Tuple[int, int, Optional[datetime]]] = {}
+    if case_manager_ids:
+        for created_by_id, total, published, updated_at in (await session.exec(
+            select(
+                LessonPlan.created_by_id,
+                func.count(LessonPlan.id),
+                func.count(LessonPlan.id).filter(LessonPlan.is_published.is_(True)),
+                func.max(LessonPlan.updated_at),
+            )
+            .where(
+                LessonPlan.created_by_id.in_(case_manager_ids),
+                *date_range(LessonPlan.date, from_date, to_date)
+            )
+            .group_by(LessonPlan.created_by_id)
+        )).all():
+            plans[created_by_id] = (total, published, updated_at)
+
+    reports = []
+    for student in students:
+        goals = goals_by_student.get(student.id, [])
+        total_plans, published_plans, plans_updated_at = plans.get(
+            student.case_manager_id, (0, 0, None)
+        )
+        report = _summarize(
+            student,
+            from_date,
+            to_date,
+            _goal_progress(goals),
+            incidents.get(student.id, {}),
+            {"total": total_plans, "published": published_plans},
+        )
+        report["goals"] = goals
+        fingerprint = _fingerprint(
+            student.id,
+            from_date,
+            to_date,
+            student.updated_at,
+            (len(goals), max((goal.updated_at for goal in goals), default=None)),
+            event_probes.get(student.id, (0, None)),
+            (total_plans, plans_updated_at),
+        )
+        reports.append((student, report, fingerprint))
+    return reports
+
+
+def _latest(a: Optional[datetime], b: Optional[datetime]) -> Optional[datetime]:
+    if a is None or b is None:
+        return a or b
+    return max(a, b)
+
+
+async def report_fingerprint(
+    session: AsyncSession, student: Student, from_date: date, to_date: date
+) -> str:
+    """Digest of the data a student's report for this period depends on.
+
+    Row counts catch deletions; latest ``updated_at`` values catch inserts
+    and edits.
+    """
+    def probe(model, *where, join=None):
+        statement = select(func.count(model.id), func.max(model.updated_at))
+        if join is not None:
+            statement = statement.join(*join)
+        return statement.where(*where).subquery()
+
+    goals = probe(
+        IEPGoal, IEP.student_id == student.id, join=(IEP, IEP.id == IEPGoal.iep_id)
+    )
+    events = probe(
+        BehaviorEvent,
+        BehaviorEvent.student_id == student.id,
+        *date_range(BehaviorEvent.date_time, from_date, to_date),
+    )
+    plans = probe(LessonPlan, *_lesson_plan_filters(student, from_date, to_date))
+    row = (await session.exec(
+        select(
+            select(Student.updated_at)
+            .where(Student.id == student.id)
+            .scalar_subquery(),
+            *goals.c, *events.c, *plans.c,
+        )
+        # One row each; joined explicitly so the FROM clause is not a
+        # cartesian product
+        .select_from(goals.join(events, true()).join(plans, true()))
+    )).one()
+    return _fingerprint(
+        student.id, from_date, to_date, row[0], row[1:3], row[3:5], row[5:7]
+    )
@@ -0,0 +1,299 @@
+"""Organization-wide report batches.
+
+At the end of a grading period every student in an organization needs a
+progress report. A batch does that as one background job (:data:`BATCH_TASK`):
+
+1. report data and fingerprints for the whole organization come from a
+   handful of set-based queries (:func:`compute_progress_reports`);
+2. reports already in the blob store for the same fingerprint are reused,
+   so re-running a batch only renders what changed;
+3. the rest are rendered on a process pool of ``REPORT_BATCH_WORKERS``
+   processes and stored under the same keys as single-student renders;
+4. everything is bundled into a ZIP archive in the blob store.
+
+Progress is written to the ``report_batches`` row as the job runs. Batches
+can also be run from the command line::
+
+    python -m app.services.report_batches --organization-id 1 \\
+        --from 2025-01-06 --to 2025-03-28
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import re
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from typing import List, Optional, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..core.config import settings
+from ..core.jobs import job_queue
+from ..core.storage import blob_store
+from ..models.report_batch import ReportBatch, ReportBatchStatus
+from ..models.student import Student
+from .progress_reports import compute_progress_reports
+from .report_rendering import ReportFormat, progress_report_key, render_to_file
+
+logger = logging.getLogger(__name__)
+
+BATCH_TASK = "app.services.report_batches:run_report_batch"
+PROGRESS_INTERVAL_SECONDS = 2.0
+EXISTS_CONCURRENCY = 32  # blob existence checks in flight (HEAD requests on S3)
+
+
+async def create_report_batch(
+    session: AsyncSession,
+    organization_id: int,
+    from_date: date,
+    to_date: date,
+    report_format: ReportFormat,
+    requested_by_id: Optional[int] = None,
+) -> ReportBatch:
+    """Record a new progress report batch."""
+    batch = ReportBatch(
+        organization_id=organization_id,
+        requested_by_id=requested_by_id,
+        format=ReportFormat(report_format).value,
+        from_date=from_date,
+        to_date=to_date,
+    )
+    session.add(batch)
+    await session.commit()
+    await session.refresh(batch)
+    return batch
+
+
+async def enqueue_report_batch(batch: ReportBatch) -> str:
+    """Queue a batch on the background job queue, returning the job id."""
+    return await job_queue.enqueue(
+        BATCH_TASK, {"batch_id": batch.id}, job_id=f"report-batch-{batch.id}"
+    )
+
+
+def archive_key(batch: ReportBatch) -> str:
+    """Blob store key of a batch's ZIP archive."""
+    period = f"{batch.from_date}_{batch.to_date}"
+    return f"reports/batches/{batch.id}/progress-reports-{period}.zip"
+
+
+def _archive_name(student: Student, report_format: ReportFormat) -> str:
+    name = f"{student.last_name}-{student.first_name}-{student.student_id}"
+    return re.sub(r"[^\w.-]+", "_", name) + f".{report_format.value}"
+
+
+async def _update_batch(batch_id: int, **values) -> None:
+    from ..database import async_session_factory
+
+    async with async_session_factory() as session:
+        await session.execute(
+            update(ReportBatch).where(ReportBatch.id == batch_id).values(**values)
+        )
+        await session.commit()
+
+
+async def _existing(keys: List[str]) -> List[bool]:
+    semaphore = asyncio.Semaphore(EXISTS_CONCURRENCY)
+
+    async def exists(key: str) -> bool:
+        async with semaphore:
+            return await blob_store.exists(key)
+
+    return await asyncio.gather(*(exists(key) for key in keys))
+
+
+async def _write_archive(entries: List[Tuple[str, str]], path: str) -> None:
+    # Rendered PDFs and DOCX files are already compressed; store them as-is
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED) as archive:
+        for name, key in entries:
+            async with blob_store.fetch(key) as source:
+                await asyncio.to_thread(archive.write, source, name)
+
+
+async def _run_batch(batch_id: int) -> ReportBatch:
+    from ..database import async_session_factory
+
+    async with async_session_factory() as session:
+        batch = await session.get(ReportBatch, batch_id)
+        if batch is None:
+            raise ValueError(f"Report batch {batch_id} not found")
+        reports = await compute_progress_reports(
+            session, batch.organization_id, batch.from_date, batch.to_date
+        )
+
+    report_format = ReportFormat(batch.format)
+    items = [
+        (
+            student,
+            report,
+            progress_report_key(
+                student.id, batch.from_date, batch.to_date, fingerprint, report_format
+            ),
+        )
+        for student, report, fingerprint in reports
+    ]
+    existing = await _existing([key for _, _, key in items])
+    stored = {key for (_, _, key), exists in zip(items, existing) if exists}
+    pending = [item for item in items if item[2] not in stored]
+    reused = len(stored)
+
+    counts = {"completed": reused, "failed": 0}
+    errors: List[str] = []
+    await _update_batch(
+        batch_id,
+        status=ReportBatchStatus.RUNNING,
+        started_at=datetime.utcnow(),
+        total=len(items),
+        completed=reused,
+        reused=reused,
+    )
+
+    last_update = time.monotonic()
+    with tempfile.TemporaryDirectory() as workdir:
+        if pending:
+            loop = asyncio.get_running_loop()
+            # "spawn" for the same reason as the job queue's own pool
+            with ProcessPoolExecutor(
+                max_workers=settings.REPORT_BATCH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            ) as pool:
+
+                async def render(
+                    index: int, student: Student, report: dict, key: str
+                ) -> None:
+                    output = os.path.join(workdir, str(index))
+                    try:
+                        await loop.run_in_executor(
+                            pool,
+                            render_to_file,
+                            batch.report,
+                            report_format.value,
+                            jsonable_encoder(report),
+                            output,
+                        )
+                        await blob_store.put_file(output, key)
+                        stored.add(key)
+                        counts["completed"] += 1
+                    except Exception as error:
+                        counts["failed"] += 1
+                        errors.append(f"student {student.id}: {error}")
+                        logger.error(
+                            "Report batch %s: rendering for student %s failed: %s",
+                            batch_id,
+                            student.id,
+                            error,
+                        )
+                    finally:
+                        if os.path.exists(output):
+                            os.remove(output)
+
+                tasks = [
+                    asyncio.ensure_future(render(index, student, report, key))
+                    for index, (student, report, key) in enumerate(pending)
+                ]
+                for finished in asyncio.as_completed(tasks):
+                    await finished
+                    if time.monotonic() - last_update >= PROGRESS_INTERVAL_SECONDS:
+                        last_update = time.monotonic()
+                        await _update_batch(batch_id, **counts)
+
+        archive = os.path.join(workdir, "archive.zip")
+        await _write_archive(
+            [
+                (_archive_name(student, report_format), key)
+                for student, _, key in items
+                if key in stored
+            ],
+            archive,
+        )
+        await blob_store.put_file(archive, archive_key(batch))
+
+    await _update_batch(
+        batch_id,
+        **counts,
+        status=ReportBatchStatus.SUCCEEDED,
+        error=errors[0] if errors else None,
+        archive_key=archive_key(batch),
+        finished_at=datetime.utcnow(),
+    )
+    logger.info(
+        "Report batch %s: %s reports, %s reused, %s failed",
+        batch_id, len(items), reused, counts["failed"],
+    )
+    return batch
+
+
+async def run_report_batch(payload: dict) -> int:
+    """Job: run a progress report batch, returning the batch id.
+
+    Reports that fail to render are counted in ``failed`` and left out of
+    the archive; the batch itself fails only if it cannot run at all.
+    """
+    batch_id = payload["batch_id"]
+    try:
+        await _run_batch(batch_id)
+    except Exception as error:
+        await _update_batch(
+            batch_id,
+            status=ReportBatchStatus.FAILED,
+            error=str(error),
+            finished_at=datetime.utcnow(),
+        )
+        raise
+    return batch_id
+
+
+async def _run_from_command_line(
+    organization_id: int, from_date: date, to_date: date, report_format: ReportFormat
+):
+    from ..database import async_session_factory
+
+    async with async_session_factory() as session:
+        batch = await create_report_batch(
+            session, organization_id, from_date, to_date, report_format
+        )
+    await run_report_batch({"batch_id": batch.id})
+    async with async_session_factory() as session:
+        return await session.get(ReportBatch, batch.id)
+
+
+def main():
+    """Render progress reports for a whole organization from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Render progress reports for every student in an organization."
+    )
+    parser.add_argument("--organization-id", type=int, required=True)
+    parser.add_argument(
+        "--from", dest="from_date", type=date.fromisoformat, required=True
+    )
+    parser.add_argument("--to", dest="to_date", type=date.fromisoformat, required=True)
+    parser.add_argument(
+        "--format",
+        type=ReportFormat,
+        default=ReportFormat.PDF,
+        choices=list(ReportFormat),
+    )
+    args = parser.parse_args()
+
+    started = time.monotonic()
+    batch = asyncio.run(
+        _run_from_command_line(
+            args.organization_id, args.from_date, args.to_date, args.format
+        )
+    )
+    print(
+        f"Batch {batch.id}: {batch.total} reports "
+        f"({batch.reused} reused, {batch.failed} failed) "
+        f"in {time.monotonic() - started:.1f}s -> {batch.archive_key}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Rendering of reports to PDF and DOCX documents.
+
+Rendering runs on the background job queue (:data:`RENDER_TASK`). The API
+process gathers the report data and passes it to the job as a JSON context,
+so render workers never touch the database. PDFs are rendered from the
+report's Jinja HTML template with WeasyPrint. DOCX files are assembled with
+python-docx from the same context.
+
+Output is written to the blob store under a key that includes the report's
+data fingerprint (see
+:func:`app.services.progress_reports.report_fingerprint`). A stored key is
+reused as-is until the data changes.
+"""
+import os
+import tempfile
+from datetime import date
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict
+
+from ..core.storage import blob_store
+
+RENDER_TASK = "app.services.report_rendering:render_report"
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates" / "reports"
+
+
+class ReportFormat(str, Enum):
+    """Rendered report formats."""
+    PDF = "pdf"
+    DOCX = "docx"
+
+
+MEDIA_TYPES = {
+    ReportFormat.PDF: "application/pdf",
+    ReportFormat.DOCX: (
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+    ),
+}
+
+
+def progress_report_key(
+    student_id: int,
+    from_date: date,
+    to_date: date,
+    fingerprint: str,
+    report_format: ReportFormat,
+) -> str:
+    """Blob store key of a rendered progress report."""
+    extension = ReportFormat(report_format).value
+    period = f"{from_date}_{to_date}"
+    return f"reports/progress/{student_id}/{period}/{fingerprint}.{extension}"
+
+
+def _environment():
+    from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+    return Environment(
+        loader=FileSystemLoader(TEMPLATE_DIR), autoescape=select_autoescape()
+    )
+
+
+def render_html(template: str, context: Dict[str, Any]) -> str:
+    """Render a report template to HTML."""
+    return _environment().get_template(template).render(**context)
+
+
+def render_pdf(template: str, context: Dict[str, Any], output: str) -> None:
+    """Render a report template to a PDF file."""
+    from weasyprint import HTML
+
+    HTML(string=render_html(template, context), base_url=str(TEMPLATE_DIR)).write_pdf(
+        output
+    )
+
+
+def render_progress_docx(context: Dict[str, Any], output: str) -> None:
+    """Write a student progress report as a Word document."""
+    from docx import Document
+
+    student = context["student"]
+    period = context["report_period"]
+    goal_progress = context["goal_progress"]
+    behavior = context["behavior_summary"]
+
+    document = Document()
+    document.add_heading(
+        f"Progress Report: {student['first_name']} {student['last_name']}", level=0
+    )
+    document.add_paragraph(
+        f"Grade {student['grade']} · Student ID {student['student_id']} · "
+        f"{period['from_date']} to {period['to_date']}"
+    )
+
+    document.add_heading("IEP Goal Progress", level=1)
+    document.add_paragraph(
+        f"{goal_progress['total_goals']} goals: {goal_progress['goals_met']} met, "
+        f"{goal_progress['goals_in_progress']} in progress, "
+        f"{goal_progress['goals_not_started']} not started. "
+        f"Average progress {goal_progress['average_progress']:.0f}%."
+    )
+    if context["goals"]:
+        table = document.add_table(rows=1, cols=4)
+        table.style = "Light Grid Accent 1"
+        for cell, heading in zip(
+            table.rows[0].cells, ("Area", "Goal", "Status", "Progress")
+        ):
+            cell.text = heading
+        for goal in context["goals"]:
+            cells = table.add_row().cells
+            cells[0].text = str(goal["area"])
+            cells[1].text = goal["description"]
+            cells[2].text = str(goal["status"])
+            cells[3].text = f"{goal['progress_percentage']}%"
+
+    document.add_heading("Behavior Summary", level=1)
+    document.add_paragraph(
+        f"{behavior['total_incidents']} incidents recorded in this period."
+    )
+    for behavior_type, count in sorted(behavior["incidents_by_type"].items()):
+        document.add_paragraph(f"{behavior_type}: {count}", style="List Bullet")
+
+    document.add_heading("Instruction", level=1)
+    lesson_plans = context["lesson_plans"]
+    document.add_paragraph(
+        f"{lesson_plans['total']} lesson plans in this period, "
+        f"{lesson_plans['published']} published."
+    )
+    document.save(output)
+
+
+RENDERERS = {
+    ("progress_report", ReportFormat.PDF): lambda context, output: render_pdf(
+        "progress_report.html", context, output
+    ),
+    ("progress_report", ReportFormat.DOCX): render_progress_docx,
+}
+
+
+def render_to_file(
+    report: str, report_format: ReportFormat, context: Dict[str, Any], output: str
+) -> None:
+    """Render ``report`` in ``report_format`` to ``output``."""
+    RENDERERS[(report, ReportFormat(report_format))](context, output)
+
+
+async def render_report(payload: Dict[str, Any]) -> str:
+    """Job: render a report into the blob store, returning its key."""
+    key = payload["key"]
+    if not await blob_store.exists(key):
+        with tempfile.TemporaryDirectory() as workdir:
+            output = os.path.join(workdir, "report")
+            render_to_file(
+                payload["report"], payload["format"], payload["context"], output
+            )
+            await blob_store.put_file(output, key)
+    return key
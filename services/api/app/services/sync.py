@@ -0,0 +1,171 @@
+"""Delta sync for offline-first clients.
+
+A client passes back the watermark from its previous sync and receives every
+row changed since then, plus tombstones for rows deleted since then. The
+``updated_at`` column is bumped on every UPDATE (see
+:class:`~app.models.base.BaseModel`). Delete endpoints call
+:func:`record_deletion` in the same transaction as the delete.
+
+Timestamps are assigned when a row is flushed, not when it commits. Issued
+watermarks therefore trail the clock by ``SYNC_WATERMARK_OVERLAP_SECONDS``.
+Clients apply changes as upserts keyed on id, so the overlap only costs a
+few repeated rows.
+
+Deactivated students are soft-deleted: they leave ``changes`` and reach
+clients only as tombstones.
+"""
+import argparse
+import asyncio
+import base64
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import delete
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..core.config import settings
+from ..core.tenancy import TenantScope
+from ..models.behavior_event import BehaviorEvent
+from ..models.iep import IEP, IEPGoal
+from ..models.lesson_plan import LessonPlan
+from ..models.student import Student
+from ..models.sync import Tombstone
+
+
+def encode_watermark(moment: datetime) -> str:
+    """Encode a point in time as an opaque URL-safe watermark."""
+    return base64.urlsafe_b64encode(moment.isoformat().encode()).decode().rstrip("=")
+
+
+def decode_watermark(watermark: str) -> datetime:
+    """Decode a watermark issued by :func:`encode_watermark`."""
+    try:
+        padded = watermark + "=" * (-len(watermark) % 4)
+        return datetime.fromisoformat(base64.urlsafe_b64decode(padded).decode())
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid sync watermark"
+        )
+
+
+# Synced models, keyed by their name in SyncChanges and Tombstone.entity_type
+SYNC_ENTITIES = {
+    "students": Student,
+    "ieps": IEP,
+    "goals": IEPGoal,
+    "behavior_events": BehaviorEvent,
+    "lesson_plans": LessonPlan,
+}
+
+
+def _entity_scopes(scope: TenantScope) -> Dict[str, Tuple[Any, List[Any]]]:
+    """Model and organization predicates for each synced entity."""
+    active = Student.is_active.is_(True)
+    if scope.organization_id is None:
+        entities = {name: (model, []) for name, model in SYNC_ENTITIES.items()}
+        entities["students"] = (Student, [active])
+        return entities
+
+    students = scope.apply(select(Student.id), Student.organization_id)
+    ieps = select(IEP.id).where(IEP.student_id.in_(students))
+    return {
+        "students": (Student, [*scope.predicates(Student.organization_id), active]),
+        "ieps": (IEP, [IEP.student_id.in_(students)]),
+        "goals": (IEPGoal, [IEPGoal.iep_id.in_(ieps)]),
+        "behavior_events": (
+            BehaviorEvent,
+            scope.predicates(BehaviorEvent.organization_id),
+        ),
+        "lesson_plans": (LessonPlan, scope.predicates(LessonPlan.organization_id)),
+    }
+
+
+def record_deletion(
+    session: AsyncSession,
+    entity_type: str,
+    entity_id: int,
+    organization_id: Optional[int],
+) -> None:
+    """Leave a tombstone for a deleted row. The caller commits."""
+    tombstone = Tombstone(
+        entity_type=entity_type, entity_id=entity_id, organization_id=organization_id
+    )
+    session.add(tombstone)
+
+
+async def compute_changes(
+    session: AsyncSession, scope: TenantScope, watermark: Optional[str] = None
+) -> Dict[str, Any]:
+    """Collect rows in ``scope`` changed and deleted since ``watermark``.
+
+    Without a watermark every row in scope is returned and no tombstones are
+    needed. Watermarks older than the tombstone retention period are
+    rejected with 410, since deletions from before then may be gone.
+    """
+    issued_at = datetime.utcnow()
+    since = decode_watermark(watermark) if watermark else None
+    oldest = issued_at - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    if since is not None and since < oldest:
+        raise HTTPException(
+            status_code=status.HTTP_410_GONE,
+            detail="Sync watermark expired, perform a full sync"
+        )
+
+    changes: Dict[str, List[Any]] = {}
+    for name, (model, predicates) in _entity_scopes(scope).items():
+        query = select(model).where(*predicates)
+        if since is not None:
+            query = query.where(model.updated_at >= since)
+        query = query.order_by(model.updated_at, model.id)
+        changes[name] = (await session.exec(query)).all()
+
+    deleted: List[Tombstone] = []
+    if since is not None:
+        query = scope.apply(
+            select(Tombstone).where(Tombstone.deleted_at >= since),
+            Tombstone.organization_id,
+        )
+        deleted = (await session.exec(query.order_by(Tombstone.deleted_at))).all()
+
+    return {
+        "watermark": encode_watermark(
+            issued_at - timedelta(seconds=settings.SYNC_WATERMARK_OVERLAP_SECONDS)
+        ),
+        "full": since is None,
+        "changes": changes,
+        "deleted": deleted,
+    }
+
+
+async def prune_tombstones(session: AsyncSession, before: datetime) -> int:
+    """Delete tombstones older than ``before``. The caller commits."""
+    result = await session.execute(
+        delete(Tombstone).where(Tombstone.deleted_at < before)
+    )
+    return result.rowcount
+
+
+async def _prune() -> int:
+    from ..database import async_session_factory
+
+    before = datetime.utcnow() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    async with async_session_factory() as session:
+        pruned = await prune_tombstones(session, before)
+        await session.commit()
+    return pruned
+
+
+def main():
+    """Prune expired sync tombstones from the command line."""
+    argparse.ArgumentParser(
+        description="Delete sync tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS."
+    ).parse_args()
+    pruned = asyncio.run(_prune())
+    print(f"Pruned {pruned} tombstones")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Maintenance of the denormalized ``organization_id`` columns.
+
+Behavior events, lesson plans and evidence carry the organization they
+belong to so tenant-scoped reads can use organization-leading indexes (see
+:mod:`app.core.tenancy`). The write endpoints set it; rows written before
+the column existed are filled in from their student or author.
+
+The columns are nullable so existing databases can migrate in order:
+
+1. ``ALTER TABLE <table> ADD COLUMN organization_id INTEGER REFERENCES
+   organizations (id)`` for ``behavior_events``, ``lesson_plans`` and
+   ``evidence``, and create the
+   ``ix_<table>_organization_id_*`` indexes declared on the models;
+2. ``python -m app.services.tenancy`` to fill them in;
+3. optionally ``ALTER TABLE behavior_events ALTER COLUMN organization_id SET NOT NULL``
+   once step 2 reports no rows left (evidence without a student or collector
+   organization stays NULL).
+"""
+import argparse
+import asyncio
+from typing import Dict
+
+from sqlalchemy import func, select, update
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..models.behavior_event import BehaviorEvent
+from ..models.evidence import Evidence
+from ..models.lesson_plan import LessonPlan
+from ..models.student import Student
+from ..models.user import User
+
+
+def _organization_of_student(student_id):
+    return (
+        select(Student.organization_id)
+        .where(Student.id == student_id)
+        .scalar_subquery()
+    )
+
+
+def _organization_of_user(user_id):
+    return select(User.organization_id).where(User.id == user_id).scalar_subquery()
+
+
+async def backfill_organization_ids(session: AsyncSession) -> Dict[str, int]:
+    """Set ``organization_id`` where it is missing. The caller commits.
+
+    Returns the number of rows updated per table.
+    """
+    statements = {
+        "behavior_events": update(BehaviorEvent)
+        .where(BehaviorEvent.organization_id.is_(None))
+        .values(organization_id=_organization_of_student(BehaviorEvent.student_id)),
+        "lesson_plans": update(LessonPlan)
+        .where(LessonPlan.organization_id.is_(None))
+        .values(organization_id=_organization_of_user(LessonPlan.created_by_id)),
+        "evidence": update(Evidence)
+        .where(Evidence.organization_id.is_(None))
+        .values(organization_id=func.coalesce(
+            _organization_of_student(Evidence.student_id),
+            _organization_of_user(Evidence.collected_by_id),
+        )),
+    }
+    updated = {}
+    for table, statement in statements.items():
+        result = await session.execute(
+            statement.execution_options(synchronize_session=False)
+        )
+        updated[table] = result.rowcount
+    return updated
+
+
+async def _backfill() -> Dict[str, int]:
+    from ..database import async_session_factory
+
+    async with async_session_factory() as session:
+        updated = await backfill_organization_ids(session)
+        await session.commit()
+    return updated
+
+
+def main():
+    """Backfill organization ids from the command line."""
+    argparse.ArgumentParser(
+        description=(
+            "Fill in organization_id on behavior events, lesson plans and evidence."
+        )
+    ).parse_args()
+    for table, count in asyncio.run(_backfill()).items():
+        print(f"{table}: {count} rows updated")
+
+
+if __name__ == "__main__":
+    main()
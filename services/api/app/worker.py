@@ -0,0 +1,23 @@
+"""
+Celery worker for jobs enqueued with ``JOB_QUEUE_BACKEND=celery``.
+
+Run with ``celery -A app.worker.celery_app worker``.
+"""
+from celery import Celery
+
+from app.core.config import settings
+
+celery_app = Celery("accompli", broker=settings.REDIS_URL, backend=settings.REDIS_URL)
+celery_app.conf.update(
+    task_track_started=True,
+    result_expires=settings.JOB_RESULT_TTL_SECONDS,
+)
+
+
+@celery_app.task(name="accompli.run_task")
+def run_celery_task(task: str, payload: dict):
+    """Run a job submitted through :class:`app.core.jobs.CeleryJobQueue`."""
+    # Imported here: app.core.jobs imports this module for the Celery backend
+    from app.core.jobs import run_task
+
+    return run_task(task, payload)
@@ -0,0 +1,864 @@
+"""Synthetic school district for load tests, index tuning and development.
+
+:func:`seed_district` fills an empty database with organizations, each with
+an administrator, teachers with caseloads of :data:`CASELOAD` students, and
+for every student an active IEP, goals, behavior events and evidence, plus
+lesson plans per teacher; then it rebuilds the behavior rollup and refreshes
+planner statistics.
+
+Distributions are skewed the way real districts are: disability categories
+and placements follow national special-education shares, a few students
+(more often with emotional disturbance or autism) account for most behavior
+events, events fall on school days during school hours, and goal progress
+matches goal status. Everything is derived from ``DistrictSpec.seed``, so
+the same spec always produces the same district.
+
+Students are generated in jobs of :data:`STUDENTS_PER_JOB` on a process
+pool. On PostgreSQL with the psycopg 3 driver (``postgresql+psycopg://``)
+every worker streams its rows with ``COPY`` on its own connection; on other
+databases (SQLite) workers generate rows and the parent process inserts
+them in chunks with ``executemany``. :func:`load_district` finds the tenants
+of a database seeded earlier.
+"""
+import asyncio
+import math
+import multiprocessing
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from functools import partial
+from itertools import accumulate
+from typing import (
+    Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+)
+
+from sqlalchemy import Date, DateTime, func, insert, select, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import NullPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.models.behavior_event import (
+    BehaviorEvent, BehaviorType, Intensity, InterventionType
+)
+from app.models.evidence import Evidence, EvidenceType
+from app.models.iep import IEP, GoalArea, GoalStatus, IEPGoal
+from app.models.lesson_plan import LessonPlan, SubjectArea
+from app.models.organization import Organization
+from app.models.student import DisabilityCategory, IEPStatus, PlacementType, Student
+from app.models.user import User, UserRole
+
+CHUNK_SIZE = 10000
+STUDENTS_PER_JOB = 240
+# Students per teacher; STUDENTS_PER_JOB is a multiple, so jobs own whole caseloads
+CASELOAD = 12
+SAMPLE_PASSWORD = "password"
+
+# Shares of students served under IDEA, by category and placement
+DISABILITY_WEIGHTS = {
+    DisabilityCategory.SPECIFIC_LEARNING_DISABILITY: 32,
+    DisabilityCategory.SPEECH_LANGUAGE_IMPAIRMENT: 19,
+    DisabilityCategory.OTHER_HEALTH_IMPAIRMENT: 15,
+    DisabilityCategory.AUTISM: 12,
+    DisabilityCategory.DEVELOPMENTAL_DELAY: 7,
+    DisabilityCategory.INTELLECTUAL_DISABILITY: 6,
+    DisabilityCategory.EMOTIONAL_DISTURBANCE: 5,
+    DisabilityCategory.MULTIPLE_DISABILITIES: 2,
+    DisabilityCategory.HEARING_IMPAIRMENT: 1,
+    DisabilityCategory.ORTHOPEDIC_IMPAIRMENT: 0.5,
+    DisabilityCategory.VISUAL_IMPAIRMENT: 0.3,
+    DisabilityCategory.TRAUMATIC_BRAIN_INJURY: 0.3,
+    DisabilityCategory.DEAFNESS: 0.1,
+    DisabilityCategory.DEAF_BLINDNESS: 0.01,
+}
+PLACEMENT_WEIGHTS = {
+    PlacementType.GENERAL_EDUCATION: 66,
+    PlacementType.RESOURCE_ROOM: 17,
+    PlacementType.SEPARATE_CLASS: 13,
+    PlacementType.SEPARATE_SCHOOL: 3,
+    PlacementType.HOME_HOSPITAL: 0.5,
+    PlacementType.RESIDENTIAL: 0.5,
+}
+# Relative behavior event rate by category (1 for categories not listed)
+BEHAVIOR_RATES = {
+    DisabilityCategory.EMOTIONAL_DISTURBANCE: 4.0,
+    DisabilityCategory.AUTISM: 2.5,
+    DisabilityCategory.MULTIPLE_DISABILITIES: 2.0,
+    DisabilityCategory.INTELLECTUAL_DISABILITY: 1.5,
+    DisabilityCategory.OTHER_HEALTH_IMPAIRMENT: 1.5,
+    DisabilityCategory.SPECIFIC_LEARNING_DISABILITY: 0.5,
+    DisabilityCategory.SPEECH_LANGUAGE_IMPAIRMENT: 0.5,
+}
+# Spread of the per-student lognormal rate: a long tail of frequent-event students
+RATE_SIGMA = 1.0
+
+BEHAVIOR_WEIGHTS = {
+    BehaviorType.DISRUPTIVE: 25,
+    BehaviorType.NON_COMPLIANCE: 20,
+    BehaviorType.POSITIVE: 15,
+    BehaviorType.VERBAL_OUTBURST: 14,
+    BehaviorType.AGGRESSIVE: 8,
+    BehaviorType.WITHDRAWAL: 7,
+    BehaviorType.OTHER: 5,
+    BehaviorType.PROPERTY_DESTRUCTION: 3,
+    BehaviorType.SELF_INJURY: 3,
+}
+INTENSITY_WEIGHTS = {
+    Intensity.LOW: 45, Intensity.MODERATE: 35, Intensity.HIGH: 15, Intensity.EXTREME: 5
+}
+INTERVENTION_WEIGHTS = {
+    InterventionType.REDIRECT: 30,
+    InterventionType.BREAK: 18,
+    InterventionType.CHOICE_GIVEN: 14,
+    InterventionType.CALM_DOWN_STRATEGIES: 12,
+    InterventionType.IGNORE: 10,
+    InterventionType.REMOVE_FROM_SITUATION: 8,
+    InterventionType.PREFERRED_ACTIVITY: 5,
+    InterventionType.OTHER: 3,
+}
+# School-day hours; mornings and the post-lunch block are the busiest
+HOUR_WEIGHTS = {8: 10, 9: 16, 10: 15, 11: 12, 12: 9, 13: 14, 14: 15, 15: 9}
+GOAL_STATUS_WEIGHTS = {
+    GoalStatus.IN_PROGRESS: 70,
+    GoalStatus.MASTERED: 15,
+    GoalStatus.NOT_STARTED: 10,
+    GoalStatus.DISCONTINUED: 5,
+}
+# Evidence type -> (weight, file extension, MIME type, median size in bytes)
+EVIDENCE_KINDS = {
+    EvidenceType.WORK_SAMPLE: (25, "pdf", "application/pdf", 400_000),
+    EvidenceType.PHOTO: (25, "jpg", "image/jpeg", 2_500_000),
+    EvidenceType.DATA_SHEET: (20, "pdf", "application/pdf", 150_000),
+    EvidenceType.OBSERVATION: (
+        12,
+        "docx",
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        40_000,
+    ),
+    EvidenceType.DOCUMENT: (10, "pdf", "application/pdf", 300_000),
+    EvidenceType.VIDEO: (5, "mp4", "video/mp4", 60_000_000),
+    EvidenceType.AUDIO: (2, "m4a", "audio/mp4", 5_000_000),
+    EvidenceType.OTHER: (1, "bin", "application/octet-stream", 100_000),
+}
+GRADES = ["K"] + [str(grade) for grade in range(1, 13)]
+
+FIRST_NAMES = [
+    "Aiden", "Alex", "Amara", "Ava", "Benjamin", "Camila", "Carter", "Chloe", "Daniel",
+    "Elijah", "Emma", "Ethan", "Grace", "Hannah", "Isaac", "Isabella", "Jayden", "Kai",
+    "Liam", "Lucas", "Maya", "Mia", "Noah", "Nora", "Oliver", "Priya", "Riley", "Sofia",
+    "Wyatt", "Zoe",
+]
+LAST_NAMES = [
+    "Anderson", "Brown", "Chen", "Davis", "Garcia", "Hernandez", "Jackson", "Johnson",
+    "Kim", "Lee", "Lopez", "Martin", "Martinez", "Miller", "Nguyen", "Patel",
+    "Robinson", "Rodriguez", "Smith", "Taylor", "Thomas", "Thompson", "Walker", "White",
+    "Williams", "Wilson", "Wright", "Young",
+]
+ANTECEDENTS = [
+    "Transition between activities", "Non-preferred task presented",
+    "Asked to stop preferred activity", "Peer conflict", "Unstructured time",
+    "Loud or crowded environment", "Denied access to item", "Correction from staff",
+    "Independent work time", "Schedule change",
+]
+CONSEQUENCES = [
+    "Verbal redirection", "Planned ignoring", "Break in calm-down area",
+    "Task modified", "Loss of privilege", "Praise and token", "Sent to office",
+    "Parent contacted",
+]
+DESCRIPTIONS = {
+    BehaviorType.DISRUPTIVE: "Called out and left seat repeatedly during instruction",
+    BehaviorType.NON_COMPLIANCE: "Refused to begin assigned task after three prompts",
+    BehaviorType.POSITIVE: "Used coping strategy independently and returned to work",
+    BehaviorType.VERBAL_OUTBURST: "Yelled at staff when asked to transition",
+    BehaviorType.AGGRESSIVE: "Pushed a peer while waiting in line",
+    BehaviorType.WITHDRAWAL: "Put head down and stopped responding to prompts",
+    BehaviorType.OTHER: "Off-task behavior not otherwise classified",
+    BehaviorType.PROPERTY_DESTRUCTION: "Tore worksheet and threw materials",
+    BehaviorType.SELF_INJURY: "Hit own head with open hand",
+}
+LOCATIONS = [
+    "Classroom", "Resource room", "Hallway", "Cafeteria", "Playground", "Gym", "Bus",
+    "Library",
+]
+ACTIVITIES = [
+    "Reading block", "Math block", "Writing", "Science", "Specials", "Lunch", "Recess",
+    "Arrival", "Dismissal",
+]
+GOALS = {
+    GoalArea.ACADEMIC_READING: (
+        "will read grade-level passages at 90 words per minute",
+        "Curriculum-based measurement",
+    ),
+    GoalArea.ACADEMIC_MATH: (
+        "will solve two-step word problems with 80% accuracy",
+        "Work samples",
+    ),
+    GoalArea.ACADEMIC_WRITING: (
+        "will write a paragraph with a topic sentence and three details",
+        "Writing rubric",
+    ),
+    GoalArea.COMMUNICATION: (
+        "will request help using a complete sentence in 4 of 5 opportunities",
+        "Frequency count",
+    ),
+    GoalArea.SOCIAL_EMOTIONAL: (
+        "will identify feelings and choose a coping strategy in 4 of 5 opportunities",
+        "Observation",
+    ),
+    GoalArea.BEHAVIOR: (
+        "will remain on task for 15 minutes with no more than one prompt",
+        "Interval recording",
+    ),
+    GoalArea.FUNCTIONAL_LIFE_SKILLS: (
+        "will follow a visual schedule through the school day independently",
+        "Task analysis",
+    ),
+    GoalArea.TRANSITION: (
+        "will complete a career interest inventory and identify two goals",
+        "Student portfolio",
+    ),
+    GoalArea.MOTOR_SKILLS: (
+        "will write legibly on lined paper in 4 of 5 samples",
+        "Work samples",
+    ),
+    GoalArea.VOCATIONAL: (
+        "will complete a three-step job task with one prompt",
+        "Task analysis",
+    ),
+}
+LESSONS = {
+    SubjectArea.READING: "Identify the main idea and two supporting details",
+    SubjectArea.MATH: "Solve two-step word problems using a bar model",
+    SubjectArea.WRITING: "Plan a paragraph with a graphic organizer",
+    SubjectArea.COMMUNICATION: "Practice requesting help with sentence starters",
+    SubjectArea.BEHAVIOR: "Rehearse coping strategies for frustration",
+    SubjectArea.LIFE_SKILLS: "Follow a visual recipe to prepare a snack",
+    SubjectArea.SCIENCE: "Sort materials by their properties",
+    SubjectArea.SOCIAL_STUDIES: "Read a community map",
+    SubjectArea.TRANSITION: "Explore career interests",
+}
+
+# Columns written for each generated table, in row tuple order. Rows carry
+# enum *names*, which is how the Enum columns store them.
+STUDENT_COLUMNS = (
+    "id", "created_at", "updated_at", "first_name", "last_name", "date_of_birth",
+    "student_id", "grade", "disability_category", "placement", "iep_status",
+    "iep_start_date", "iep_end_date", "next_review_date", "reading_level", "math_level",
+    "behavior_plan", "crisis_plan", "goals_progress", "recent_behaviors", "is_active",
+    "organization_id", "case_manager_id",
+)
+IEP_COLUMNS = (
+    "id", "created_at", "updated_at", "student_id", "start_date", "end_date",
+    "annual_review_date", "is_active",
+)
+GOAL_COLUMNS = (
+    "id", "created_at", "updated_at", "iep_id", "area", "description", "baseline",
+    "target_criteria", "measurement_method", "status", "progress_percentage",
+    "target_date", "mastery_date", "is_priority", "data_collection_schedule",
+)
+EVENT_COLUMNS = (
+    "created_at", "updated_at", "student_id", "organization_id", "date_time",
+    "duration_minutes", "antecedent", "behavior_description", "consequence",
+    "behavior_type", "intensity", "location", "activity", "intervention_used",
+    "intervention_effective", "follow_up_needed", "data_collector_id",
+)
+LESSON_PLAN_COLUMNS = (
+    "created_at", "updated_at", "title", "subject_area", "date", "duration_minutes",
+    "objective", "created_by_id", "organization_id", "is_template", "is_published",
+)
+EVIDENCE_COLUMNS = (
+    "created_at", "updated_at", "title", "evidence_type", "file_name", "file_size",
+    "mime_type", "content_sha256", "student_id", "iep_goal_id", "collected_date",
+    "collected_by_id", "organization_id", "is_confidential", "shared_with_parents",
+    "tags",
+)
+# Insert order respects foreign keys
+TABLES = (
+    (Student, STUDENT_COLUMNS),
+    (IEP, IEP_COLUMNS),
+    (IEPGoal, GOAL_COLUMNS),
+    (BehaviorEvent, EVENT_COLUMNS),
+    (LessonPlan, LESSON_PLAN_COLUMNS),
+    (Evidence, EVIDENCE_COLUMNS),
+)
+# Tables whose ids are assigned by the generator (so jobs can reference them)
+ASSIGNED_ID_TABLES = (Student, IEP, IEPGoal)
+
+
+@dataclass
+class DistrictSpec:
+    """Size and shape of the synthetic district. Per-student counts are means."""
+    organizations: int = 5
+    students_per_organization: int = 200
+    goals_per_student: int = 4
+    events_per_student: int = 100
+    evidence_per_student: int = 6
+    lesson_plans_per_teacher: int = 40
+    # Events, lesson plans and evidence fall on school days in this window before today
+    days: int = 180
+    seed: int = 1
+    workers: int = 1  # generator processes
+
+    @property
+    def max_goals(self) -> int:
+        return 2 * self.goals_per_student + 1
+
+
+@dataclass
+class Tenant:
+    """An organization with the teacher the load test signs in as."""
+    organization_id: int
+    user_id: int
+    student_ids: List[int] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class _Job:
+    """A slice of one organization's students, generated and written together."""
+    spec: DistrictSpec
+    index: int
+    organization_id: int
+    # Case managers of this slice, one per CASELOAD students
+    teacher_ids: Tuple[int, ...]
+    first_student: int  # position of the slice's first student in its organization
+    students: int
+    # Id of the slice's first student (and of its IEP, offset by iep_offset)
+    student_id: int
+    iep_offset: int
+    goal_id: int  # first goal id; each student owns spec.max_goals ids
+    now: datetime
+
+
+def _cumulative(weights: Dict[Any, float]) -> Tuple[List[str], List[float]]:
+    """Enum names and cumulative weights for ``random.choices``."""
+    return [member.name for member in weights], list(accumulate(weights.values()))
+
+
+def _school_days(today: date, days: int) -> List[datetime]:
+    """Midnight of each weekday in the ``days`` before ``today``."""
+    start = today - timedelta(days=days)
+    return [
+        datetime.combine(start + timedelta(days=offset), datetime.min.time())
+        for offset in range(days)
+        if (start + timedelta(days=offset)).weekday() < 5
+    ]
+
+
+def _mean_rate() -> float:
+    """Expected behavior rate of a random student, to scale rates to the spec's mean."""
+    total = sum(DISABILITY_WEIGHTS.values())
+    category = sum(
+        weight * BEHAVIOR_RATES.get(member, 1.0)
+        for member, weight in DISABILITY_WEIGHTS.items()
+    ) / total
+    return category * math.exp(RATE_SIGMA ** 2 / 2)
+
+
+def generate_job(job: _Job) -> Dict[str, List[tuple]]:
+    """Rows of every generated table for one job, keyed by table name."""
+    spec = job.spec
+    rng = random.Random(spec.seed * 1_000_003 + job.index)
+    now = job.now
+    today = now.date()
+    school_days = _school_days(today, spec.days) or [
+        datetime.combine(today, datetime.min.time())
+    ]
+    recent = now - timedelta(days=30)
+    mean_rate = _mean_rate()
+
+    categories, category_weights = _cumulative(DISABILITY_WEIGHTS)
+    placements, placement_weights = _cumulative(PLACEMENT_WEIGHTS)
+    behaviors, behavior_weights = _cumulative(BEHAVIOR_WEIGHTS)
+    intensities, intensity_weights = _cumulative(INTENSITY_WEIGHTS)
+    interventions, intervention_weights = _cumulative(INTERVENTION_WEIGHTS)
+    statuses, status_weights = _cumulative(GOAL_STATUS_WEIGHTS)
+    hours, hour_weights = list(HOUR_WEIGHTS), list(accumulate(HOUR_WEIGHTS.values()))
+    evidence_types = list(EVIDENCE_KINDS)
+    evidence_weights = list(accumulate(kind[0] for kind in EVIDENCE_KINDS.values()))
+    areas = list(GOALS)
+    subjects = list(LESSONS)
+    rates = {
+        member.name: BEHAVIOR_RATES.get(member, 1.0) for member in DisabilityCategory
+    }
+    descriptions = {member.name: text for member, text in DESCRIPTIONS.items()}
+    positive = BehaviorType.POSITIVE.name
+    severe = (Intensity.HIGH.name, Intensity.EXTREME.name)
+
+    rows: Dict[str, List[tuple]] = {model.__tablename__: [] for model, _ in TABLES}
+    students, ieps, goals = rows["students"], rows["ieps"], rows["iep_goals"]
+    events, evidence = rows["behavior_events"], rows["evidence"]
+
+    for offset in range(job.students):
+        student_id = job.student_id + offset
+        iep_id = student_id + job.iep_offset
+        teacher_id = job.teacher_ids[offset // CASELOAD]
+        category = rng.choices(categories, cum_weights=category_weights)[0]
+        grade_index = rng.randrange(len(GRADES))
+        first_name = rng.choice(FIRST_NAMES)
+
+        # IEP: a year long, started within the last year
+        iep_start = today - timedelta(days=rng.randrange(365))
+        iep_end = iep_start + timedelta(days=364)
+        if iep_end > today + timedelta(days=30):
+            iep_status = IEPStatus.ACTIVE
+        else:
+            iep_status = IEPStatus.REVIEW_NEEDED
+        ieps.append((
+            iep_id, now, now, student_id, iep_start, iep_end,
+            iep_end - timedelta(days=30), True,
+        ))
+
+        goal_ids = []
+        progress_total = 0
+        goal_count = round(rng.gauss(spec.goals_per_student, 1))
+        goal_count = max(1, min(spec.max_goals, goal_count))
+        for number, area in enumerate(rng.sample(areas, min(goal_count, len(areas)))):
+            goal_id = job.goal_id + offset * spec.max_goals + number
+            status = rng.choices(statuses, cum_weights=status_weights)[0]
+            if status == "MASTERED":
+                progress = 100
+            elif status == "NOT_STARTED":
+                progress = 0
+            elif status == "IN_PROGRESS":
+                progress = rng.randint(10, 90)
+            else:
+                progress = rng.randint(0, 60)
+            description, method = GOALS[area]
+            if status == "MASTERED":
+                mastered = iep_start + timedelta(days=rng.randrange(1, 300))
+            else:
+                mastered = None
+            goals.append((
+                goal_id, now, now, iep_id, area.name, f"{first_name} {description}.",
+                "Below grade-level expectations",
+                "80% accuracy over three consecutive data points",
+                method, status, progress, iep_end, mastered,
+                number == 0, rng.choice(("daily", "weekly", "weekly", "monthly")),
+            ))
+            goal_ids.append(goal_id)
+            progress_total += progress
+
+        # Heavy-tailed event counts: most students have a few, some have many
+        rate = rates[category] * rng.lognormvariate(0, RATE_SIGMA) / mean_rate
+        event_count = int(spec.events_per_student * rate + rng.random())
+        recent_count = 0
+        if event_count:
+            days = rng.choices(school_days, k=event_count)
+            event_hours = rng.choices(hours, cum_weights=hour_weights, k=event_count)
+            types = rng.choices(
+                behaviors, cum_weights=behavior_weights, k=event_count
+            )
+            levels = rng.choices(
+                intensities, cum_weights=intensity_weights, k=event_count
+            )
+            for day, hour, behavior_type, intensity in zip(
+                days, event_hours, types, levels
+            ):
+                moment = day + timedelta(hours=hour, seconds=rng.randrange(3600))
+                recent_count += moment >= recent
+                calm = behavior_type == positive
+                events.append((
+                    moment, moment, student_id, job.organization_id, moment,
+                    max(1, min(90, int(rng.lognormvariate(1.5, 0.8)))),
+                    rng.choice(ANTECEDENTS), descriptions[behavior_type],
+                    rng.choice(CONSEQUENCES), behavior_type, intensity,
+                    rng.choice(LOCATIONS), rng.choice(ACTIVITIES),
+                    None if calm else rng.choices(
+                        interventions, cum_weights=intervention_weights
+                    )[0],
+                    None if calm else rng.random() < 0.7,
+                    intensity in severe and rng.random() < 0.5,
+                    teacher_id,
+                ))
+
+        for number in range(rng.randint(0, 2 * spec.evidence_per_student)):
+            evidence_type = rng.choices(evidence_types, cum_weights=evidence_weights)[0]
+            _, extension, mime_type, size = EVIDENCE_KINDS[evidence_type]
+            collected = rng.choice(school_days) + timedelta(
+                hours=rng.choice(hours), seconds=rng.randrange(3600)
+            )
+            evidence.append((
+                collected, collected, f"{evidence_type.value} {number + 1}",
+                evidence_type.name,
+                f"{evidence_type.name.lower()}-{student_id}-{number + 1}.{extension}",
+                int(size * rng.lognormvariate(0, 0.6)), mime_type,
+                f"{rng.getrandbits(256):064x}", student_id,
+                rng.choice(goal_ids) if rng.random() < 0.7 else None, collected,
+                teacher_id, job.organization_id, True, rng.random() < 0.2, "synthetic",
+            ))
+
+        grade = grade_index  # K is grade 0
+        students.append((
+            student_id, now, now, first_name, rng.choice(LAST_NAMES),
+            date(today.year - 6 - grade, 1, 1) + timedelta(days=rng.randrange(365)),
+            f"S{job.organization_id:04d}-{job.first_student + offset:07d}",
+            GRADES[grade_index], category,
+            rng.choices(placements, cum_weights=placement_weights)[0], iep_status.name,
+            iep_start, iep_end, iep_end,
+            f"Grade {GRADES[max(0, grade - rng.randint(0, 3))]}",
+            f"Grade {GRADES[max(0, grade - rng.randint(0, 3))]}",
+            rate > 1.5, rate > 4 and rng.random() < 0.3,
+            progress_total // len(goal_ids), recent_count,
+            True, job.organization_id, teacher_id,
+        ))
+
+    for teacher_id in job.teacher_ids:
+        for _ in range(spec.lesson_plans_per_teacher):
+            subject = rng.choice(subjects)
+            day = rng.choice(school_days).date()
+            rows["lesson_plans"].append((
+                now, now, f"{subject.value}: {LESSONS[subject]}", subject.name, day,
+                rng.choice((20, 30, 30, 45, 60)), LESSONS[subject], teacher_id,
+                job.organization_id, rng.random() < 0.05, rng.random() < 0.8,
+            ))
+    return rows
+
+
+def _chunks(
+    rows: Sequence[tuple], size: int = CHUNK_SIZE
+) -> Iterator[Sequence[tuple]]:
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def _copy_rows(
+    connection, table: str, columns: Sequence[str], rows: Sequence[tuple]
+) -> None:
+    """Stream rows into ``table`` with COPY (psycopg 3)."""
+    cursor = connection.connection.driver_connection.cursor()
+    with cursor.copy(f"COPY {table} ({', '.join(columns)}) FROM STDIN") as copy:
+        for row in rows:
+            copy.write_row(row)
+
+
+def _insert_rows(
+    connection, table: str, columns: Sequence[str], rows: Sequence[tuple]
+) -> None:
+    """Insert encoded rows into ``table`` in chunks with the driver's executemany."""
+    dialect = connection.dialect
+    statement = insert(SQLModel.metadata.tables[table])
+    sql = str(statement.compile(dialect=dialect, column_keys=list(columns)))
+    for chunk in _chunks(rows):
+        if not dialect.positional:
+            chunk = [dict(zip(columns, row)) for row in chunk]
+        connection.exec_driver_sql(sql, chunk)
+
+
+def encode_job(url: str, job: _Job) -> Dict[str, List[tuple]]:
+    """Worker: generate a job, converting dates and times with the dialect.
+
+    Converting here, in parallel, leaves the single writer nothing to do but
+    hand the rows to the driver. Other values (enum names, strings, numbers,
+    booleans) are already what the driver takes.
+    """
+    dialect = make_url(url).get_dialect()()
+    rows = generate_job(job)
+    for model, columns in TABLES:
+        processors = {}
+        for position, column in enumerate(columns):
+            column_type = model.__table__.c[column].type
+            process = column_type.dialect_impl(dialect).bind_processor(dialect)
+            if process is not None and isinstance(column_type, (Date, DateTime)):
+                processors[position] = process
+        if not processors:
+            continue
+        # Rows repeat a timestamp in created_at, updated_at and their own time
+        encoded: Dict[Any, Any] = {}
+        table_rows = rows[model.__tablename__]
+        for number, row in enumerate(table_rows):
+            row = list(row)
+            for position, process in processors.items():
+                value = row[position]
+                if value is not None:
+                    row[position] = encoded.get(value) or encoded.setdefault(
+                        value, process(value)
+                    )
+            table_rows[number] = tuple(row)
+    return rows
+
+
+def supports_copy(engine: Engine) -> bool:
+    """Whether rows can be loaded with COPY: PostgreSQL through psycopg 3."""
+    return engine.dialect.name == "postgresql" and engine.dialect.driver == "psycopg"
+
+
+def write_job(connection, rows: Dict[str, List[tuple]], copy: bool) -> Dict[str, int]:
+    """Write one job's rows in foreign-key order; return row counts per table."""
+    write = _copy_rows if copy else _insert_rows
+    for model, columns in TABLES:
+        write(connection, model.__tablename__, columns, rows[model.__tablename__])
+    return {table: len(table_rows) for table, table_rows in rows.items()}
+
+
+def copy_job(url: str, job: _Job) -> Dict[str, int]:
+    """Worker: generate a job and COPY it on the worker's own connection."""
+    engine = create_engine(url, poolclass=NullPool)
+    try:
+        with engine.begin() as connection:
+            return write_job(connection, generate_job(job), copy=True)
+    finally:
+        engine.dispose()
+
+
+def _bounded_map(
+    pool: Optional[ProcessPoolExecutor],
+    function: Callable,
+    items: Iterable,
+    window: int,
+) -> Iterator:
+    """Results of ``function`` over ``items`` in order, at most ``window`` in flight."""
+    if pool is None:
+        yield from map(function, items)
+        return
+    pending = deque()
+    for item in items:
+        pending.append(pool.submit(function, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _next_id(session: Session, model) -> int:
+    return (session.scalar(select(func.max(model.id))) or 0) + 1
+
+
+def _create_staff(
+    session: Session, spec: DistrictSpec, now: datetime
+) -> List[Tuple[int, int, List[int]]]:
+    """Organizations, each with an administrator and one teacher per caseload.
+
+    Returns (organization id, administrator id, teacher ids) per organization.
+    """
+    from app.core.auth import get_password_hash
+
+    password_hash = get_password_hash(SAMPLE_PASSWORD)
+    stamps = {"created_at": now, "updated_at": now}
+    session.execute(insert(Organization.__table__), [
+        {**stamps, "name": f"Synthetic District {number}", "code": f"district-{number}",
+         "is_active": True, "max_users": 100}
+        for number in range(spec.organizations)
+    ])
+    organizations = session.execute(
+        select(Organization.id, Organization.code)
+        .where(Organization.code.like("district-%"))
+        .order_by(Organization.id)
+    ).all()
+
+    teachers = -(-spec.students_per_organization // CASELOAD)
+    user = {
+        **stamps,
+        "hashed_password": password_hash,
+        "is_active": True,
+        "is_verified": True,
+    }
+    session.execute(insert(User.__table__), [
+        {**user, "email": f"admin@{code}.example", "first_name": "District",
+         "last_name": f"Admin {number}", "role": UserRole.ADMIN,
+         "organization_id": organization_id}
+        for number, (organization_id, code) in enumerate(organizations)
+    ] + [
+        {**user, "email": f"teacher{index}@{code}.example", "first_name": "Teacher",
+         "last_name": str(index), "role": UserRole.TEACHER,
+         "organization_id": organization_id}
+        for organization_id, code in organizations
+        for index in range(teachers)
+    ])
+
+    staff = {organization_id: [None, []] for organization_id, _ in organizations}
+    users = session.execute(
+        select(User.id, User.organization_id, User.role)
+        .where(User.organization_id.in_(list(staff)))
+        .order_by(User.id)
+    )
+    for user_id, organization_id, role in users:
+        if role == UserRole.ADMIN:
+            staff[organization_id][0] = user_id
+        else:
+            staff[organization_id][1].append(user_id)
+    return [
+        (organization_id, admin_id, teacher_ids)
+        for organization_id, (admin_id, teacher_ids) in staff.items()
+    ]
+
+
+def _plan_jobs(
+    session: Session, spec: DistrictSpec, staff, now: datetime
+) -> List[_Job]:
+    student_id = _next_id(session, Student)
+    iep_offset = _next_id(session, IEP) - student_id
+    goal_id = _next_id(session, IEPGoal)
+    jobs = []
+    for organization_id, _, teacher_ids in staff:
+        for first in range(0, spec.students_per_organization, STUDENTS_PER_JOB):
+            count = min(STUDENTS_PER_JOB, spec.students_per_organization - first)
+            caseloads = slice(first // CASELOAD, (first + count - 1) // CASELOAD + 1)
+            jobs.append(_Job(
+                spec=spec,
+                index=len(jobs),
+                organization_id=organization_id,
+                teacher_ids=tuple(teacher_ids[caseloads]),
+                first_student=first,
+                students=count,
+                student_id=student_id,
+                iep_offset=iep_offset,
+                goal_id=goal_id,
+                now=now,
+            ))
+            student_id += count
+            goal_id += count * spec.max_goals
+    return jobs
+
+
+def _load_jobs(
+    loader: Engine, spec: DistrictSpec, jobs: List[_Job]
+) -> Dict[str, int]:
+    """Generate and write every job; return row counts per table."""
+    url = loader.url.render_as_string(hide_password=False)
+    counts: Dict[str, int] = {}
+    # "spawn" for the same reason as the job queue's own pool
+    pool = None
+    if spec.workers > 1:
+        pool = ProcessPoolExecutor(
+            max_workers=spec.workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    try:
+        window = 2 * spec.workers
+        if supports_copy(loader):
+            results = _bounded_map(pool, partial(copy_job, url), jobs, window)
+        else:
+            encoded = _bounded_map(pool, partial(encode_job, url), jobs, window)
+            results = _write_encoded(loader, encoded)
+        for job_counts in results:
+            for table, count in job_counts.items():
+                counts[table] = counts.get(table, 0) + count
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return counts
+
+
+def _write_encoded(
+    loader: Engine, jobs_rows: Iterable[Dict[str, List[tuple]]]
+) -> Iterator[Dict[str, int]]:
+    """Write encoded jobs one after another on one connection.
+
+    SQLite takes a single writer.
+    """
+    with loader.connect() as connection:
+        if loader.dialect.name == "sqlite":
+            connection.exec_driver_sql("PRAGMA synchronous = OFF")
+        for rows in jobs_rows:
+            yield write_job(connection, rows, copy=False)
+            connection.commit()
+
+
+def seed_district(
+    engine: Engine, spec: DistrictSpec
+) -> Tuple[List[Tenant], Dict[str, int]]:
+    """Create the tables and fill them with a synthetic district.
+
+    Returns the tenants and the number of rows written per table. Refuses
+    to run against a database that already has organizations.
+    """
+    # A plain engine: the app's query instrumentation would cost more than the inserts
+    loader = create_engine(
+        engine.url.render_as_string(hide_password=False), poolclass=NullPool
+    )
+    SQLModel.metadata.create_all(loader)
+    now = datetime.utcnow()
+
+    with Session(loader) as session:
+        if session.scalar(select(func.count()).select_from(Organization)):
+            raise SystemExit(
+                "Database already has organizations; "
+                "seed an empty database or pass --reuse"
+            )
+        staff = _create_staff(session, spec, now)
+        jobs = _plan_jobs(session, spec, staff, now)
+        session.commit()
+
+    counts = {
+        "organizations": len(staff),
+        "users": sum(1 + len(teachers) for _, _, teachers in staff),
+    }
+    # Building secondary indexes once after the load is much cheaper than
+    # maintaining them row by row during it
+    indexes = [
+        index
+        for model, _ in TABLES
+        for index in model.__table__.indexes
+        if not index.unique
+    ]
+    with loader.begin() as connection:
+        for index in indexes:
+            index.drop(connection, checkfirst=True)
+    try:
+        for table, count in _load_jobs(loader, spec, jobs).items():
+            counts[table] = count
+    finally:
+        with loader.begin() as connection:
+            for index in indexes:
+                index.create(connection, checkfirst=True)
+
+    with loader.begin() as connection:
+        if loader.dialect.name == "postgresql":
+            # Ids were assigned explicitly; move the sequences past them
+            for model in ASSIGNED_ID_TABLES:
+                table = model.__tablename__
+                connection.execute(text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+                    f"(SELECT max(id) FROM {table}))"
+                ))
+
+    asyncio.run(_rebuild_rollup())
+
+    # Fresh planner statistics for the loaded tables
+    autocommit = loader.connect().execution_options(isolation_level="AUTOCOMMIT")
+    with autocommit as connection:
+        connection.exec_driver_sql("ANALYZE")
+    loader.dispose()
+
+    tenants = []
+    for job in jobs:
+        if not tenants or tenants[-1].organization_id != job.organization_id:
+            tenants.append(Tenant(
+                organization_id=job.organization_id, user_id=job.teacher_ids[0]
+            ))
+        tenants[-1].student_ids.extend(
+            range(job.student_id, job.student_id + job.students)
+        )
+    return tenants, counts
+
+
+async def _rebuild_rollup() -> None:
+    from app.database import async_session_factory
+    from app.services.behavior_rollup import rebuild_rollup
+
+    async with async_session_factory() as session:
+        await rebuild_rollup(session)
+        await session.commit()
+
+
+def load_district(engine) -> List[Tenant]:
+    """Tenants of a database seeded earlier.
+
+    Each organization's first teacher, with the organization's students.
+    """
+    with Session(engine) as session:
+        teachers = session.execute(
+            select(User.organization_id, func.min(User.id))
+            .where(User.role == UserRole.TEACHER, User.organization_id.is_not(None))
+            .group_by(User.organization_id)
+        ).all()
+        tenants = {
+            organization_id: Tenant(organization_id, user_id)
+            for organization_id, user_id in teachers
+        }
+        for student_id, organization_id in session.execute(
+            select(Student.id, Student.organization_id)
+        ):
+            if organization_id in tenants:
+                tenants[organization_id].student_ids.append(student_id)
+    return [tenant for tenant in tenants.values() if tenant.student_ids]
@@ -0,0 +1,332 @@
+"""HTTP load test of the API against a synthetic district.
+
+Seeds a district (see :mod:`benchmarks.district`) into ``--database-url``,
+starts ``app.main:app`` under uvicorn against it and drives a weighted mix
+of dashboard, list, detail, create and report requests at a fixed number of
+concurrent clients. Each client signs in as the teacher of a random
+organization. Per-endpoint request rate and p50/p95/p99 latency are written
+as JSON, to stdout or ``--output``, so runs can be compared between releases::
+
+    python -m benchmarks.load --database-url sqlite:///./bench.db \\
+        --organizations 10 --students 500 --events-per-student 400 \\
+        --concurrency 32 --duration 60 --output bench.json
+
+    # Postgres, reusing a district seeded by an earlier run
+    python -m benchmarks.load \\
+        --database-url postgresql+psycopg://localhost/accompli_bench --reuse
+
+Point it at a dedicated database: seeding refuses to run against one that
+already has organizations, unless ``--reuse`` is given to skip seeding.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Tuple
+
+# Endpoint name -> (weight, request builder). Builders get the client's tenant
+# and a student of that tenant, and return (method, path, json body or None).
+API = "/api/v1"
+WORKLOAD: Dict[str, Tuple[int, Callable]] = {
+    "dashboard": (15, lambda tenant, student_id: (
+        "GET", f"{API}/analytics/analytics/dashboard", None,
+    )),
+    "list_students": (15, lambda tenant, student_id: (
+        "GET", f"{API}/students/?limit=50", None,
+    )),
+    "get_student": (10, lambda tenant, student_id: (
+        "GET", f"{API}/students/{student_id}", None,
+    )),
+    "list_goals": (10, lambda tenant, student_id: (
+        "GET", f"{API}/goals/?student_id={student_id}", None,
+    )),
+    "list_behavior_events": (20, lambda tenant, student_id: (
+        "GET",
+        f"{API}/behavior-events/behavior-events/?student_id={student_id}&limit=50",
+        None,
+    )),
+    "create_behavior_event": (20, lambda tenant, student_id: (
+        "POST", f"{API}/behavior-events/behavior-events/", {
+            "student_id": student_id,
+            "date_time": datetime.utcnow().isoformat(),
+            "antecedent": "Transition",
+            "behavior_description": "Load test event",
+            "consequence": "Redirected",
+            "behavior_type": random.choice(
+                ["Disruptive", "Non-Compliance", "Positive"]
+            ),
+            "intensity": random.choice(["Low", "Moderate"]),
+            "duration_minutes": random.randint(1, 15),
+        },
+    )),
+    "progress_report": (10, lambda tenant, student_id: (
+        "GET", f"{API}/reports/reports/student/{student_id}/progress", None,
+    )),
+}
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+    rank = round(fraction * len(sorted_values) + 0.5) - 1
+    rank = max(0, min(len(sorted_values) - 1, rank))
+    return sorted_values[rank]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, float]:
+    """Request rate and latency percentiles (ms) for one endpoint."""
+    values = sorted(latencies)
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "requests_per_second": round(len(values) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(values) / len(values) * 1000, 2) if values else 0.0,
+        "p50_ms": round(percentile(values, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(values, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(values, 0.99) * 1000, 2),
+    }
+
+
+async def run_load(base_url: str, tenants, args) -> Dict:
+    """Drive the workload with ``args.concurrency`` clients; return the report."""
+    import httpx
+
+    from app.core.auth import create_access_token
+
+    names = list(WORKLOAD)
+    weights = [WORKLOAD[name][0] for name in names]
+    tokens = {
+        tenant.organization_id: create_access_token({"sub": str(tenant.user_id)})
+        for tenant in tenants
+    }
+    latencies: Dict[str, List[float]] = {name: [] for name in names}
+    errors: Dict[str, int] = {name: 0 for name in names}
+    statuses: Dict[str, Dict[str, int]] = {name: {} for name in names}
+
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+    async with httpx.AsyncClient(
+        base_url=base_url, limits=limits, timeout=args.timeout
+    ) as client:
+        recording = False
+        deadline = time.monotonic() + args.warmup + args.duration
+
+        async def worker(seed: int):
+            rng = random.Random(seed)
+            while time.monotonic() < deadline:
+                tenant = rng.choice(tenants)
+                name = rng.choices(names, weights)[0]
+                method, path, body = WORKLOAD[name][1](
+                    tenant, rng.choice(tenant.student_ids)
+                )
+                headers = {"Authorization": f"Bearer {tokens[tenant.organization_id]}"}
+                started = time.perf_counter()
+                try:
+                    response = await client.request(
+                        method, path, json=body, headers=headers
+                    )
+                    status = str(response.status_code)
+                    failed = response.status_code >= 400
+                except httpx.HTTPError as exc:
+                    status, failed = type(exc).__name__, True
+                elapsed = time.perf_counter() - started
+                if recording:
+                    statuses[name][status] = statuses[name].get(status, 0) + 1
+                    if failed:
+                        errors[name] += 1
+                    else:
+                        latencies[name].append(elapsed)
+
+        workers = [
+            asyncio.create_task(worker(args.seed + index))
+            for index in range(args.concurrency)
+        ]
+        await asyncio.sleep(args.warmup)
+        recording = True
+        started = time.monotonic()
+        await asyncio.gather(*workers)
+        elapsed = time.monotonic() - started
+
+    endpoints = {
+        name: {
+            **summarize(latencies[name], errors[name], elapsed),
+            "statuses": statuses[name],
+        }
+        for name in names
+    }
+    return {
+        "endpoints": endpoints,
+        "total": summarize(
+            [value for values in latencies.values() for value in values],
+            sum(errors.values()),
+            elapsed,
+        ),
+        "elapsed_seconds": round(elapsed, 2),
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(args, env: Dict[str, str]) -> Tuple[subprocess.Popen, str]:
+    """Start uvicorn on a free port and wait for /health."""
+    import httpx
+
+    port = _free_port()
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(args.workers), "--no-access-log", "--log-level", "warning",
+        ],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise SystemExit(f"API server exited with status {server.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health").status_code == 200:
+                return server, base_url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+    server.terminate()
+    raise SystemExit("API server did not become healthy within 60 seconds")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Load test the API against a synthetic district."
+    )
+    parser.add_argument(
+        "--database-url",
+        default=None,
+        help="default: SQLite file in a temporary directory",
+    )
+    parser.add_argument(
+        "--reuse", action="store_true", help="use the district already in the database"
+    )
+    parser.add_argument("--organizations", type=int, default=5)
+    parser.add_argument(
+        "--students", type=int, default=200, help="students per organization"
+    )
+    parser.add_argument("--goals-per-student", type=int, default=4)
+    parser.add_argument("--events-per-student", type=int, default=100)
+    parser.add_argument("--evidence-per-student", type=int, default=6)
+    parser.add_argument("--lesson-plans-per-teacher", type=int, default=40)
+    parser.add_argument(
+        "--seed-workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="district generator processes",
+    )
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0, help="measured seconds")
+    parser.add_argument(
+        "--warmup", type=float, default=5.0, help="unmeasured seconds before measuring"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="uvicorn worker processes"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=30.0, help="per-request timeout in seconds"
+    )
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--output", default=None, help="write the JSON report here instead of stdout"
+    )
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="accompli-bench-")
+    database_url = args.database_url or f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    # Settings are read on import, so configure the environment first
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "ENVIRONMENT": "benchmark",
+        "LOG_LEVEL": "WARNING",
+        "ALLOWED_HOSTS": '["127.0.0.1"]',
+        "BLOB_STORE_PATH": os.path.join(workdir, "blobs"),
+    }
+    env.pop("ASYNC_DATABASE_URL", None)
+    os.environ.update(env)
+    os.environ.pop("ASYNC_DATABASE_URL", None)
+
+    from app.database import engine
+    from benchmarks.district import DistrictSpec, load_district, seed_district
+
+    spec = DistrictSpec(
+        organizations=args.organizations,
+        students_per_organization=args.students,
+        goals_per_student=args.goals_per_student,
+        events_per_student=args.events_per_student,
+        evidence_per_student=args.evidence_per_student,
+        lesson_plans_per_teacher=args.lesson_plans_per_teacher,
+        seed=args.seed,
+        workers=args.seed_workers,
+    )
+    started_at = datetime.utcnow()
+    seeding_started = time.monotonic()
+    if args.reuse:
+        tenants, rows = load_district(engine), {}
+    else:
+        tenants, rows = seed_district(engine, spec)
+    seeding_seconds = time.monotonic() - seeding_started
+    if not tenants:
+        raise SystemExit("No organizations with a teacher and students to load test")
+    print(
+        f"District ready in {seeding_seconds:.1f}s: {len(tenants)} organizations",
+        file=sys.stderr,
+    )
+
+    server, base_url = start_server(args, env)
+    try:
+        results = asyncio.run(run_load(base_url, tenants, args))
+    finally:
+        server.terminate()
+        server.wait()
+
+    report = {
+        "started_at": started_at.isoformat(),
+        "python": platform.python_version(),
+        "database": engine.dialect.name,
+        "district": {
+            **spec.__dict__,
+            "reused": args.reuse,
+            "seeding_seconds": round(seeding_seconds, 1),
+            "rows": rows,
+        },
+        "load": {
+            "concurrency": args.concurrency,
+            "workers": args.workers,
+            "duration_seconds": args.duration,
+            "warmup_seconds": args.warmup,
+            "weights": {name: weight for name, (weight, _) in WORKLOAD.items()},
+        },
+        **results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as handle:
+            handle.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
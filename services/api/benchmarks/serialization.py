@@ -0,0 +1,100 @@
+"""Serialization cost of list endpoint responses, per 1,000 rows.
+
+Compares FastAPI's ``response_model`` path (validate every ORM object into
+the read schema, dump it to JSON-compatible data, encode with the standard
+library) with :func:`app.core.serialization.dump_rows` on the same rows,
+for full rows and for a four-column ``fields=`` selection. No database needed::
+
+    python -m benchmarks.serialization --rows 1000 --repeat 50
+"""
+import argparse
+import json
+import time
+from datetime import date, datetime, timedelta
+from typing import List
+
+from pydantic import TypeAdapter
+
+from app.core.serialization import dump_rows, read_fields
+from app.models.student import DisabilityCategory, PlacementType, Student, StudentRead
+
+SPARSE_FIELDS = ["id", "first_name", "last_name", "grade"]
+
+
+def make_students(count: int) -> List[Student]:
+    """Synthetic, fully populated student rows."""
+    now = datetime.utcnow()
+    categories = list(DisabilityCategory)
+    return [
+        Student(
+            id=index + 1,
+            created_at=now - timedelta(minutes=index),
+            updated_at=now,
+            first_name=f"First{index}",
+            last_name=f"Last{index}",
+            date_of_birth=date(2012, 1, 1) + timedelta(days=index % 2000),
+            student_id=f"S{index:06d}",
+            grade=str(index % 12 + 1),
+            disability_category=categories[index % len(categories)],
+            placement=list(PlacementType)[index % len(PlacementType)],
+            reading_level="Grade level",
+            math_level="Below grade level",
+            behavior_plan=index % 3 == 0,
+            goals_progress=index % 101,
+            recent_behaviors=index % 7,
+            organization_id=1,
+            case_manager_id=1,
+        )
+        for index in range(count)
+    ]
+
+
+def response_model_path(adapter: TypeAdapter, rows: List[Student]) -> bytes:
+    validated = adapter.validate_python(rows, from_attributes=True)
+    return json.dumps(adapter.dump_python(validated, mode="json")).encode()
+
+
+def timed(function, repeat: int) -> float:
+    """Best wall time of ``repeat`` runs, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark list endpoint serialization."
+    )
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    rows = make_students(args.rows)
+    adapter = TypeAdapter(List[StudentRead])
+    all_fields = read_fields(Student, StudentRead)
+    per_1000 = 1000 / args.rows
+
+    results = [
+        ("response_model, all fields", lambda: response_model_path(adapter, rows)),
+        ("dump_rows, all fields", lambda: dump_rows(rows, all_fields)),
+        (
+            f"dump_rows, {len(SPARSE_FIELDS)} fields",
+            lambda: dump_rows(rows, SPARSE_FIELDS),
+        ),
+    ]
+
+    print(f"{args.rows} rows, best of {args.repeat}")
+    for name, function in results:
+        size = len(function())
+        elapsed = timed(function, args.repeat) * per_1000
+        print(
+            f"  {name:<36} {elapsed:8.2f} ms / 1000 rows  "
+            f"{size * per_1000 / 1024:8.1f} KiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
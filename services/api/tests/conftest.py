@@ -0,0 +1,119 @@
+"""Shared fixtures: a throwaway SQLite district and a query counter.
+
+Settings are read when ``app`` is first imported, so the database and blob
+store locations are set here, before any test module imports the app.
+"""
+import asyncio
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator, List
+
+import pytest
+
+_workdir = tempfile.mkdtemp(prefix="accompli-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_workdir, 'test.db')}")
+os.environ.setdefault("BLOB_STORE_PATH", os.path.join(_workdir, "blobs"))
+os.environ.setdefault("ENVIRONMENT", "test")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlmodel import Session, select  # noqa: E402
+
+from app.core.auth import create_access_token  # noqa: E402
+from app.core.principals import Principal, cache_principal  # noqa: E402
+from app.database import async_engine, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.user import User, UserRole  # noqa: E402
+from benchmarks.district import DistrictSpec, Tenant, seed_district  # noqa: E402
+
+SPEC = DistrictSpec(
+    organizations=2,
+    students_per_organization=4,
+    goals_per_student=2,
+    events_per_student=20,
+    evidence_per_student=6,
+    lesson_plans_per_teacher=2,
+    days=30,
+)
+
+
+@pytest.fixture(scope="session")
+def district() -> List[Tenant]:
+    """Two small organizations, seeded once per test run."""
+    tenants, _ = seed_district(engine, SPEC)
+    return tenants
+
+
+@pytest.fixture(scope="session")
+def client() -> Iterator[TestClient]:
+    with TestClient(app, base_url="http://localhost") as test_client:
+        yield test_client
+
+
+def _bearer_headers(user_id: int) -> dict:
+    token = create_access_token({"sub": str(user_id)})
+    with Session(engine) as session:
+        principal = Principal.from_user(session.get(User, user_id))
+    asyncio.run(cache_principal(principal, token))
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def auth_headers(district: List[Tenant]) -> dict:
+    """Bearer headers for the first organization's teacher.
+
+    The principal is cached up front, so query counts cover only the
+    endpoint's own work.
+    """
+    return _bearer_headers(district[0].user_id)
+
+
+@pytest.fixture
+def admin_headers(district: List[Tenant]) -> dict:
+    """Bearer headers for the first organization's (unscoped) administrator."""
+    with Session(engine) as session:
+        user_id = session.exec(
+            select(User.id).where(
+                User.organization_id == district[0].organization_id,
+                User.role == UserRole.ADMIN,
+            )
+        ).one()
+    return _bearer_headers(user_id)
+
+
+class QueryCounter:
+    """Statements the API's async engine executed inside :meth:`counting`."""
+
+    def __init__(self):
+        self.statements: List[str] = []
+        self._active = False
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        if self._active:
+            self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    @contextmanager
+    def counting(self) -> Iterator["QueryCounter"]:
+        self.statements.clear()
+        self._active = True
+        try:
+            yield self
+        finally:
+            self._active = False
+
+
+@pytest.fixture
+def queries() -> Iterator[QueryCounter]:
+    """Counts ``before_cursor_execute`` events on the API's engine."""
+    counter = QueryCounter()
+    event.listen(async_engine.sync_engine, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", counter)
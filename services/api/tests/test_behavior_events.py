@@ -0,0 +1,159 @@
+"""Behavior event writes and the daily rollup."""
+import asyncio
+from datetime import datetime
+
+from sqlmodel import Session, col, select, update
+
+from app.database import async_session_factory, engine
+from app.models.behavior_event import BehaviorEvent
+from app.models.behavior_rollup import BehaviorDailyRollup
+from app.models.sync import Tombstone
+from app.services.behavior_rollup import rebuild_rollup
+
+EVENTS = "/api/v1/behavior-events/behavior-events"
+
+
+def event_payload(student_id: int) -> dict:
+    return {
+        "student_id": student_id,
+        "date_time": datetime.utcnow().replace(microsecond=0).isoformat(),
+        "antecedent": "Transition to math",
+        "behavior_description": "Left the table",
+        "consequence": "Redirected",
+        "behavior_type": "Disruptive",
+        "intensity": "Moderate",
+        "duration_minutes": 5,
+    }
+
+
+def rollup_rows(session) -> list:
+    table = BehaviorDailyRollup.__table__
+    columns = [
+        table.c[name]
+        for name in (
+            "student_id", "organization_id", "day", "behavior_type", "intensity",
+            "hour_bucket", "event_count", "total_duration_minutes",
+        )
+    ]
+    return sorted(session.execute(select(*columns)).all())
+
+
+def rollup_and_rebuild() -> tuple:
+    """The maintained rollup, and what :func:`rebuild_rollup` makes of it."""
+
+    async def run():
+        async with async_session_factory() as session:
+            maintained = await session.run_sync(rollup_rows)
+            await rebuild_rollup(session)
+            rebuilt = await session.run_sync(rollup_rows)
+            await session.rollback()
+        return maintained, rebuilt
+
+    return asyncio.run(run())
+
+
+def _unbackfilled_event(student_id: int) -> int:
+    """An event of ``student_id`` whose ``organization_id`` is still NULL."""
+    with Session(engine) as session:
+        event_id = session.exec(
+            select(BehaviorEvent.id)
+            .where(BehaviorEvent.student_id == student_id)
+            .order_by(BehaviorEvent.id.desc())
+        ).first()
+        session.exec(
+            update(BehaviorEvent)
+            .where(BehaviorEvent.id == event_id)
+            .values(organization_id=None)
+        )
+        session.commit()
+    return event_id
+
+
+def test_update_backfills_the_organization(client, admin_headers, district):
+    tenant = district[0]
+    event_id = _unbackfilled_event(tenant.student_ids[0])
+    response = client.patch(
+        f"{EVENTS}/{event_id}", json={"notes": "Backfilled"}, headers=admin_headers
+    )
+    assert response.status_code == 200
+    with Session(engine) as session:
+        assert session.get(BehaviorEvent, event_id).organization_id == (
+            tenant.organization_id
+        )
+
+
+def test_delete_backfills_the_organization(client, admin_headers, district):
+    tenant = district[0]
+    event_id = _unbackfilled_event(tenant.student_ids[1])
+    response = client.delete(f"{EVENTS}/{event_id}", headers=admin_headers)
+    assert response.status_code == 200
+    with Session(engine) as session:
+        # The tombstone is visible to the organization's delta syncs
+        tombstone = session.exec(
+            select(Tombstone).where(
+                Tombstone.entity_type == "behavior_events",
+                Tombstone.entity_id == event_id,
+            )
+        ).one()
+    assert tombstone.organization_id == tenant.organization_id
+
+
+def test_bulk_create_rejects_items_outside_the_organization(
+    client, auth_headers, district
+):
+    own, other = district
+    unknown = max(own.student_ids + other.student_ids) + 1000
+    items = [
+        event_payload(own.student_ids[0]),
+        event_payload(unknown),
+        event_payload(other.student_ids[0]),
+        event_payload(own.student_ids[1]),
+    ]
+    response = client.post(
+        f"{EVENTS}/bulk", json={"items": items}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["created"], body["rejected"]) == (2, 2)
+    assert [result["index"] for result in body["results"]] == [0, 1, 2, 3]
+    assert [result["status"] for result in body["results"]] == [
+        "created", "rejected", "rejected", "created"
+    ]
+    assert body["results"][1]["detail"] == "Student not found"
+
+    created = [result["id"] for result in body["results"] if result["id"]]
+    with Session(engine) as session:
+        events = session.exec(
+            select(BehaviorEvent).where(col(BehaviorEvent.id).in_(created))
+        ).all()
+    assert sorted(
+        (event.student_id, event.organization_id) for event in events
+    ) == [
+        (own.student_ids[0], own.organization_id),
+        (own.student_ids[1], own.organization_id),
+    ]
+
+
+def test_rollup_matches_a_rebuild_after_update_and_delete(
+    client, auth_headers, district
+):
+    student_id = district[0].student_ids[2]
+    with Session(engine) as session:
+        updated, deleted = session.exec(
+            select(BehaviorEvent.id)
+            .where(BehaviorEvent.student_id == student_id)
+            .order_by(BehaviorEvent.id)
+            .limit(2)
+        ).all()
+
+    response = client.patch(
+        f"{EVENTS}/{updated}",
+        json={"intensity": "Extreme", "duration_minutes": 45},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    response = client.delete(f"{EVENTS}/{deleted}", headers=auth_headers)
+    assert response.status_code == 200
+
+    maintained, rebuilt = rollup_and_rebuild()
+    assert maintained == rebuilt
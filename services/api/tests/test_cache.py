@@ -0,0 +1,27 @@
+"""The in-process cache backend's generation counters."""
+import asyncio
+
+from app.core.cache import MemoryCacheBackend
+
+
+def test_counters_are_bounded():
+    async def run():
+        backend = MemoryCacheBackend(maxsize=4, ttl=60)
+        for user_id in range(100):
+            await backend.incr(f"gen:{user_id}")
+        return backend
+
+    assert len(asyncio.run(run())._counters) == 4
+
+
+def test_recreated_counter_does_not_repeat_a_value():
+    async def run():
+        backend = MemoryCacheBackend(maxsize=1, ttl=60)
+        first = await backend.incr("gen:1")
+        # Evicts gen:1, which then starts over
+        await backend.incr("gen:2")
+        assert await backend.get("gen:1") is None
+        return first, await backend.incr("gen:1")
+
+    first, second = asyncio.run(run())
+    assert second > first
@@ -0,0 +1,47 @@
+"""Dashboard cache hits, invalidation and racing writes."""
+import asyncio
+
+from app.database import async_session_factory
+from app.services import dashboard
+
+DASHBOARD = "/api/v1/analytics/analytics/dashboard"
+
+
+def test_cached_dashboard_skips_the_database(client, auth_headers, queries):
+    assert client.get(DASHBOARD, headers=auth_headers).status_code == 200
+    with queries.counting():
+        response = client.get(DASHBOARD, headers=auth_headers)
+    assert response.status_code == 200
+    assert queries.count == 0
+
+
+def test_invalidation_recomputes(client, auth_headers, queries, district):
+    client.get(DASHBOARD, headers=auth_headers)
+    asyncio.run(dashboard.invalidate_dashboard(district[0].organization_id))
+    with queries.counting():
+        client.get(DASHBOARD, headers=auth_headers)
+    assert queries.count == 1
+
+
+def test_compute_racing_an_invalidation_is_not_cached(district, monkeypatch):
+    organization_id = district[0].organization_id
+    compute = dashboard.compute_dashboard
+
+    async def compute_then_write(session, organization_id):
+        payload = await compute(session, organization_id)
+        # A write lands after the totals were read
+        await dashboard.invalidate_dashboard(organization_id)
+        return payload
+
+    async def run():
+        await dashboard.invalidate_dashboard(organization_id)
+        generation = await dashboard._generation(organization_id)
+        async with async_session_factory() as session:
+            await dashboard.get_dashboard(session, organization_id)
+        # Nothing is stored under the generation the compute started from
+        return await dashboard.dashboard_cache.get(
+            dashboard._entry_key(organization_id, generation)
+        )
+
+    monkeypatch.setattr(dashboard, "compute_dashboard", compute_then_write)
+    assert asyncio.run(run()) is None
@@ -0,0 +1,125 @@
+"""Database round trips per goals endpoint.
+
+Each endpoint resolves tenant access in the same query that loads the goal,
+so these counts only grow if an endpoint starts issuing extra queries (an
+N+1 or a separate access check).
+"""
+import pytest
+from sqlmodel import Session, select
+
+from app.database import engine
+from app.models.iep import IEP, GoalArea, IEPGoal
+from app.models.student import Student
+
+GOALS = "/api/v1/goals/"
+
+
+@pytest.fixture
+def iep_id(district) -> int:
+    """An IEP in the signed-in teacher's organization."""
+    with Session(engine) as session:
+        return session.scalar(
+            select(IEP.id)
+            .join(Student, Student.id == IEP.student_id)
+            .where(Student.organization_id == district[0].organization_id)
+        )
+
+
+@pytest.fixture
+def goal_id(iep_id) -> int:
+    """A fresh goal, so tests that change or delete it stay independent."""
+    with Session(engine) as session:
+        goal = IEPGoal(
+            iep_id=iep_id,
+            area=GoalArea.ACADEMIC_READING,
+            description="Reads grade-level passages fluently",
+            baseline="60 wcpm",
+            target_criteria="90 wcpm",
+            measurement_method="Weekly probes",
+        )
+        session.add(goal)
+        session.commit()
+        return goal.id
+
+
+def test_list_goals(client, auth_headers, queries):
+    with queries.counting():
+        response = client.get(GOALS, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json()
+    assert queries.count == 1
+
+
+def test_get_goal(client, auth_headers, queries, goal_id):
+    with queries.counting():
+        response = client.get(f"{GOALS}{goal_id}", headers=auth_headers)
+    assert response.status_code == 200
+    assert queries.count == 1
+
+
+def test_get_missing_goal(client, auth_headers, queries):
+    with queries.counting():
+        response = client.get(f"{GOALS}999999", headers=auth_headers)
+    assert response.status_code == 404
+    assert queries.count == 1
+
+
+def test_get_goal_in_other_organization(client, auth_headers, queries, district):
+    with Session(engine) as session:
+        other_goal_id = session.scalar(
+            select(IEPGoal.id)
+            .join(IEP, IEP.id == IEPGoal.iep_id)
+            .join(Student, Student.id == IEP.student_id)
+            .where(Student.organization_id == district[1].organization_id)
+        )
+    with queries.counting():
+        response = client.get(f"{GOALS}{other_goal_id}", headers=auth_headers)
+    assert response.status_code == 404
+    assert queries.count == 1
+
+
+def test_create_goal(client, auth_headers, queries, iep_id):
+    payload = {
+        "iep_id": iep_id,
+        "area": GoalArea.ACADEMIC_MATH.value,
+        "description": "Solves two-step word problems",
+        "baseline": "2 of 10",
+        "target_criteria": "8 of 10",
+        "measurement_method": "Work samples",
+    }
+    with queries.counting():
+        response = client.post(GOALS, json=payload, headers=auth_headers)
+    assert response.status_code == 200
+    # access check, INSERT, refresh
+    assert queries.count == 3
+
+
+def test_update_goal(client, auth_headers, queries, goal_id):
+    with queries.counting():
+        response = client.put(
+            f"{GOALS}{goal_id}", json={"progress_percentage": 40}, headers=auth_headers
+        )
+    assert response.status_code == 200
+    assert response.json()["progress_percentage"] == 40
+    # load with access check, UPDATE, refresh
+    assert queries.count == 3
+
+
+def test_update_goal_progress(client, auth_headers, queries, goal_id):
+    with queries.counting():
+        response = client.post(
+            f"{GOALS}{goal_id}/progress",
+            json={"progress_percentage": 55},
+            headers=auth_headers,
+        )
+    assert response.status_code == 200
+    assert response.json()["goal"]["progress_percentage"] == 55
+    assert queries.count == 3
+
+
+def test_delete_goal(client, auth_headers, queries, goal_id):
+    with queries.counting():
+        response = client.delete(f"{GOALS}{goal_id}", headers=auth_headers)
+    assert response.status_code == 200
+    # load with access check, tombstone INSERT, DELETE
+    assert queries.count == 3
@@ -0,0 +1,56 @@
+"""Keyset pagination across ties in the sort column."""
+from datetime import datetime, timedelta
+
+from sqlmodel import Session, select
+
+from app.database import engine
+from app.models.behavior_event import BehaviorEvent
+
+EVENTS = "/api/v1/behavior-events/behavior-events"
+
+
+def test_cursor_pages_cover_rows_with_equal_sort_keys(client, auth_headers, district):
+    student_id = district[0].student_ids[0]
+    # Several events sharing one timestamp, so pages break inside the tie
+    tied = (datetime.utcnow() + timedelta(days=1)).replace(microsecond=0)
+    item = {
+        "student_id": student_id,
+        "date_time": tied.isoformat(),
+        "antecedent": "Fire drill",
+        "behavior_description": "Covered ears",
+        "consequence": "Break offered",
+        "behavior_type": "Withdrawal",
+        "intensity": "Low",
+    }
+    response = client.post(
+        f"{EVENTS}/bulk", json={"items": [item] * 5}, headers=auth_headers
+    )
+    assert response.json()["created"] == 5
+
+    with Session(engine) as session:
+        expected = session.exec(
+            select(BehaviorEvent.id)
+            .where(BehaviorEvent.student_id == student_id)
+            .order_by(BehaviorEvent.date_time.desc(), BehaviorEvent.id.desc())
+        ).all()
+
+    seen, cursor = [], None
+    while True:
+        params = {"student_id": student_id, "limit": 2, "fields": "id"}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(EVENTS, params=params, headers=auth_headers)
+        assert response.status_code == 200
+        seen.extend(row["id"] for row in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert seen == expected
+
+
+def test_malformed_cursor_is_rejected(client, auth_headers):
+    response = client.get(
+        EVENTS, params={"cursor": "not-a-cursor"}, headers=auth_headers
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid pagination cursor"
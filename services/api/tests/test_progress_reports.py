@@ -0,0 +1,20 @@
+"""Progress report fingerprints and conditional GETs."""
+import warnings
+
+from sqlalchemy.exc import SAWarning
+
+
+def progress_url(student_id: int) -> str:
+    return f"/api/v1/reports/reports/student/{student_id}/progress"
+
+
+def test_progress_report_supports_if_none_match(client, auth_headers, district):
+    url = progress_url(district[0].student_ids[0])
+    with warnings.catch_warnings():
+        # e.g. "SELECT statement has a cartesian product between FROM elements"
+        warnings.simplefilter("error", SAWarning)
+        response = client.get(url, headers=auth_headers)
+        assert response.status_code == 200
+        etag = response.headers["ETag"]
+        response = client.get(url, headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == 304
@@ -0,0 +1,148 @@
+"""The date-range queries use the (owner, date) and date indexes.
+
+:func:`app.core.sql.date_range` compares timestamp columns against a
+half-open range rather than wrapping them in ``date()``. These tests ask the
+planner whether the resulting queries can use the indexes built for them.
+SQLite always runs; set ``TEST_POSTGRES_URL`` to a scratch database to check
+the PostgreSQL plans too (it is seeded with a small district if empty).
+"""
+import os
+from datetime import date, timedelta
+from typing import Optional
+
+import pytest
+from sqlalchemy import create_engine, func
+from sqlalchemy.pool import NullPool
+from sqlmodel import Session, SQLModel, select
+
+from app.core.sql import date_range
+from app.database import engine
+from app.models.behavior_event import BehaviorEvent
+from app.models.evidence import Evidence
+from app.models.lesson_plan import LessonPlan
+from app.models.organization import Organization
+from app.models.student import Student
+from benchmarks.district import DistrictSpec, seed_district
+
+TO_DATE = date.today()
+FROM_DATE = TO_DATE - timedelta(days=14)
+
+
+def events_for_student(student_id: int, organization_id: int):
+    return (
+        select(BehaviorEvent)
+        .where(
+            BehaviorEvent.student_id == student_id,
+            *date_range(BehaviorEvent.date_time, FROM_DATE, TO_DATE),
+        )
+        .order_by(BehaviorEvent.date_time)
+    )
+
+
+def events_for_organization(student_id: int, organization_id: int):
+    return (
+        select(BehaviorEvent)
+        .where(
+            BehaviorEvent.organization_id == organization_id,
+            *date_range(BehaviorEvent.date_time, FROM_DATE, TO_DATE),
+        )
+        .order_by(BehaviorEvent.date_time.desc())
+    )
+
+
+def lesson_plans_for_organization(student_id: int, organization_id: int):
+    return select(LessonPlan).where(
+        LessonPlan.organization_id == organization_id,
+        *date_range(LessonPlan.date, FROM_DATE, TO_DATE),
+    )
+
+
+def evidence_for_student(student_id: int, organization_id: int):
+    return select(Evidence).where(
+        Evidence.student_id == student_id,
+        *date_range(Evidence.collected_date, FROM_DATE, TO_DATE),
+    )
+
+
+def lesson_plans_in_range(student_id: int, organization_id: int):
+    # Unscoped (administrator) listing filtered only by date
+    return select(LessonPlan).where(*date_range(LessonPlan.date, FROM_DATE, TO_DATE))
+
+
+# Query, table, and the (owner, date) columns of the index it should use, with
+# no owner for a date-only index. A plan that only matches the owner column
+# would still name the index, so the tests also check that the date bounds
+# are part of the index condition.
+CASES = [
+    (events_for_student, "behavior_events", "student_id", "date_time"),
+    (events_for_organization, "behavior_events", "organization_id", "date_time"),
+    (evidence_for_student, "evidence", "student_id", "collected_date"),
+    (lesson_plans_for_organization, "lesson_plans", "organization_id", "date"),
+    (lesson_plans_in_range, "lesson_plans", None, "date"),
+]
+
+
+def explain(connection, prefix: str, query) -> str:
+    """The plan ``prefix`` (e.g. ``EXPLAIN``) reports for ``query``, as text."""
+    compiled = query.compile(dialect=connection.dialect)
+    params = compiled.params
+    if compiled.positional:
+        params = tuple(params[name] for name in compiled.positiontup)
+    rows = connection.exec_driver_sql(f"{prefix} {compiled}", params).all()
+    return "\n".join(" ".join(str(value) for value in row) for row in rows)
+
+
+def index_name(table: str, owner: Optional[str], day: str) -> str:
+    if owner is None:
+        return f"ix_{table}_{day}"
+    return f"ix_{table}_{owner}_{day}"
+
+
+def some_student(connection):
+    query = select(Student.id, Student.organization_id).limit(1)
+    return connection.execute(query).one()
+
+
+@pytest.mark.parametrize("build_query, table, owner, day", CASES)
+def test_sqlite_plan_uses_index(district, build_query, table, owner, day):
+    tenant = district[0]
+    with engine.connect() as connection:
+        plan = explain(
+            connection,
+            "EXPLAIN QUERY PLAN",
+            build_query(tenant.student_ids[0], tenant.organization_id),
+        )
+    index = index_name(table, owner, day)
+    condition = f"{day}>?" if owner is None else f"{owner}=? AND {day}>?"
+    assert f"USING INDEX {index} ({condition}" in plan, plan
+
+
+@pytest.fixture(scope="module")
+def postgres():
+    url = os.environ.get("TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("TEST_POSTGRES_URL is not set")
+    pg_engine = create_engine(url, poolclass=NullPool)
+    SQLModel.metadata.create_all(pg_engine)
+    with Session(pg_engine) as session:
+        empty = not session.scalar(select(func.count()).select_from(Organization))
+    if empty:
+        spec = DistrictSpec(organizations=2, students_per_organization=20)
+        seed_district(pg_engine, spec)
+    yield pg_engine
+    pg_engine.dispose()
+
+
+@pytest.mark.parametrize("build_query, table, owner, day", CASES)
+def test_postgres_plan_uses_index(postgres, build_query, table, owner, day):
+    with postgres.connect() as connection:
+        student_id, organization_id = some_student(connection)
+        # Small tables are cheaper to scan; this asks whether the index is usable
+        connection.exec_driver_sql("SET enable_seqscan = off")
+        plan = explain(connection, "EXPLAIN", build_query(student_id, organization_id))
+    assert index_name(table, owner, day) in plan, plan
+    conditions = [line for line in plan.splitlines() if "Index Cond" in line]
+    assert any(
+        (owner is None or f"{owner} =" in line) and f"{day} >=" in line
+        for line in conditions
+    ), plan
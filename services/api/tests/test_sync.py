@@ -0,0 +1,69 @@
+"""Delta sync: changes, tombstones and deactivated students."""
+from sqlmodel import Session, select
+
+from app.database import engine
+from app.models.behavior_event import BehaviorEvent
+
+SYNC = "/api/v1/sync/"
+EVENTS = "/api/v1/behavior-events/behavior-events"
+
+
+def synced_ids(body: dict, entity_type: str) -> set:
+    return {row["id"] for row in body["changes"][entity_type]}
+
+
+def tombstone_ids(body: dict, entity_type: str) -> set:
+    return {
+        tombstone["entity_id"]
+        for tombstone in body["deleted"]
+        if tombstone["entity_type"] == entity_type
+    }
+
+
+def test_delta_sync_returns_changes_and_tombstones(client, auth_headers, district):
+    with Session(engine) as session:
+        updated, deleted = session.exec(
+            select(BehaviorEvent.id)
+            .where(BehaviorEvent.student_id == district[0].student_ids[3])
+            .order_by(BehaviorEvent.id)
+            .limit(2)
+        ).all()
+    full = client.get(SYNC, headers=auth_headers).json()
+    assert full["full"] and full["deleted"] == []
+
+    response = client.patch(
+        f"{EVENTS}/{updated}", json={"notes": "Synced"}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    response = client.delete(f"{EVENTS}/{deleted}", headers=auth_headers)
+    assert response.status_code == 200
+
+    delta = client.get(
+        SYNC, params={"since": full["watermark"]}, headers=auth_headers
+    ).json()
+    assert not delta["full"]
+    assert updated in synced_ids(delta, "behavior_events")
+    assert deleted not in synced_ids(delta, "behavior_events")
+    assert tombstone_ids(delta, "behavior_events") >= {deleted}
+    # Rows untouched since the watermark are not sent again
+    assert len(delta["changes"]["behavior_events"]) < len(
+        full["changes"]["behavior_events"]
+    )
+
+
+def test_deactivated_student_is_only_a_tombstone(client, auth_headers, district):
+    student_id = district[0].student_ids[-1]
+    full = client.get(SYNC, headers=auth_headers).json()
+    assert full["full"] and student_id in synced_ids(full, "students")
+
+    response = client.delete(f"/api/v1/students/{student_id}", headers=auth_headers)
+    assert response.status_code == 200
+
+    delta = client.get(
+        SYNC, params={"since": full["watermark"]}, headers=auth_headers
+    ).json()
+    assert student_id in tombstone_ids(delta, "students")
+    assert student_id not in synced_ids(delta, "students")
+
+    full = client.get(SYNC, headers=auth_headers).json()
+    assert student_id not in synced_ids(full, "students")